@@ -1,4 +1,28 @@
 from .alpha import AlphaAgent, AlphaTrainer
-from .evaluator import Evaluator
+from .evaluator import Evaluator, SymmetricInference
+from .evaluation_cache import EvaluationCache
 from .generic_estimator import GenericEstimator
-from .mlp_estimator import MlpEstimator
+from .numpy_estimator import NumpyEstimator, load_numpy_estimator
+from .replay_buffer import ReplayBuffer
+
+# MlpEstimator is not exported with *, which would import torch
+__all__ = [
+    "AlphaAgent",
+    "AlphaTrainer",
+    "Evaluator",
+    "SymmetricInference",
+    "EvaluationCache",
+    "GenericEstimator",
+    "NumpyEstimator",
+    "load_numpy_estimator",
+    "ReplayBuffer",
+]
+
+
+def __getattr__(name):
+    # torch is only imported when the trainable estimator is used, playing agents get along with numpy
+    if name == "MlpEstimator":
+        from .mlp_estimator import MlpEstimator
+
+        return MlpEstimator
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
@@ -1,44 +1,211 @@
-from copy import deepcopy
 import logging
+import time
 
 import numpy as np
 
 from .graph import GameStateGraph
+from .array_graph import ArrayGameStateGraph
 from .mcts import Mcts
+from .threaded_mcts import ThreadedMcts
+from ..parallel_search import RootParallelSearch, SearchMode
+from ..tree_reuse import find_reusable_node
 
 
 class Alpha(object):
-    def __init__(self, evaluator, mcts_steps, random_seed, draw_graph):
+    # fraction of max_tree_nodes kept when the search tree is pruned
+    PRUNED_TREE_FRACTION = 0.5
+
+    def __init__(
+        self,
+        evaluator,
+        mcts_steps,
+        random_seed,
+        draw_graph,
+        array_tree=False,
+        reuse_tree=True,
+        batch_size=1,
+        search_workers=1,
+        search_mode=SearchMode.ROOT,
+        time_control=None,
+        endgame_solver=None,
+        max_tree_nodes=None,
+    ):
         self.logger = logging.getLogger(self.__class__.__module__ + "." + self.__class__.__name__)
         self.evaluator = evaluator
         self.mcts_steps = mcts_steps
         self.random_state = np.random.RandomState(random_seed)
         self.graph = None
         self.draw_graph = draw_graph
+        self.array_tree = array_tree
+        self.reuse_tree = reuse_tree
+        self.batch_size = batch_size
+        self.search_workers = search_workers
+        self.search_mode = SearchMode(search_mode)
+        self.root_parallel_search = None
+        # with a time control, moves are searched for a time budget instead of mcts_steps
+        self.time_control = time_control
+        # endgames are solved exactly instead of searched (by playing agents)
+        self.endgame_solver = endgame_solver
+        # memory budget of the search tree, the least visited subtrees are pruned when it is reached
+        self.max_tree_nodes = max_tree_nodes
+        self.num_simulations = 0
+        self.num_reused_simulations = 0
+
+    def seed(self, random_seed):
+        self.random_state = np.random.RandomState(random_seed)
 
-    def _get_search_distribution(self, state, exploration_factor=1.0):
-        # TODO: only reset root and keep rest of graph
-        self.graph = GameStateGraph(state)
-        mcts = Mcts(self.graph, self.evaluator)
-
-        for _ in range(self.mcts_steps):
-            mcts.simulate_step(state)
-
-        search_distribution = mcts.get_search_distribution(state, exploration_factor)
+    def __getstate__(self):
+        # the search graph of the last move is not copied to other processes
+        state = self.__dict__.copy()
+        state["graph"] = None
+        state["root_parallel_search"] = None
+        return state
+
+    def close(self):
+        """Stop the worker processes of a root parallel search."""
+        if self.root_parallel_search is not None:
+            self.root_parallel_search.close()
+            self.root_parallel_search = None
+
+    def _create_graph(self, state):
+        if self.array_tree:
+            return ArrayGameStateGraph(
+                state,
+                num_actions=len(state.get_all_moves()),
+                transpositions=getattr(state, "transpositions", False),
+            )
+        return GameStateGraph(state)
+
+    def _reset_graph(self, state):
+        """
+        Keep the subtree of state from the last search if possible, otherwise start with a new graph.
+
+        Return the number of simulations already done in the kept subtree.
+        """
+        if self.reuse_tree and self.graph is not None:
+            graph = self.graph
+            node = find_reusable_node(
+                graph.root,
+                state,
+                graph.get_state,
+                lambda node: [graph.get_successor(node, action) for action in graph.get_actions(node)],
+            )
+            if node is not None:
+                self.graph.reset_root(node)
+                attributes = self.graph.get_attributes(self.graph.root)
+                return 0 if attributes is None else int(np.sum(attributes.visit_count))
+        # the search keeps states across moves, so it must not hold the live game state
+        self.graph = self._create_graph(state.clone())
+        return 0
+
+    def get_reused_simulations_fraction(self):
+        """Fraction of all simulations behind the searches so far which were reused from previous searches."""
+        if self.num_simulations == 0:
+            return 0.0
+        return self.num_reused_simulations / self.num_simulations
+
+    def get_num_tree_nodes(self):
+        """Number of nodes of the search graph, or None before the first search."""
+        return self.graph.get_num_nodes() if self.graph is not None else None
+
+    def _get_parameters_version(self):
+        # evaluators of tests may have no estimator
+        estimator = getattr(self.evaluator, "estimator", None)
+        return estimator.parameters_version if estimator is not None else None
 
-        self.logger.debug("mean node depth: %.2f" % self.graph.get_mean_node_depth())
+    def _get_search_distribution(self, state, exploration_factor=1.0):
+        # the workers search with copies of the estimator, which are out of date after training or loading
+        parameters_version = self._get_parameters_version()
+        if self.root_parallel_search is not None and self.root_parallel_search.parameters_version != parameters_version:
+            self.close()
+        # the worker processes start before the clock
+        if self.search_workers > 1 and self.search_mode == SearchMode.ROOT and self.root_parallel_search is None:
+            self.root_parallel_search = RootParallelSearch(self, self.search_workers, parameters_version)
+        start_time = time.perf_counter()
+        clock = self.time_control.start_move(state) if self.time_control is not None else None
+        if self.search_workers > 1 and self.search_mode == SearchMode.ROOT:
+            visit_count = self.root_parallel_search.search_root(state, clock.budget if clock is not None else None)
+            # the searches of the workers are only known by their root visits
+            num_steps = int(np.sum(visit_count))
+            self.num_simulations += num_steps
+            search_distribution = Mcts.get_visit_count_distribution(visit_count, exploration_factor)
+        else:
+            mcts, num_steps = self._search(state, clock)
+            search_distribution = mcts.get_search_distribution(self.graph.root, exploration_factor)
+            if self.draw_graph:
+                self.graph.draw()
+        if clock is not None:
+            self.time_control.end_move(clock)
+
+        duration = time.perf_counter() - start_time
+        self.logger.debug("simulations: %d in %.0f ms (%.0f/sec)" % (num_steps, 1000 * duration, num_steps / duration))
         self.logger.debug("search distribution: %s" % search_distribution)
-        if self.draw_graph:
-            self.graph.draw()
-
         return search_distribution
 
+    def search_root(self, state):
+        """Search state and return the visit counts of all actions of the root."""
+        clock = self.time_control.start_move(state) if self.time_control is not None else None
+        mcts, _ = self._search(state, clock)
+        return mcts.get_root_visit_count(self.graph.root)
+
+    def _is_search_finished(self, num_steps, clock):
+        if clock is not None:
+            return clock.is_search_finished(num_steps)
+        return num_steps >= self.mcts_steps
+
+    def _is_tree_full(self):
+        return self.max_tree_nodes is not None and self.graph.get_num_nodes() >= self.max_tree_nodes
+
+    def _prune_tree(self):
+        num_nodes = self.graph.get_num_nodes()
+        self.graph.prune(max(1, int(self.PRUNED_TREE_FRACTION * self.max_tree_nodes)))
+        self.logger.debug("pruned search tree from %d to %d nodes" % (num_nodes, self.graph.get_num_nodes()))
+
+    def _search(self, state, clock=None):
+        """Search state until the clock (if any) runs out or for mcts_steps. Return the MCTS and the steps run."""
+        num_reused_simulations = self._reset_graph(state)
+        if self._is_tree_full():
+            self._prune_tree()
+
+        if self.search_workers > 1 and self.search_mode == SearchMode.TREE:
+            # the threads keep paths into the tree, so it is not pruned during the search but the search is stopped
+            mcts = ThreadedMcts(self.graph, self.evaluator, num_threads=self.search_workers)
+            num_steps = mcts.simulate(
+                self.graph.root,
+                lambda num_steps: self._is_search_finished(num_steps, clock) or self._is_tree_full(),
+            )
+        else:
+            mcts = Mcts(self.graph, self.evaluator)
+            num_steps = 0
+            while not self._is_search_finished(num_steps, clock):
+                if self._is_tree_full():
+                    self._prune_tree()
+                if self.batch_size > 1:
+                    batch_size = (
+                        self.batch_size if clock is not None else min(self.batch_size, self.mcts_steps - num_steps)
+                    )
+                    num_steps += mcts.simulate_batch(self.graph.root, batch_size)
+                else:
+                    mcts.simulate_step(self.graph.root)
+                    num_steps += 1
+
+        self.num_reused_simulations += num_reused_simulations
+        self.num_simulations += num_reused_simulations + num_steps
+        self.logger.debug("reused simulations: %d" % num_reused_simulations)
+        self.logger.debug("mean node depth: %.2f" % self.graph.get_mean_node_depth())
+        return mcts, num_steps
+
 
 class AlphaAgent(Alpha):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
     def get_next_move(self, state):
+        if self.endgame_solver is not None and self.endgame_solver.is_endgame(state):
+            value, move = self.endgame_solver.solve(state)
+            if move is not None:
+                self.logger.debug("solved endgame value: %d" % value)
+                return move
         return np.argmax(self._get_search_distribution(state))
 
 
@@ -57,12 +224,16 @@ class AlphaTrainer(Alpha):
         return selected_action
 
     def _record(self, state, search_distribution):
-        self.states_and_search_distributions.append((deepcopy(state), search_distribution))
+        self.states_and_search_distributions.append((state.clone(), search_distribution))
 
     def _sample_action(self, search_distribution):
         return self.random_state.choice(len(search_distribution), p=search_distribution)
 
     def train(self, final_state):
-        loss = self.evaluator.train(self.states_and_search_distributions, final_state)
+        return self.evaluator.train_on_batch(self.get_training_batch(final_state))
+
+    def get_training_batch(self, final_state):
+        """Get the training targets of the finished game and start recording the next game."""
+        training_batch = self.evaluator.get_training_batch(self.states_and_search_distributions, final_state)
         self.states_and_search_distributions = []
-        return loss
+        return training_batch
@@ -0,0 +1,215 @@
+import numpy as np
+
+from .attributes import Attributes
+from .graph import GameStateGraph, ActionAlreadyExistsException, get_most_visited_nodes
+
+NO_NODE = -1
+
+
+class ArrayGameStateGraph(object):
+    """
+    Game state tree stored in preallocated numpy arrays, with the same interface as GameStateGraph.
+
+    Nodes are addressed by integer ids (the root has id 0) instead of by game states, and successors
+    are found by indexing the children array with node id and action. The arrays double their
+    capacity when they are full.
+
+    With transpositions, successors equal to an existing state are linked to its node instead of adding
+    a new node, so the tree becomes a directed acyclic graph.
+    """
+
+    def __init__(self, root, num_actions, capacity=1024, transpositions=False):
+        self.num_actions = num_actions
+        self.transpositions = transpositions
+        self.root = 0
+        self.num_nodes = 0
+        self.node_states = []
+        self.node_attributes = []
+        self.state_nodes = {}
+        self._allocate(capacity)
+        self._add_node(root, depth=0)
+
+    def _allocate(self, capacity):
+        self.capacity = capacity
+        self.children = np.full((capacity, self.num_actions), NO_NODE, dtype=np.int32)
+        self.num_successors = np.zeros(capacity, dtype=np.int32)
+        self.depths = np.zeros(capacity, dtype=np.int32)
+        self.state_values = np.zeros(capacity)
+        self.prior_distributions = np.zeros((capacity, self.num_actions))
+        self.action_value_sums = np.zeros((capacity, self.num_actions))
+        self.visit_counts = np.zeros((capacity, self.num_actions))
+        self.legal_action_masks = np.zeros((capacity, self.num_actions), dtype=bool)
+
+    def _grow(self):
+        arrays = (
+            self.children,
+            self.num_successors,
+            self.depths,
+            self.state_values,
+            self.prior_distributions,
+            self.action_value_sums,
+            self.visit_counts,
+            self.legal_action_masks,
+        )
+        self._allocate(2 * self.capacity)
+        new_arrays = (
+            self.children,
+            self.num_successors,
+            self.depths,
+            self.state_values,
+            self.prior_distributions,
+            self.action_value_sums,
+            self.visit_counts,
+            self.legal_action_masks,
+        )
+        for array, new_array in zip(arrays, new_arrays):
+            new_array[: self.num_nodes] = array[: self.num_nodes]
+        # attributes are views into the old arrays and need to be recreated
+        for node, attributes in enumerate(self.node_attributes):
+            if attributes is not None:
+                self.node_attributes[node] = self._create_attributes_view(node)
+
+    def _add_node(self, state, depth):
+        if self.num_nodes == self.capacity:
+            self._grow()
+        node = self.num_nodes
+        self.num_nodes += 1
+        self.node_states.append(state)
+        self.node_attributes.append(None)
+        self.depths[node] = depth
+        if self.transpositions:
+            self.state_nodes[state] = node
+        return node
+
+    def reset_root(self, root):
+        """
+        Make node root the new root and keep only its subtree (including the attributes).
+
+        The subtree is moved to the front of the arrays level by level, so the cost depends on the size
+        of the kept subtree only.
+        """
+        levels = [np.array([root])]
+        visited = np.zeros(self.num_nodes, dtype=bool)
+        visited[root] = True
+        while levels[-1].size > 0:
+            successors = self.children[levels[-1]].reshape(-1)
+            # nodes shared between paths (transpositions) are kept once
+            successors = np.unique(successors[successors != NO_NODE])
+            successors = successors[~visited[successors]]
+            visited[successors] = True
+            levels.append(successors)
+        self._keep_nodes(np.concatenate(levels))
+
+    def prune(self, num_nodes):
+        """Keep only the num_nodes most visited nodes (see get_most_visited_nodes)."""
+        self._keep_nodes(np.array(get_most_visited_nodes(self, num_nodes)))
+
+    def _keep_nodes(self, kept_nodes):
+        """Move kept_nodes (starting with the new root) to the front of the arrays and drop all other nodes."""
+        root = kept_nodes[0]
+        num_kept_nodes = kept_nodes.size
+
+        new_ids = np.full(self.num_nodes, NO_NODE, dtype=np.int32)
+        new_ids[kept_nodes] = np.arange(num_kept_nodes)
+        kept_children = self.children[kept_nodes]
+        has_child = kept_children != NO_NODE
+        kept_children[has_child] = new_ids[kept_children[has_child]]
+
+        self.children[:num_kept_nodes] = kept_children
+        self.children[num_kept_nodes : self.num_nodes] = NO_NODE
+        # links to dropped successors are removed
+        self.num_successors[:num_kept_nodes] = np.count_nonzero(kept_children != NO_NODE, axis=1)
+        self.num_successors[num_kept_nodes : self.num_nodes] = 0
+        self.depths[:num_kept_nodes] = self.depths[kept_nodes] - self.depths[root]
+        for array in (
+            self.state_values,
+            self.prior_distributions,
+            self.action_value_sums,
+            self.visit_counts,
+            self.legal_action_masks,
+        ):
+            array[:num_kept_nodes] = array[kept_nodes]
+
+        kept_attributes = [self.node_attributes[node] is not None for node in kept_nodes]
+        self.node_states = [self.node_states[node] for node in kept_nodes]
+        self.node_attributes = [None] * num_kept_nodes
+        for node, has_attributes in enumerate(kept_attributes):
+            if has_attributes:
+                self.node_attributes[node] = self._create_attributes_view(node)
+        if self.transpositions:
+            self.state_nodes = {state: node for node, state in enumerate(self.node_states)}
+        self.num_nodes = num_kept_nodes
+        self.root = 0
+
+    def _create_attributes_view(self, node):
+        return Attributes.from_arrays(
+            state_value=self.state_values[node],
+            prior_distribution=self.prior_distributions[node],
+            action_value_sum=self.action_value_sums[node],
+            visit_count=self.visit_counts[node],
+            legal_action_mask=self.legal_action_masks[node],
+        )
+
+    @property
+    def states(self):
+        return range(self.num_nodes)
+
+    def get_state(self, node):
+        return self.node_states[node]
+
+    def add_successor(self, successor, source, action):
+        if self.children[source, action] != NO_NODE:
+            raise ActionAlreadyExistsException()
+        node = self.state_nodes.get(successor) if self.transpositions else None
+        if node is None:
+            node = self._add_node(successor, depth=self.depths[source] + 1)
+        self.children[source, action] = node
+        self.num_successors[source] += 1
+        return node
+
+    def get_actions(self, source):
+        return np.flatnonzero(self.children[source] != NO_NODE).tolist()
+
+    def has_successor(self, source, action):
+        return self.children[source, action] != NO_NODE
+
+    def get_successor(self, source, action):
+        return int(self.children[source, action])
+
+    def has_successors(self, source):
+        return self.num_successors[source] > 0
+
+    def get_attributes(self, state):
+        return self.node_attributes[state]
+
+    def set_attributes(self, attributes, state):
+        if attributes is None:
+            self.node_attributes[state] = None
+            return
+
+        self.state_values[state] = attributes.state_value
+        self.prior_distributions[state] = attributes.prior_distribution
+        self.action_value_sums[state] = attributes.action_value_sum
+        self.visit_counts[state] = attributes.visit_count
+        self.legal_action_masks[state] = attributes.legal_action_mask
+        self.node_attributes[state] = self._create_attributes_view(state)
+
+    def get_num_nodes(self):
+        return self.num_nodes
+
+    def get_mean_node_depth(self):
+        return np.mean(self.depths[: self.num_nodes])
+
+    def to_game_state_graph(self):
+        """Convert to a GameStateGraph with game states as nodes."""
+        graph = GameStateGraph(self.node_states[self.root])
+        graph.set_attributes(self.node_attributes[self.root], state=self.node_states[self.root])
+        for source in range(self.num_nodes):
+            for action in self.get_actions(source):
+                successor = self.get_successor(source, action)
+                graph.add_successor(self.node_states[successor], source=self.node_states[source], action=action)
+                graph.set_attributes(self.node_attributes[successor], state=self.node_states[successor])
+        return graph
+
+    def draw(self):
+        self.to_game_state_graph().draw()
@@ -2,11 +2,31 @@ import numpy as np
 
 
 class Attributes(object):
-    def __init__(self, state_value, prior_distribution):
+    def __init__(self, state_value, prior_distribution, legal_action_mask=None):
         self.state_value = state_value
         self.prior_distribution = prior_distribution
-        self.action_value = np.zeros(len(prior_distribution))
+        # running sum of backed up values, the mean action value is only computed when needed
+        self.action_value_sum = np.zeros(len(prior_distribution))
         self.visit_count = np.zeros(len(prior_distribution))
+        if legal_action_mask is None:
+            legal_action_mask = np.ones(len(prior_distribution), dtype=bool)
+        self.legal_action_mask = legal_action_mask
+
+    @classmethod
+    def from_arrays(cls, state_value, prior_distribution, action_value_sum, visit_count, legal_action_mask):
+        """Create attributes which use the given arrays (e.g. views into a larger array) as storage."""
+        attributes = cls.__new__(cls)
+        attributes.state_value = state_value
+        attributes.prior_distribution = prior_distribution
+        attributes.action_value_sum = action_value_sum
+        attributes.visit_count = visit_count
+        attributes.legal_action_mask = legal_action_mask
+        return attributes
+
+    @property
+    def action_value(self):
+        """Mean backed up value of every action (0 for unvisited actions)."""
+        return self.action_value_sum / np.maximum(self.visit_count, 1)
 
     def __str__(self):
         return "state_value=%.2f\nprior_distribution=%s\naction_value=%s\nvisit_count=%s" % (
@@ -1,98 +1,125 @@
 import logging
 
+import numpy as np
 import torch
-from torch import tensor, tanh, sum, mean, log
-from torch.nn import Linear, Module, Conv2d
-from torch.nn.functional import mse_loss, softmax, relu
+from torch import tanh, sum, mean
+from torch.nn import Conv2d, Linear, Module, ModuleList
+from torch.nn.functional import mse_loss, softmax, log_softmax, relu
 from torch.optim import Adam
 
 
+class ResidualBlock(Module):
+    """Two 3x3 convolutions with a skip connection around them."""
+
+    def __init__(self, num_channels):
+        super().__init__()
+        self.cv_first = Conv2d(num_channels, num_channels, kernel_size=3, padding=1)
+        self.cv_second = Conv2d(num_channels, num_channels, kernel_size=3, padding=1)
+
+    def forward(self, hidden):
+        residual = self.cv_second(relu(self.cv_first(hidden)))
+        return relu(hidden + residual)
+
+
 class CnnEstimator(Module):
-    def __init__(
-        self,
-        board_size,
-        actions,
-        hidden_layer_scale=10,
-        num_common_hidden_layers=3,
-        num_action_hidden_layers=2,
-        num_value_hidden_layers=2,
-    ):
+    """
+    Residual convolutional policy and value network.
+
+    The board is fed as three planes: the stones of the player, the stones of the opponent and the side to move
+    (filled with ones when the starting player is to move, i.e. the number of stones is even). A 3x3 convolution
+    and num_residual_blocks residual blocks of num_channels channels are followed by a policy head (1x1
+    convolution and linear layer to the actions) and a value head (1x1 convolution and two linear layers).
+    """
+
+    # values of the stones in the state arrays (see Evaluator)
+    STATE_ARRAY_PLAYER = 1
+    STATE_ARRAY_OPPONENT = -1
+    NUM_INPUT_PLANES = 3
+    NUM_POLICY_CHANNELS = 2
+    VALUE_HIDDEN_SIZE = 64
+
+    def __init__(self, board_size, actions, num_residual_blocks=4, num_channels=32):
         super().__init__()
         self.logger = logging.getLogger(self.__class__.__module__ + "." + self.__class__.__name__)
 
         self.actions = actions
-        self.board_size = board_size
-        board_width, board_height = board_size
-        self.input_size = board_width * board_height
-        # self.hidden_size = board_size * 10
-
-        conv_kernel_size = 4
-        conv_num_channels = 64
-        self.conv_output_size = (
-            conv_num_channels * (board_width - conv_kernel_size + 1) * (board_height - conv_kernel_size + 1)
-        )
-        self.hidden_size = self.input_size * 10
-
+        # incremented with every change of the parameters (e.g. to invalidate cached evaluations)
+        self.parameters_version = 0
+        # board size is (rows, columns)
+        self.board_size = tuple(board_size)
+        num_fields = self.board_size[0] * self.board_size[1]
         self.action_size = len(actions)
         self.value_size = 1
 
-        # input linear layers
-        # self.fc_input = Linear(self.input_size, self.hidden_size)
-
-        # common conv layers
-        self.cv_common1 = Conv2d(in_channels=1, out_channels=conv_num_channels, kernel_size=conv_kernel_size)
-
-        # common linear layers
-        self.fc_common2 = Linear(self.conv_output_size, self.conv_output_size)
-        self.fc_common3 = Linear(self.conv_output_size, self.hidden_size)
+        # common layers
+        self.cv_input = Conv2d(self.NUM_INPUT_PLANES, num_channels, kernel_size=3, padding=1)
+        self.residual_blocks = ModuleList([ResidualBlock(num_channels) for _ in range(num_residual_blocks)])
 
         # action distribution layers
-        self.fc_action1 = Linear(self.hidden_size, self.hidden_size)
-        self.fc_action2 = Linear(self.hidden_size, self.action_size)
+        self.cv_action = Conv2d(num_channels, self.NUM_POLICY_CHANNELS, kernel_size=1)
+        self.fc_action_output = Linear(self.NUM_POLICY_CHANNELS * num_fields, self.action_size)
 
         # state value layers
-        self.fc_value1 = Linear(self.hidden_size, self.hidden_size)
-        self.fc_value2 = Linear(self.hidden_size, self.value_size)
+        self.cv_value = Conv2d(num_channels, 1, kernel_size=1)
+        self.fc_value_hidden = Linear(num_fields, self.VALUE_HIDDEN_SIZE)
+        self.fc_value_output = Linear(self.VALUE_HIDDEN_SIZE, self.value_size)
+
         self.optimizer = Adam(self.parameters(), weight_decay=5e-4)
 
+    def _get_input_planes(self, state_array_batch):
+        state_array_batch = np.asarray(state_array_batch).reshape((-1,) + self.board_size)
+        planes = np.empty((len(state_array_batch), self.NUM_INPUT_PLANES) + self.board_size, dtype=np.float32)
+        planes[:, 0] = state_array_batch == self.STATE_ARRAY_PLAYER
+        planes[:, 1] = state_array_batch == self.STATE_ARRAY_OPPONENT
+        num_stones = np.count_nonzero(state_array_batch.reshape(len(state_array_batch), -1), axis=1)
+        planes[:, 2] = (num_stones % 2 == 0)[:, np.newaxis, np.newaxis]
+        return torch.from_numpy(planes)
+
+    @torch.no_grad()
     def infer(self, state_array):
-        state = tensor(state_array).float().view(1, *self.board_size)
-        action_distribution, state_value = self._forward(state)
-        action_distribution_array = action_distribution.view(-1).detach().numpy()
-        state_value_array = state_value.view(-1).detach().item()
+        action_logits, state_value = self._forward(self._get_input_planes(state_array))
+        action_distribution_array = softmax(action_logits, dim=1).view(-1).numpy()
+        state_value_array = state_value.view(-1).item()
         return action_distribution_array, state_value_array
 
-    def _forward(self, state):
+    @torch.no_grad()
+    def infer_batch(self, state_array_batch):
+        action_logits, state_value = self._forward(self._get_input_planes(state_array_batch))
+        action_distribution_batch = softmax(action_logits, dim=1).numpy()
+        state_value_batch = state_value.view(-1).numpy()
+        return action_distribution_batch, state_value_batch
+
+    def _forward(self, planes):
+        """Return the action logits (the loss uses their log softmax, which is stable) and the state values."""
         # common
-        common_hidden = state.view(-1, 1, *self.board_size)
-        common_hidden = relu(self.cv_common1(common_hidden))
-        common_hidden = common_hidden.view(-1, self.conv_output_size)
-        common_hidden = relu(self.fc_common2(common_hidden))
-        common_hidden = relu(self.fc_common3(common_hidden))
+        common_hidden = relu(self.cv_input(planes))
+        for residual_block in self.residual_blocks:
+            common_hidden = residual_block(common_hidden)
 
         # action_distribution
-        action_hidden = relu(self.fc_action1(common_hidden))
-        action_distribution = softmax(self.fc_action2(action_hidden), dim=1)
-        # action_distribution = normalize(sigmoid(self.fc_distr2(distr)), p=1, dim=1)
+        action_hidden = relu(self.cv_action(common_hidden)).flatten(start_dim=1)
+        action_logits = self.fc_action_output(action_hidden)
 
         # state_value
-        value_hidden = relu(self.fc_value1(common_hidden))
-        state_value = tanh(self.fc_value2(value_hidden))
+        value_hidden = relu(self.cv_value(common_hidden)).flatten(start_dim=1)
+        value_hidden = relu(self.fc_value_hidden(value_hidden))
+        state_value = tanh(self.fc_value_output(value_hidden))
 
-        return action_distribution, state_value
+        return action_logits, state_value
 
     def train(self, state_array, target_distribution_array, target_state_value_array):
-        state = tensor(state_array).float().view(-1, *self.board_size)
-        target_state_value = tensor(target_state_value_array).float().view(-1, self.value_size)
-        target_distribution = tensor(target_distribution_array).float().view(-1, self.action_size)
+        planes = self._get_input_planes(state_array)
+        target_state_value = torch.tensor(target_state_value_array).float().view(-1, self.value_size)
+        target_distribution = torch.tensor(target_distribution_array).float().view(-1, self.action_size)
 
         self.optimizer.zero_grad()
-        action_distribution, state_value = self._forward(state)
+        action_logits, state_value = self._forward(planes)
         state_value_loss = mse_loss(state_value, target_state_value)
-        action_value_loss = mean(sum(target_distribution * -log(action_distribution), dim=1))
+        action_value_loss = mean(sum(target_distribution * -log_softmax(action_logits, dim=1), dim=1))
         loss = state_value_loss + action_value_loss
         loss.backward()
         self.optimizer.step()
+        self.parameters_version += 1
 
         return loss.item()
 
@@ -105,6 +132,10 @@ class CnnEstimator(Module):
         try:
             state_dict = torch.load(filename)
             self.load_state_dict(state_dict)
+            self.parameters_version += 1
             self.logger.info("Loaded parameters from %s" % filename)
         except FileNotFoundError:
             self.logger.warning("Could not load parameters from %s" % filename)
+        except RuntimeError as error:
+            # e.g. parameters of another network configuration
+            self.logger.warning("Could not load parameters from %s: %s" % (filename, error))
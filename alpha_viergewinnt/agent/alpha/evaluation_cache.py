@@ -0,0 +1,80 @@
+from collections import OrderedDict
+from threading import Lock
+
+
+class EvaluationCache(object):
+    """
+    Thread-safe least recently used cache of estimator results (prior distribution and state value).
+
+    Entries are keyed by the bytes of the estimator input. The state array is from the perspective of the
+    evaluating player, so the same position is found again independent of the move order and of the agent
+    (X or O) which evaluates it. Entries are valid for one parameters version of the estimator only, and
+    the cache is cleared when it sees a new version. Use one cache per estimator.
+    """
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.entries = OrderedDict()
+        self.parameters_version = None
+        self.lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __getstate__(self):
+        # copies in other processes start empty with their own lock
+        state = self.__dict__.copy()
+        del state["lock"]
+        state["entries"] = OrderedDict()
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.lock = Lock()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, state_array, parameters_version):
+        """Return the cached (prior_distribution, state_value) of state_array, or None."""
+        key = state_array.tobytes()
+        with self.lock:
+            self._check_parameters_version(parameters_version)
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, state_array, parameters_version, prior_distribution, state_value):
+        # cached arrays are shared between all users of the entry
+        prior_distribution = prior_distribution.copy()
+        prior_distribution.setflags(write=False)
+        key = state_array.tobytes()
+        with self.lock:
+            self._check_parameters_version(parameters_version)
+            self.entries[key] = (prior_distribution, state_value)
+            self.entries.move_to_end(key)
+            if len(self.entries) > self.capacity:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def _check_parameters_version(self, parameters_version):
+        if parameters_version != self.parameters_version:
+            self.entries.clear()
+            self.parameters_version = parameters_version
+
+    def get_hit_rate(self):
+        num_lookups = self.hits + self.misses
+        return self.hits / num_lookups if num_lookups > 0 else 0.0
+
+    def __str__(self):
+        return "entries=%d hits=%d misses=%d evictions=%d hit_rate=%.2f" % (
+            len(self.entries),
+            self.hits,
+            self.misses,
+            self.evictions,
+            self.get_hit_rate(),
+        )
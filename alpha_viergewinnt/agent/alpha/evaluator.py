@@ -1,3 +1,6 @@
+import enum
+from collections import namedtuple
+
 import numpy as np
 
 
@@ -5,6 +8,17 @@ class GameNotFinishedException(Exception):
     pass
 
 
+# training targets of one game for the estimator (stacked arrays of equal length)
+TrainingBatch = namedtuple("TrainingBatch", ["state_array", "target_distribution", "target_state_value"])
+
+
+class SymmetricInference(enum.Enum):
+    # average the estimates of all symmetric boards
+    AVERAGE = "average"
+    # estimate (and cache) only a canonical representative of the symmetric boards
+    CANONICAL = "canonical"
+
+
 class Evaluator(object):
     # constants for state values and state array
     STATE_VALUE_WIN = 1
@@ -14,9 +28,27 @@ class Evaluator(object):
     STATE_ARRAY_PLAYER = 1
     STATE_ARRAY_OPPONENT = -1
 
-    def __init__(self, estimator, player):
+    def __init__(
+        self,
+        estimator,
+        player,
+        evaluation_cache=None,
+        symmetric_inference=None,
+        augment_symmetries=False,
+        endgame_solver=None,
+    ):
+        """
+        Symmetries are taken from the evaluated states. With symmetric_inference (a SymmetricInference),
+        estimates use the symmetries of the board, with augment_symmetries training batches are expanded
+        with all symmetric boards. With an endgame_solver, the estimated state values of solved endgame states
+        are replaced by their exact values.
+        """
         self.estimator = estimator
         self.player = player
+        self.evaluation_cache = evaluation_cache
+        self.symmetric_inference = symmetric_inference
+        self.augment_symmetries = augment_symmetries
+        self.endgame_solver = endgame_solver
 
     def evaluate(self, state):
         try:
@@ -24,13 +56,122 @@ class Evaluator(object):
         except GameNotFinishedException:
             game_finished = False
             state_array = self._get_array_from_state(state)
-            prior_distribution, state_value = self.estimator.infer(state_array)
-            return prior_distribution, state_value, game_finished
+            if self.symmetric_inference is None:
+                prior_distribution, state_value = self._infer(state_array)
+            else:
+                [(prior_distribution, state_value)] = self._infer_batch([state_array], state.get_symmetries())
+            return prior_distribution, self._get_solved_state_value(state, state_value), game_finished
 
         game_finished = True
         prior_distribution = np.zeros(len(self.estimator.actions))
         return prior_distribution, state_value, game_finished
 
+    def evaluate_batch(self, states):
+        """
+        Evaluate a list of states like evaluate, with a single estimator call for all states of unfinished games.
+        """
+        evaluations = [None] * len(states)
+        unfinished_indices = []
+        for index, state in enumerate(states):
+            try:
+                state_value = self._get_final_state_value(state)
+            except GameNotFinishedException:
+                unfinished_indices.append(index)
+                continue
+            evaluations[index] = (np.zeros(len(self.estimator.actions)), state_value, True)
+
+        if unfinished_indices:
+            state_arrays = [self._get_array_from_state(states[index]) for index in unfinished_indices]
+            symmetries = states[unfinished_indices[0]].get_symmetries() if self.symmetric_inference else None
+            estimates = self._infer_batch(state_arrays, symmetries)
+            for index, (prior_distribution, state_value) in zip(unfinished_indices, estimates):
+                evaluations[index] = (
+                    prior_distribution,
+                    self._get_solved_state_value(states[index], state_value),
+                    False,
+                )
+        return evaluations
+
+    def _get_solved_state_value(self, state, state_value):
+        """Get the exact value of state if it is a solved endgame state, otherwise the estimated state_value."""
+        if self.endgame_solver is None:
+            return state_value
+        solved_state_value = self.endgame_solver.get_value(state, self.player)
+        return state_value if solved_state_value is None else solved_state_value
+
+    def _infer_batch(self, state_arrays, symmetries=None):
+        """
+        Estimate prior distribution and state value of a list of state arrays, with a single estimator call for
+        all state arrays which are not cached. Symmetries are used according to symmetric_inference.
+        """
+        if self.symmetric_inference == SymmetricInference.CANONICAL:
+            canonical_symmetries = [
+                self._get_canonical_symmetry(state_array, symmetries) for state_array in state_arrays
+            ]
+            state_arrays = [
+                symmetry.transform_array(state_array)
+                for symmetry, state_array in zip(canonical_symmetries, state_arrays)
+            ]
+
+        estimates = [self._get_cached(state_array) for state_array in state_arrays]
+        missing_indices = [index for index, estimate in enumerate(estimates) if estimate is None]
+        if missing_indices:
+            missing_state_arrays = [state_arrays[index] for index in missing_indices]
+            if self.symmetric_inference == SymmetricInference.AVERAGE:
+                prior_distribution_batch, state_value_batch = self._infer_average(missing_state_arrays, symmetries)
+            else:
+                prior_distribution_batch, state_value_batch = self.estimator.infer_batch(np.stack(missing_state_arrays))
+            for batch_index, index in enumerate(missing_indices):
+                prior_distribution, state_value = prior_distribution_batch[batch_index], state_value_batch[batch_index]
+                self._put_cached(state_arrays[index], prior_distribution, state_value)
+                estimates[index] = (prior_distribution, state_value)
+
+        if self.symmetric_inference == SymmetricInference.CANONICAL:
+            estimates = [
+                (symmetry.inverse_transform_distribution(prior_distribution), state_value)
+                for symmetry, (prior_distribution, state_value) in zip(canonical_symmetries, estimates)
+            ]
+        return estimates
+
+    def _infer_average(self, state_arrays, symmetries):
+        """Estimate a batch of state arrays as the mean of the estimates of all symmetric state arrays."""
+        num_symmetries = len(symmetries)
+        symmetric_state_array_batch = np.stack(
+            [symmetry.transform_array(state_array) for state_array in state_arrays for symmetry in symmetries]
+        )
+        prior_distribution_batch, state_value_batch = self.estimator.infer_batch(symmetric_state_array_batch)
+        prior_distribution_batch = np.stack(
+            [
+                symmetries[batch_index % num_symmetries].inverse_transform_distribution(prior_distribution)
+                for batch_index, prior_distribution in enumerate(prior_distribution_batch)
+            ]
+        )
+        prior_distribution_batch = prior_distribution_batch.reshape(len(state_arrays), num_symmetries, -1).mean(axis=1)
+        state_value_batch = np.reshape(state_value_batch, (len(state_arrays), num_symmetries)).mean(axis=1)
+        return prior_distribution_batch, state_value_batch
+
+    @staticmethod
+    def _get_canonical_symmetry(state_array, symmetries):
+        """Get the symmetry which transforms state_array into the symmetric state array with the smallest bytes."""
+        return min(symmetries, key=lambda symmetry: symmetry.transform_array(state_array).tobytes())
+
+    def _infer(self, state_array):
+        cached = self._get_cached(state_array)
+        if cached is not None:
+            return cached
+        prior_distribution, state_value = self.estimator.infer(state_array)
+        self._put_cached(state_array, prior_distribution, state_value)
+        return prior_distribution, state_value
+
+    def _get_cached(self, state_array):
+        if self.evaluation_cache is None:
+            return None
+        return self.evaluation_cache.get(state_array, self.estimator.parameters_version)
+
+    def _put_cached(self, state_array, prior_distribution, state_value):
+        if self.evaluation_cache is not None:
+            self.evaluation_cache.put(state_array, self.estimator.parameters_version, prior_distribution, state_value)
+
     def _get_final_state_value(self, state):
         if state.is_winner(self.player):
             return self.STATE_VALUE_WIN
@@ -50,11 +191,35 @@ class Evaluator(object):
         )
 
     def train(self, states_and_search_distributions, final_state):
+        training_batch = self.get_training_batch(states_and_search_distributions, final_state)
+        return self.train_on_batch(training_batch)
+
+    def get_training_batch(self, states_and_search_distributions, final_state):
+        """Get the training targets for the recorded states and search distributions of a finished game."""
         target_state_value = self._get_final_state_value(final_state)
 
         states, target_distributions = zip(*states_and_search_distributions)
         target_distribution_batch = np.stack(target_distributions)
         state_array_batch = np.stack([self._get_array_from_state(state) for state in states])
         target_state_value_batch = np.full(len(states_and_search_distributions), target_state_value)
-        loss = self.estimator.train(state_array_batch, target_distribution_batch, target_state_value_batch)
-        return loss
+        training_batch = TrainingBatch(state_array_batch, target_distribution_batch, target_state_value_batch)
+        if self.augment_symmetries:
+            training_batch = self.augment_training_batch(training_batch, final_state.get_symmetries())
+        return training_batch
+
+    @staticmethod
+    def augment_training_batch(training_batch, symmetries):
+        """
+        Expand a training batch with the symmetric state arrays and target distributions of all symmetries. The
+        samples of every symmetry follow each other, the samples of the first symmetry (the identity) come first.
+        """
+        return TrainingBatch(
+            np.concatenate([symmetry.transform_array(training_batch.state_array) for symmetry in symmetries]),
+            np.concatenate(
+                [symmetry.transform_distribution(training_batch.target_distribution) for symmetry in symmetries]
+            ),
+            np.tile(training_batch.target_state_value, len(symmetries)),
+        )
+
+    def train_on_batch(self, training_batch):
+        return self.estimator.train(*training_batch)
@@ -1,7 +1,9 @@
 from .generic_estimator import GenericEstimator
-from .mlp_estimator import MlpEstimator
 from .evaluator import Evaluator
 from .alpha import AlphaAgent, AlphaTrainer
+from ..parallel_search import SearchMode
+from ..time_control import create_time_control
+from ..endgame_solver import create_endgame_solver
 
 
 def create_generic_estimator(game):
@@ -9,14 +11,89 @@ def create_generic_estimator(game):
 
 
 def create_mlp_estimator(game):
+    # torch is only imported for the trainable estimator
+    from .mlp_estimator import MlpEstimator
+
     return MlpEstimator(board_size=game.board_size, actions=game.get_all_moves())
 
 
-def create_alpha_agent(estimator, player, mcts_steps, random_seed=None, draw_graph=False):
-    evaluator = Evaluator(estimator, player)
-    return AlphaAgent(evaluator=evaluator, mcts_steps=mcts_steps, random_seed=random_seed, draw_graph=draw_graph)
+def create_cnn_estimator(game, num_residual_blocks=4, num_channels=32):
+    from .cnn_estimator import CnnEstimator
+
+    return CnnEstimator(
+        board_size=game.board_size,
+        actions=game.get_all_moves(),
+        num_residual_blocks=num_residual_blocks,
+        num_channels=num_channels,
+    )
+
+
+def create_alpha_agent(
+    estimator,
+    player,
+    mcts_steps,
+    random_seed=None,
+    draw_graph=False,
+    array_tree=False,
+    reuse_tree=True,
+    batch_size=1,
+    evaluation_cache=None,
+    symmetric_inference=None,
+    augment_symmetries=False,
+    search_workers=1,
+    search_mode=SearchMode.ROOT,
+    move_time=None,
+    game_time=None,
+    move_increment=0,
+    endgame_empty_fields=0,
+    max_tree_nodes=None,
+):
+    # the transposition table of the solver is shared by the root and the leaves of the search
+    endgame_solver = create_endgame_solver(endgame_empty_fields)
+    evaluator = Evaluator(estimator, player, evaluation_cache, symmetric_inference, augment_symmetries, endgame_solver)
+    return AlphaAgent(
+        evaluator=evaluator,
+        mcts_steps=mcts_steps,
+        random_seed=random_seed,
+        draw_graph=draw_graph,
+        array_tree=array_tree,
+        reuse_tree=reuse_tree,
+        batch_size=batch_size,
+        search_workers=search_workers,
+        search_mode=search_mode,
+        time_control=create_time_control(move_time, game_time, move_increment),
+        endgame_solver=endgame_solver,
+        max_tree_nodes=max_tree_nodes,
+    )
 
 
-def create_alpha_trainer(estimator, player, mcts_steps, random_seed=None, draw_graph=False):
-    evaluator = Evaluator(estimator, player)
-    return AlphaTrainer(evaluator, mcts_steps, random_seed, draw_graph)
+def create_alpha_trainer(
+    estimator,
+    player,
+    mcts_steps,
+    random_seed=None,
+    draw_graph=False,
+    array_tree=False,
+    reuse_tree=True,
+    batch_size=1,
+    evaluation_cache=None,
+    symmetric_inference=None,
+    augment_symmetries=False,
+    move_time=None,
+    endgame_empty_fields=0,
+    max_tree_nodes=None,
+):
+    # the trainer records search distributions of every move, so the solver only evaluates leaves
+    endgame_solver = create_endgame_solver(endgame_empty_fields)
+    evaluator = Evaluator(estimator, player, evaluation_cache, symmetric_inference, augment_symmetries, endgame_solver)
+    return AlphaTrainer(
+        evaluator,
+        mcts_steps,
+        random_seed,
+        draw_graph,
+        array_tree,
+        reuse_tree,
+        batch_size,
+        time_control=create_time_control(move_time),
+        max_tree_nodes=max_tree_nodes,
+    )
@@ -4,12 +4,19 @@ import numpy as np
 class GenericEstimator(object):
     def __init__(self, actions):
         self.actions = actions
+        # the dummy estimation never changes
+        self.parameters_version = 0
 
     def infer(self, state_array):
         # dummy estimation
         uniform_action_value = np.ones(len(self.actions)) / len(self.actions)
         return uniform_action_value, 0
 
+    def infer_batch(self, state_array_batch):
+        batch_size = len(state_array_batch)
+        uniform_action_value_batch = np.ones((batch_size, len(self.actions))) / len(self.actions)
+        return uniform_action_value_batch, np.zeros(batch_size)
+
     def train(self, state_array, target_distribution, target_state_value):
         # dummy training
         dummy_loss = 0
@@ -1,3 +1,6 @@
+import heapq
+import itertools
+
 import numpy as np
 import networkx as nx
 
@@ -12,16 +15,20 @@ class GameStateGraph(nx.DiGraph):
         self.root = root
         self.add_node(root, attributes=None)
 
-    @classmethod
-    def create_path(cls, root):
-        return GameStatePath(root)
-
     def reset_root(self, root):
+        """
+        Make root the new root and keep only its subtree (including the attributes).
+
+        The subtree is copied, so the cost depends on the size of the kept subtree only.
+        """
         self.root = root
         if root in self.nodes:
-            nodes_for_pruning = set(self.nodes) - nx.descendants(self, root) - {root}
-            self.remove_nodes_from(nodes_for_pruning)
-            self.set_attributes(None, state=root)
+            subtree_nodes = list(nx.dfs_preorder_nodes(self, root))
+            nodes = [(node, self.nodes[node]) for node in subtree_nodes]
+            edges = list(self.out_edges(subtree_nodes, data=True))
+            self.clear()
+            self.add_nodes_from(nodes)
+            self.add_edges_from(edges)
         else:
             self.clear()
             self.add_node(root, attributes=None)
@@ -30,15 +37,25 @@ class GameStateGraph(nx.DiGraph):
     def states(self):
         return self.nodes
 
+    def get_state(self, node):
+        # nodes are the game states themselves
+        return node
+
     def add_successor(self, successor, source, action):
         if action in self.get_actions(source):
             raise ActionAlreadyExistsException()
-        self.add_node(successor, attributes=None)
+        # with transpositions the successor may already be in the graph (reached by another path)
+        if successor not in self.nodes:
+            self.add_node(successor, attributes=None)
         self.add_edge(source, successor, action=action)
+        return successor
 
     def get_actions(self, source):
         return [self.get_edge_data(*edge)["action"] for edge in self.edges(source)]
 
+    def has_successor(self, source, action):
+        return action in self.get_actions(source)
+
     def get_successor(self, source, action):
         (successor,) = [edge[1] for edge in self.edges(source) if self.get_edge_data(*edge)["action"] == action]
         return successor
@@ -55,16 +72,19 @@ class GameStateGraph(nx.DiGraph):
     def get_predecessors(self, state):
         return set(self.predecessors(state))
 
+    def get_num_nodes(self):
+        return self.number_of_nodes()
+
+    def prune(self, num_nodes):
+        """Keep only the num_nodes most visited nodes (see get_most_visited_nodes)."""
+        kept_nodes = set(get_most_visited_nodes(self, num_nodes))
+        self.remove_nodes_from([node for node in self.nodes if node not in kept_nodes])
+
     def get_mean_node_depth(self):
-        node_depths = self._get_node_depths(self.root, 0)
+        # shortest path lengths visit every node once, also if the graph shares nodes between paths
+        node_depths = nx.single_source_shortest_path_length(self, self.root)
         return np.mean(list(node_depths.values()))
 
-    def _get_node_depths(self, source, start_depth):
-        node_depths = {source: start_depth}
-        for _, successor in self.edges(source):
-            node_depths.update(self._get_node_depths(successor, start_depth + 1))
-        return node_depths
-
     def draw(self):
         visible = self.subgraph({node for node in self.nodes if self.get_attributes(node) is not None})
         state_labels = {node: self._get_state_label(node) for node in visible.nodes()}
@@ -83,20 +103,26 @@ class GameStateGraph(nx.DiGraph):
         return str(self.get_edge_data(*edge)["action"])
 
 
-class GameStatePath(GameStateGraph):
-    def __init__(self, root):
-        super().__init__(root)
-        self.leaf = root
-
-    def add_successor(self, successor, action):
-        self.add_node(successor)
-        self.add_edge(self.leaf, successor, action=action)
-        self.leaf = successor
-
-    def get_action(self, source):
-        (action,) = self.get_actions(source)
-        return action
-
-    def get_predecessor(self, state):
-        (predecessor,) = self.get_predecessors(state)
-        return predecessor
+def get_most_visited_nodes(graph, num_nodes):
+    """
+    Get up to num_nodes nodes of graph, best first from the root by the visit count of the action leading to them.
+
+    The nodes form a connected subgraph starting with the root. The visit counts and values of dropped successors
+    stay in the attributes of their predecessors, so dropped successors are just added again when selected.
+    """
+    nodes = []
+    discovered = {graph.root}
+    # the counter breaks ties without comparing nodes
+    counter = itertools.count()
+    queue = [(0, next(counter), graph.root)]
+    while queue and len(nodes) < num_nodes:
+        _, _, node = heapq.heappop(queue)
+        nodes.append(node)
+        attributes = graph.get_attributes(node)
+        for action in graph.get_actions(node):
+            successor = graph.get_successor(node, action)
+            if successor not in discovered:
+                discovered.add(successor)
+                visit_count = attributes.visit_count[action] if attributes is not None else 0
+                heapq.heappush(queue, (-visit_count, next(counter), successor))
+    return nodes
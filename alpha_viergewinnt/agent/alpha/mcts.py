@@ -1,114 +1,164 @@
-from copy import deepcopy
-
 import numpy as np
 
 from .attributes import Attributes
 
 
 class Mcts(object):
-    def __init__(self, graph, evaluator):
+    # value update applied to every action on a path which is pending evaluation
+    VIRTUAL_LOSS = -1
+    # Dirichlet exploration noise mixed into the prior distribution of the search root
+    NOISE_ALPHA = 0.5
+    NOISE_WEIGHT = 0.25
+    # no better idea for this factor
+    CONFIDENCE_FACTOR = 4.0
+
+    def __init__(self, graph, evaluator, root_noise=True):
+        """
+        The exploration noise of a search root is sampled once, on its first selection, so use one instance
+        per search.
+        """
         self.graph = graph
         self.evaluator = evaluator
+        self.root_noise = root_noise
+        self.root_prior_distributions = {}
 
     def simulate_step(self, source):
         """
         Run a single MCTS iteration.
         """
-        selected_path = self._select_path(source)
-        self._expand(selected_path.leaf)
-        self._backup(selected_path)
+        leaf, path = self._select_path(source)
+        self._expand(leaf)
+        self._backup(leaf, path)
+
+    def simulate_batch(self, source, batch_size):
+        """
+        Run up to batch_size MCTS iterations, evaluating all selected leaves with a single evaluator call.
+
+        A virtual loss is added along every selected path until the batch is backed up, so the following
+        selections diverge. Paths ending in an already selected leaf are dropped. Return the number of
+        iterations run.
+        """
+        selected_paths = {}
+        for _ in range(batch_size):
+            leaf, path = self._select_path(source)
+            if leaf in selected_paths:
+                continue
+            self._update_path(path, self.VIRTUAL_LOSS)
+            selected_paths[leaf] = path
+
+        leaves = list(selected_paths)
+        leaf_states = [self.graph.get_state(leaf) for leaf in leaves]
+        evaluations = self.evaluator.evaluate_batch(leaf_states)
+        for leaf, leaf_state, evaluation in zip(leaves, leaf_states, evaluations):
+            self._add_evaluation(leaf, leaf_state, *evaluation)
+
+        for leaf, path in selected_paths.items():
+            self._update_path(path, -self.VIRTUAL_LOSS, visit_count_update=-1)
+            self._backup(leaf, path)
+        return len(selected_paths)
 
     def _select_path(self, source):
         """
         Select a path from source to a leaf state in graph according to selection strategy.
+
+        Return the leaf and the path as a list of (state, selected action) pairs from source down to the leaf.
         """
-        path = self.graph.create_path(source)
+        path = []
         state = source
         while not self._is_leaf(state):
-            selected_action = self._select_action(state)
-            successor = self.graph.get_successor(state, selected_action)
-            path.add_successor(successor, selected_action)
-            state = successor
-        return path
+            selected_action = self._select_action(state, is_root=not path)
+            path.append((state, selected_action))
+            state = self._get_or_add_successor(state, selected_action)
+        return state, path
 
     def _is_leaf(self, state):
-        return not self.graph.has_successors(state)
-
-    def _select_action(self, state):
-        potential_value = self._get_potential_value(state)
-        masked_potential_value = self._mask_invalid_actions(potential_value, state, fill_value=np.NINF)
-        return np.argmax(masked_potential_value)
-
-    def _get_potential_value(self, state):
+        # states of finished games have no legal actions
         attributes = self.graph.get_attributes(state)
-
-        noise = np.random.dirichlet(alpha=[0.5] * attributes.prior_distribution.size)
-        noise_weight = 0.25
-        noisy_prior_distribution = (1 - noise_weight) * attributes.prior_distribution + noise_weight * noise
-
-        # no better idea for this factor
-        confidence_factor = 4.0
+        return attributes is None or not attributes.legal_action_mask.any()
+
+    def _get_or_add_successor(self, state, action):
+        """Get the successor of state for action, successors are only added to the graph when first selected."""
+        if self.graph.has_successor(state, action):
+            return self.graph.get_successor(state, action)
+        source_state = self.graph.get_state(state)
+        successor = source_state.clone()
+        successor.play_move(player=source_state.active_player, move=action)
+        return self.graph.add_successor(successor, source=state, action=action)
+
+    def _select_action(self, state, is_root=False):
+        attributes = self.graph.get_attributes(state)
+        if is_root and self.root_noise:
+            prior_distribution = self._get_root_prior_distribution(state, attributes)
+        else:
+            prior_distribution = attributes.prior_distribution
+        potential_value = self._get_potential_value(attributes, prior_distribution)
+        return int(np.where(attributes.legal_action_mask, potential_value, -np.inf).argmax())
+
+    def _get_root_prior_distribution(self, state, attributes):
+        """Get the prior distribution of a search root with exploration noise, sampled on the first call."""
+        noisy_prior_distribution = self.root_prior_distributions.get(state)
+        if noisy_prior_distribution is None:
+            prior_distribution = attributes.prior_distribution
+            noise = np.random.dirichlet(alpha=[self.NOISE_ALPHA] * prior_distribution.size)
+            noisy_prior_distribution = (1 - self.NOISE_WEIGHT) * prior_distribution + self.NOISE_WEIGHT * noise
+            self.root_prior_distributions[state] = noisy_prior_distribution
+        return noisy_prior_distribution
+
+    def _get_potential_value(self, attributes, prior_distribution):
+        visit_count = attributes.visit_count
         upper_confidence_bound = (
-            confidence_factor
-            * noisy_prior_distribution
-            * np.sqrt(np.sum(attributes.visit_count) + 1)
-            / (1 + attributes.visit_count)
+            self.CONFIDENCE_FACTOR * prior_distribution * np.sqrt(visit_count.sum() + 1) / (1 + visit_count)
         )
         return attributes.action_value + upper_confidence_bound
 
-    def _mask_invalid_actions(self, values, state, fill_value):
-        actions = self.graph.get_actions(state)
-        masked_values = np.full_like(values, fill_value)
-        masked_values[actions] = values[actions]
-        return masked_values
-
     def _expand(self, leaf):
         """
-        Evaluate the state value and prior probabilities for all actions with the evaluation model
-        and add resulting actions and states.
+        Evaluate the state value and prior probabilities for all actions with the evaluation model. The successor
+        states are added when they are selected.
         """
         assert self._is_leaf(leaf)
 
-        prior_distribution, state_value, game_finished = self.evaluator.evaluate(leaf)
-
-        attributes = Attributes(state_value, prior_distribution)
-        self.graph.set_attributes(attributes, state=leaf)
+        leaf_state = self.graph.get_state(leaf)
+        prior_distribution, state_value, game_finished = self.evaluator.evaluate(leaf_state)
+        self._add_evaluation(leaf, leaf_state, prior_distribution, state_value, game_finished)
 
+    def _add_evaluation(self, leaf, leaf_state, prior_distribution, state_value, game_finished):
+        legal_action_mask = np.zeros(len(prior_distribution), dtype=bool)
         if not game_finished:
-            for action in leaf.get_possible_moves():
-                successor = deepcopy(leaf)
-                successor.play_move(player=leaf.active_player, move=action)
-                self.graph.add_successor(successor, source=leaf, action=action)
+            legal_action_mask[leaf_state.get_possible_moves()] = True
+        attributes = Attributes(state_value, prior_distribution, legal_action_mask)
+        self.graph.set_attributes(attributes, state=leaf)
 
-    def _backup(self, path):
+    def _backup(self, leaf, path):
         """
-        Backpropagate the state value up a (previously selected) path, by updating the action values and visit count
+        Backpropagate the state value of leaf up a (previously selected) path, by updating the action value sums
+        and visit counts
         """
-        path_state = path.leaf
-        leaf_value = self.graph.get_attributes(path.leaf).state_value
-        while path_state is not path.root:
-            path_state = path.get_predecessor(path_state)
-            path_action = path.get_action(path_state)
-            self._update_attributes(path_state, path_action, action_value_update=leaf_value)
-
-    def _update_attributes(self, state, action, action_value_update):
-        visit_count = self.graph.get_attributes(state).visit_count
-        action_value = self.graph.get_attributes(state).action_value
-
-        total_action_value = action_value[action] * visit_count[action]
-        total_action_value += action_value_update
-        visit_count[action] += 1
-        action_value[action] = total_action_value / visit_count[action]
+        leaf_value = self.graph.get_attributes(leaf).state_value
+        self._update_path(path, leaf_value)
+
+    def _update_path(self, path, action_value_update, visit_count_update=1):
+        for path_state, path_action in path:
+            attributes = self.graph.get_attributes(path_state)
+            attributes.visit_count[path_action] += visit_count_update
+            attributes.action_value_sum[path_action] += action_value_update
 
     def get_prior_distribution(self, state):
         self.graph.get_attributes(state).prior_distribution
 
     def get_search_distribution(self, state, exploration_factor):
-        visit_count = self.graph.get_attributes(state).visit_count
-        masked_visit_count = self._mask_invalid_actions(visit_count, state, fill_value=0)
-        assert np.sum(masked_visit_count) != 0
+        return self.get_visit_count_distribution(self.get_root_visit_count(state), exploration_factor)
+
+    def get_root_visit_count(self, state):
+        """Visit counts of all actions of state, zero for illegal actions."""
+        attributes = self.graph.get_attributes(state)
+        return np.where(attributes.legal_action_mask, attributes.visit_count, 0)
+
+    @staticmethod
+    def get_visit_count_distribution(visit_count, exploration_factor):
+        assert np.sum(visit_count) != 0
         # smaller exploration factor leads to numerical wierdness
         assert exploration_factor >= 0.01
-        likelihoods = np.power(masked_visit_count, 1 / exploration_factor)
+        likelihoods = np.power(visit_count, 1 / exploration_factor)
         probabilities = likelihoods / sum(likelihoods)
         return probabilities
@@ -1,11 +1,14 @@
 import logging
 
+import numpy as np
 import torch
 from torch import tensor, tanh, sum, mean, log
-from torch.nn import Linear, Module
+from torch.nn import Linear, Module, ModuleList
 from torch.nn.functional import mse_loss, softmax, relu
 from torch.optim import Adam
 
+from .numpy_estimator import NumpyEstimator
+
 
 class MlpEstimator(Module):
     def __init__(
@@ -21,6 +24,8 @@ class MlpEstimator(Module):
         self.logger = logging.getLogger(self.__class__.__module__ + "." + self.__class__.__name__)
 
         self.actions = actions
+        # incremented with every change of the parameters (e.g. to invalidate cached evaluations)
+        self.parameters_version = 0
         board_width, board_height = board_size
         self.input_size = board_width * board_height
         self.num_common_hidden_layers = num_common_hidden_layers
@@ -31,27 +36,43 @@ class MlpEstimator(Module):
         self.action_size = len(actions)
         self.value_size = 1
 
+        # stacks of hidden layers are module lists, so that their parameters are trained and saved
         # common hidden layers
         self.fc_common_input = Linear(self.input_size, hidden_size)
-        self.fc_common_hidden = [Linear(hidden_size, hidden_size) for _ in range(self.num_common_hidden_layers)]
+        self.fc_common_hidden = ModuleList(
+            [Linear(hidden_size, hidden_size) for _ in range(self.num_common_hidden_layers)]
+        )
 
         # action distribution layers
-        self.fc_action_hidden = [Linear(hidden_size, hidden_size) for _ in range(self.num_action_hidden_layers)]
+        self.fc_action_hidden = ModuleList(
+            [Linear(hidden_size, hidden_size) for _ in range(self.num_action_hidden_layers)]
+        )
         self.fc_action_output = Linear(hidden_size, self.action_size)
 
         # state value layers
-        self.fc_value_hidden = [Linear(hidden_size, hidden_size) for _ in range(self.num_value_hidden_layers)]
+        self.fc_value_hidden = ModuleList(
+            [Linear(hidden_size, hidden_size) for _ in range(self.num_value_hidden_layers)]
+        )
         self.fc_value_output = Linear(hidden_size, self.value_size)
 
         self.optimizer = Adam(self.parameters(), weight_decay=5e-4)
 
+    @torch.no_grad()
     def infer(self, state_array):
-        state = tensor(state_array).float().view(1, self.input_size)
+        state = torch.from_numpy(np.asarray(state_array, dtype=np.float32)).view(1, self.input_size)
         action_distribution, state_value = self._forward(state)
-        action_distribution_array = action_distribution.view(-1).detach().numpy()
-        state_value_array = state_value.view(-1).detach().item()
+        action_distribution_array = action_distribution.view(-1).numpy()
+        state_value_array = state_value.view(-1).item()
         return action_distribution_array, state_value_array
 
+    @torch.no_grad()
+    def infer_batch(self, state_array_batch):
+        state = torch.from_numpy(np.asarray(state_array_batch, dtype=np.float32)).view(-1, self.input_size)
+        action_distribution, state_value = self._forward(state)
+        action_distribution_batch = action_distribution.numpy()
+        state_value_batch = state_value.view(-1).numpy()
+        return action_distribution_batch, state_value_batch
+
     def _forward(self, state):
         # common
         common_hidden = relu(self.fc_common_input(state))
@@ -85,9 +106,28 @@ class MlpEstimator(Module):
         loss = state_value_loss + action_value_loss
         loss.backward()
         self.optimizer.step()
+        self.parameters_version += 1
 
         return loss.item()
 
+    def to_numpy_estimator(self):
+        """Freeze the current parameters into an inference only NumpyEstimator."""
+
+        def get_layers(layers):
+            return [(layer.weight.detach().numpy().T.copy(), layer.bias.detach().numpy().copy()) for layer in layers]
+
+        return NumpyEstimator(
+            self.actions,
+            common_layers=get_layers([self.fc_common_input] + list(self.fc_common_hidden)),
+            action_layers=get_layers(list(self.fc_action_hidden) + [self.fc_action_output]),
+            value_layers=get_layers(list(self.fc_value_hidden) + [self.fc_value_output]),
+        )
+
+    def export(self, filename):
+        """Save the current parameters for inference with a NumpyEstimator (see load_numpy_estimator)."""
+        self.to_numpy_estimator().save(filename)
+        self.logger.info("Exported parameters to %s" % filename)
+
     def save(self, filename):
         state_dict = self.state_dict()
         torch.save(state_dict, filename)
@@ -96,7 +136,14 @@ class MlpEstimator(Module):
     def load(self, filename):
         try:
             state_dict = torch.load(filename)
-            self.load_state_dict(state_dict)
+            # files saved before the hidden layers were registered lack their parameters
+            missing_keys, unexpected_keys = self.load_state_dict(state_dict, strict=False)
+            if missing_keys or unexpected_keys:
+                self.logger.warning(
+                    "Parameters in %s do not match (missing: %s, unexpected: %s), keeping initial values"
+                    % (filename, missing_keys, unexpected_keys)
+                )
+            self.parameters_version += 1
             self.logger.info("Loaded parameters from %s" % filename)
         except FileNotFoundError:
             self.logger.warning("Could not load parameters from %s" % filename)
@@ -0,0 +1,88 @@
+import threading
+
+import numpy as np
+
+# layer groups of the network, stored as "<group>_<index>_weight" and "<group>_<index>_bias" in exported files
+LAYER_GROUPS = ("common", "action", "value")
+
+
+class NumpyEstimator(object):
+    """
+    Inference only estimator with the frozen parameters of a trained MlpEstimator as numpy matrices.
+
+    Runs without torch (and without autograd), so playing agents neither import nor pay for the training stack.
+    Layers are (weight, bias) pairs, with weights of shape (inputs, outputs). The common layers and the hidden
+    action and value layers use relu, the last action layer softmax and the last value layer tanh. Inputs are
+    copied into preallocated buffers (one per thread, for tree parallel search).
+    """
+
+    def __init__(self, actions, common_layers, action_layers, value_layers):
+        self.actions = actions
+        # the frozen parameters never change
+        self.parameters_version = 0
+        self.layers = {"common": common_layers, "action": action_layers, "value": value_layers}
+        self.input_size = common_layers[0][0].shape[0]
+        self.input_buffers = {}
+
+    def infer(self, state_array):
+        action_distribution_batch, state_value_batch = self.infer_batch(state_array[np.newaxis])
+        return action_distribution_batch[0], state_value_batch[0].item()
+
+    def infer_batch(self, state_array_batch):
+        state = self._get_input_buffer(len(state_array_batch))
+        state[...] = state_array_batch.reshape(len(state_array_batch), self.input_size)
+
+        common_hidden = self._forward_hidden(state, self.layers["common"])
+        action_logits = self._forward_output(common_hidden, self.layers["action"])
+        value_output = self._forward_output(common_hidden, self.layers["value"])
+
+        action_logits -= action_logits.max(axis=1, keepdims=True)
+        action_distribution = np.exp(action_logits, out=action_logits)
+        action_distribution /= action_distribution.sum(axis=1, keepdims=True)
+        state_value = np.tanh(value_output.reshape(-1))
+        return action_distribution, state_value
+
+    def _get_input_buffer(self, batch_size):
+        thread_id = threading.get_ident()
+        input_buffer = self.input_buffers.get(thread_id)
+        if input_buffer is None or len(input_buffer) < batch_size:
+            input_buffer = np.empty((batch_size, self.input_size), dtype=np.float32)
+            self.input_buffers[thread_id] = input_buffer
+        return input_buffer[:batch_size]
+
+    def _forward_hidden(self, hidden, layers):
+        for weight, bias in layers:
+            hidden = hidden @ weight
+            hidden += bias
+            np.maximum(hidden, 0, out=hidden)
+        return hidden
+
+    def _forward_output(self, hidden, layers):
+        hidden = self._forward_hidden(hidden, layers[:-1])
+        weight, bias = layers[-1]
+        output = hidden @ weight
+        output += bias
+        return output
+
+    def save(self, filename):
+        arrays = {"actions": np.array(self.actions)}
+        for group in LAYER_GROUPS:
+            for index, (weight, bias) in enumerate(self.layers[group]):
+                arrays["%s_%d_weight" % (group, index)] = weight
+                arrays["%s_%d_bias" % (group, index)] = bias
+        with open(filename, "wb") as file:
+            np.savez(file, **arrays)
+
+
+def load_numpy_estimator(filename):
+    """Load an estimator exported with NumpyEstimator.save (or MlpEstimator.export)."""
+    with np.load(filename) as arrays:
+        layers = {}
+        for group in LAYER_GROUPS:
+            num_layers = sum(1 for name in arrays.files if name.startswith(group + "_") and name.endswith("_weight"))
+            layers[group] = [
+                (arrays["%s_%d_weight" % (group, index)], arrays["%s_%d_bias" % (group, index)])
+                for index in range(num_layers)
+            ]
+        actions = arrays["actions"].tolist()
+    return NumpyEstimator(actions, layers["common"], layers["action"], layers["value"])
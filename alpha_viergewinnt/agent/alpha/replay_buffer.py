@@ -0,0 +1,71 @@
+import math
+
+import numpy as np
+
+from .evaluator import TrainingBatch
+
+
+class ReplayBuffer(object):
+    """
+    Fixed capacity ring buffer of training targets (state array, search distribution, state value), stored in
+    preallocated numpy arrays. When full, the oldest samples are overwritten.
+
+    Samples are drawn as shuffled minibatches, so every position of a self-play game contributes to many
+    optimizer steps instead of a single one.
+    """
+
+    def __init__(self, capacity, state_shape, num_actions, random_seed=None):
+        self.capacity = capacity
+        self.state_array = np.zeros((capacity,) + tuple(state_shape), dtype=np.int8)
+        self.target_distribution = np.zeros((capacity, num_actions), dtype=np.float32)
+        self.target_state_value = np.zeros(capacity, dtype=np.float32)
+        self.random_state = np.random.RandomState(random_seed)
+        self.position = 0
+        self.size = 0
+        self.num_added = 0
+
+    def __len__(self):
+        return self.size
+
+    def add(self, training_batch):
+        """Add all samples of training_batch, overwriting the oldest samples if the buffer is full."""
+        num_samples = len(training_batch.state_array)
+        if num_samples > self.capacity:
+            # only the newest samples fit
+            training_batch = TrainingBatch(*(array[-self.capacity :] for array in training_batch))
+            num_samples = self.capacity
+
+        indices = (self.position + np.arange(num_samples)) % self.capacity
+        self.state_array[indices] = training_batch.state_array
+        self.target_distribution[indices] = training_batch.target_distribution
+        self.target_state_value[indices] = training_batch.target_state_value
+
+        self.position = (self.position + num_samples) % self.capacity
+        self.size = min(self.size + num_samples, self.capacity)
+        self.num_added += num_samples
+
+    def get_batch(self, indices):
+        return TrainingBatch(
+            self.state_array[indices], self.target_distribution[indices], self.target_state_value[indices]
+        )
+
+    def sample_minibatches(self, num_steps, minibatch_size):
+        """
+        Yield num_steps minibatches of up to minibatch_size samples. Samples are drawn without replacement from a
+        shuffled order of the buffer, which is shuffled again when all samples have been drawn.
+        """
+        assert self.size > 0, "no samples in replay buffer"
+        minibatch_size = min(minibatch_size, self.size)
+        order = self.random_state.permutation(self.size)
+        start = 0
+        for _ in range(num_steps):
+            if start + minibatch_size > self.size:
+                order = self.random_state.permutation(self.size)
+                start = 0
+            yield self.get_batch(order[start : start + minibatch_size])
+            start += minibatch_size
+
+    @staticmethod
+    def get_num_steps(num_new_samples, minibatch_size, sample_reuse):
+        """Number of optimizer steps, so that on average every new sample is used sample_reuse times."""
+        return math.ceil(num_new_samples * sample_reuse / minibatch_size)
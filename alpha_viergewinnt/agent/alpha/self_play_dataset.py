@@ -0,0 +1,203 @@
+import logging
+import os
+
+import numpy as np
+
+from .evaluator import TrainingBatch
+
+FILE_MAGIC = b"AVGSELF1"
+CHUNK_MAGIC = b"CHNK"
+FILE_HEADER_DTYPE = np.dtype(
+    [("magic", "S8"), ("num_rows", "<u4"), ("num_columns", "<u4"), ("num_actions", "<u4"), ("reserved", "<u4")]
+)
+CHUNK_HEADER_DTYPE = np.dtype([("magic", "S4"), ("num_samples", "<u4")])
+# all sections of a chunk start at multiples of this
+ALIGNMENT = 8
+
+
+def _align(offset):
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def _get_chunk_layout(num_samples, state_shape, num_actions):
+    """
+    Return the sections of a chunk with num_samples samples as {name: (offset, dtype, shape)} (offsets relative to
+    the chunk start) and the size of the chunk.
+    """
+    sections = [
+        ("game_index", np.dtype("<i4"), (num_samples,)),
+        ("move_index", np.dtype("<u2"), (num_samples,)),
+        ("target_distribution", np.dtype("<f2"), (num_samples, num_actions)),
+        ("state_array", np.dtype("i1"), (num_samples,) + tuple(state_shape)),
+        ("target_state_value", np.dtype("i1"), (num_samples,)),
+    ]
+    layout = {}
+    offset = _align(CHUNK_HEADER_DTYPE.itemsize)
+    for name, dtype, shape in sections:
+        layout[name] = (offset, dtype, shape)
+        offset = _align(offset + dtype.itemsize * int(np.prod(shape)))
+    return layout, offset
+
+
+class SelfPlayDatasetWriter(object):
+    """
+    Appends the training batches of self-play games to a dataset file (see SelfPlayDataset for the format).
+
+    Samples are collected in memory and written as a chunk when chunk_size samples are pending, on flush and on
+    close. Appending to an existing file continues its game indices.
+
+    Training batches augmented with num_symmetries symmetries (see Evaluator.augment_training_batch) are written
+    without their symmetric copies, so every sample is a move of the game. Readers augment the samples again.
+    """
+
+    def __init__(self, filename, state_shape, num_actions, chunk_size=4096, num_symmetries=1):
+        self.filename = filename
+        self.state_shape = tuple(state_shape)
+        self.num_actions = num_actions
+        self.chunk_size = chunk_size
+        self.num_symmetries = num_symmetries
+        self.pending_batches = []
+        self.num_pending_samples = 0
+
+        if os.path.exists(filename) and os.path.getsize(filename) > 0:
+            dataset = SelfPlayDataset(filename)
+            if dataset.state_shape != self.state_shape or dataset.num_actions != num_actions:
+                raise ValueError(
+                    "dataset %s has states %s and %d actions, not %s and %d"
+                    % (filename, dataset.state_shape, dataset.num_actions, self.state_shape, num_actions)
+                )
+            self.next_game_index = dataset.num_games
+        else:
+            header = np.zeros(1, dtype=FILE_HEADER_DTYPE)
+            header["magic"] = FILE_MAGIC
+            header["num_rows"], header["num_columns"] = self.state_shape
+            header["num_actions"] = num_actions
+            with open(filename, "wb") as file:
+                file.write(header.tobytes())
+                file.write(bytes(_align(FILE_HEADER_DTYPE.itemsize) - FILE_HEADER_DTYPE.itemsize))
+            self.next_game_index = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def add(self, training_batch):
+        """Add the training batch of one game."""
+        # the samples of the identity come first
+        num_samples = len(training_batch.state_array) // self.num_symmetries
+        training_batch = TrainingBatch(*(array[:num_samples] for array in training_batch))
+        game_index = np.full(num_samples, self.next_game_index, dtype=np.int32)
+        move_index = np.arange(num_samples, dtype=np.uint16)
+        self.pending_batches.append((game_index, move_index, training_batch))
+        self.num_pending_samples += num_samples
+        self.next_game_index += 1
+        if self.num_pending_samples >= self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        if self.num_pending_samples == 0:
+            return
+        arrays = {
+            "game_index": np.concatenate([game_index for game_index, _, _ in self.pending_batches]),
+            "move_index": np.concatenate([move_index for _, move_index, _ in self.pending_batches]),
+            "target_distribution": np.concatenate([batch.target_distribution for _, _, batch in self.pending_batches]),
+            "state_array": np.concatenate([batch.state_array for _, _, batch in self.pending_batches]),
+            "target_state_value": np.rint(
+                np.concatenate([batch.target_state_value for _, _, batch in self.pending_batches])
+            ),
+        }
+        layout, chunk_size = _get_chunk_layout(self.num_pending_samples, self.state_shape, self.num_actions)
+        chunk = np.zeros(chunk_size, dtype=np.uint8)
+        header = np.zeros(1, dtype=CHUNK_HEADER_DTYPE)
+        header["magic"] = CHUNK_MAGIC
+        header["num_samples"] = self.num_pending_samples
+        chunk[: CHUNK_HEADER_DTYPE.itemsize] = np.frombuffer(header.tobytes(), dtype=np.uint8)
+        for name, (offset, dtype, shape) in layout.items():
+            section = np.ascontiguousarray(arrays[name].reshape(shape), dtype=dtype)
+            chunk[offset : offset + section.nbytes] = np.frombuffer(section.tobytes(), dtype=np.uint8)
+
+        with open(self.filename, "ab") as file:
+            file.write(chunk.tobytes())
+        self.pending_batches = []
+        self.num_pending_samples = 0
+
+    def close(self):
+        self.flush()
+
+
+class SelfPlayDataset(object):
+    """
+    Read only, memory mapped view of a self-play dataset file.
+
+    The file starts with a header (magic, board rows and columns, number of actions), followed by chunks. A chunk
+    has a header (magic, number of samples), the game and move index of every sample, and the samples: float16
+    search distributions, int8 state arrays and int8 game outcomes. All sections are aligned to 8 bytes and
+    mapped without copying, so only the accessed samples are read from disk. A truncated last chunk (e.g. from
+    an interrupted writer) is ignored.
+    """
+
+    def __init__(self, filename):
+        self.logger = logging.getLogger(self.__class__.__module__ + "." + self.__class__.__name__)
+        self.filename = filename
+        self.data = np.memmap(filename, dtype=np.uint8, mode="r")
+        header = self.data[: FILE_HEADER_DTYPE.itemsize].view(FILE_HEADER_DTYPE)[0]
+        if header["magic"] != FILE_MAGIC:
+            raise ValueError("%s is not a self-play dataset" % filename)
+        self.state_shape = (int(header["num_rows"]), int(header["num_columns"]))
+        self.num_actions = int(header["num_actions"])
+
+        self.chunks = []
+        offset = _align(FILE_HEADER_DTYPE.itemsize)
+        while offset + CHUNK_HEADER_DTYPE.itemsize <= len(self.data):
+            chunk_header = self.data[offset : offset + CHUNK_HEADER_DTYPE.itemsize].view(CHUNK_HEADER_DTYPE)[0]
+            layout, chunk_size = _get_chunk_layout(int(chunk_header["num_samples"]), self.state_shape, self.num_actions)
+            if chunk_header["magic"] != CHUNK_MAGIC or offset + chunk_size > len(self.data):
+                self.logger.warning("Ignoring incomplete chunk at byte %d of %s" % (offset, filename))
+                break
+            self.chunks.append(
+                {
+                    name: self.data[offset + section_offset :][: dtype.itemsize * int(np.prod(shape))]
+                    .view(dtype)
+                    .reshape(shape)
+                    for name, (section_offset, dtype, shape) in layout.items()
+                }
+            )
+            offset += chunk_size
+        self.chunk_ends = np.cumsum([len(chunk["game_index"]) for chunk in self.chunks], dtype=np.int64)
+
+    def __len__(self):
+        return int(self.chunk_ends[-1]) if len(self.chunks) > 0 else 0
+
+    @property
+    def num_games(self):
+        return int(self.chunks[-1]["game_index"][-1]) + 1 if len(self.chunks) > 0 else 0
+
+    def get_batch(self, indices):
+        """Get the samples at indices (over all chunks) as a TrainingBatch."""
+        arrays = self._gather(indices, ("state_array", "target_distribution", "target_state_value"))
+        return TrainingBatch(
+            arrays["state_array"],
+            arrays["target_distribution"].astype(np.float32),
+            arrays["target_state_value"].astype(np.float32),
+        )
+
+    def get_game_and_move_indices(self, indices):
+        arrays = self._gather(indices, ("game_index", "move_index"))
+        return arrays["game_index"], arrays["move_index"]
+
+    def _gather(self, indices, names):
+        indices = np.asarray(indices, dtype=np.int64)
+        chunk_indices = np.searchsorted(self.chunk_ends, indices, side="right")
+        chunk_starts = np.concatenate([[0], self.chunk_ends])[chunk_indices]
+        arrays = {}
+        for name in names:
+            _, dtype, shape = _get_chunk_layout(0, self.state_shape, self.num_actions)[0][name]
+            arrays[name] = np.empty((len(indices),) + shape[1:], dtype=dtype.newbyteorder("="))
+        for chunk_index in np.unique(chunk_indices):
+            selected = chunk_indices == chunk_index
+            chunk_sample_indices = indices[selected] - chunk_starts[selected]
+            for name in names:
+                arrays[name][selected] = self.chunks[chunk_index][name][chunk_sample_indices]
+        return arrays
@@ -0,0 +1,75 @@
+import threading
+
+from .mcts import Mcts
+
+
+class ThreadedMcts(Mcts):
+    """
+    MCTS with a single search graph shared by several threads (tree parallelism).
+
+    Selection, virtual loss and backup hold the lock of the graph, the evaluation of the selected leaf runs without
+    it. The tree updates are cheap and hold the GIL anyway, so a finer locking would not gain anything, while the
+    threads overlap inside the estimator (torch releases the GIL). A thread selecting a leaf which is pending
+    evaluation by another thread waits until that evaluation is backed up.
+    """
+
+    def __init__(self, graph, evaluator, num_threads, root_noise=True):
+        super().__init__(graph, evaluator, root_noise)
+        self.num_threads = num_threads
+        self.condition = threading.Condition()
+        self.pending_leaves = set()
+        self.is_search_finished = None
+        self.num_started_steps = 0
+        self.stopped = False
+        self.exception = None
+
+    def simulate(self, source, is_search_finished):
+        """
+        Run MCTS iterations in num_threads threads until is_search_finished(number of started iterations).
+        Return the number of iterations run.
+        """
+        self.is_search_finished = is_search_finished
+        threads = [threading.Thread(target=self._run, args=(source,)) for _ in range(self.num_threads)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        if self.exception is not None:
+            raise self.exception
+        return self.num_started_steps
+
+    def _run(self, source):
+        try:
+            while self._simulate_step_threaded(source):
+                pass
+        except Exception as exception:
+            with self.condition:
+                # stop the other threads
+                self.exception = exception
+                self.stopped = True
+                self.condition.notify_all()
+
+    def _simulate_step_threaded(self, source):
+        """Run a single MCTS iteration, return False when no iterations are left."""
+        with self.condition:
+            while True:
+                if self.stopped or self.is_search_finished(self.num_started_steps):
+                    return False
+                leaf, path = self._select_path(source)
+                if leaf not in self.pending_leaves:
+                    break
+                self.condition.wait()
+            self.num_started_steps += 1
+            self._update_path(path, self.VIRTUAL_LOSS)
+            self.pending_leaves.add(leaf)
+            leaf_state = self.graph.get_state(leaf)
+
+        evaluation = self.evaluator.evaluate(leaf_state)
+
+        with self.condition:
+            self._add_evaluation(leaf, leaf_state, *evaluation)
+            self._update_path(path, -self.VIRTUAL_LOSS, visit_count_update=-1)
+            self._backup(leaf, path)
+            self.pending_leaves.remove(leaf)
+            self.condition.notify_all()
+        return True
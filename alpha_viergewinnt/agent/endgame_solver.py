@@ -0,0 +1,175 @@
+VALUE_WIN = 1
+VALUE_DRAW = 0
+VALUE_LOSS = -1
+
+# bound types of transposition table entries
+EXACT = 0
+LOWER_BOUND = 1
+UPPER_BOUND = 2
+
+# depth of transposition table entries whose value does not depend on the depth limit
+SOLVED_DEPTH = 1 << 16
+
+
+class SearchAbortedException(Exception):
+    pass
+
+
+def get_num_empty_fields(state):
+    num_rows, num_columns = state.board_size
+    return num_rows * num_columns - len(state.recorded_moves)
+
+
+class EndgameSolver(object):
+    """
+    Exact negamax search with alpha-beta pruning for positions with at most max_empty_fields empty fields.
+
+    Values are win, draw or loss for the player to move. Searches deepen iteratively, positions beyond the depth
+    limit count as draws until the value is known not to depend on the limit (a win or loss always is exact).
+    Moves are ordered by the best move of the transposition table, then by their distance from the center move.
+    The transposition table is keyed by the Zobrist position hash (which includes the player to move) and is kept
+    across searches. A search is given up after max_nodes positions, or after max_leaf_nodes positions for the
+    values of search leaves (get_value), which are asked for in every simulation. Positions given up are remembered
+    with their node budget and not searched again with the same or a smaller budget.
+    """
+
+    def __init__(self, max_empty_fields, max_nodes=50000, max_leaf_nodes=1000, max_table_size=1000000):
+        self.max_empty_fields = max_empty_fields
+        self.max_nodes = max_nodes
+        self.max_leaf_nodes = max_leaf_nodes
+        self.max_table_size = max_table_size
+        self.table = {}
+        # node budgets of the positions given up, by position hash
+        self.aborted = {}
+        self.num_nodes = 0
+
+    def __getstate__(self):
+        # the transposition table is not copied to other processes
+        state = self.__dict__.copy()
+        state["table"] = {}
+        state["aborted"] = {}
+        return state
+
+    def is_endgame(self, state):
+        return get_num_empty_fields(state) <= self.max_empty_fields
+
+    def solve(self, state, max_nodes=None):
+        """
+        Return the value for the player to move and the best move, or (None, None) if not solved within max_nodes
+        positions (by default the max_nodes of the solver).
+        """
+        max_nodes = self.max_nodes if max_nodes is None else max_nodes
+        if len(self.table) > self.max_table_size:
+            self.table.clear()
+            self.aborted.clear()
+        position_hash = state.position_hash
+        if self.aborted.get(position_hash, 0) >= max_nodes:
+            return None, None
+        search = _Negamax(self.table, max_nodes)
+        state = state.clone()
+        try:
+            for depth in range(1, get_num_empty_fields(state) + 1):
+                value, solved = search.negamax(state, depth, VALUE_LOSS, VALUE_WIN)
+                if solved:
+                    return value, self.table[position_hash][3]
+        except SearchAbortedException:
+            self.aborted[position_hash] = max_nodes
+        finally:
+            self.num_nodes += search.num_nodes
+        return None, None
+
+    def get_value(self, state, player):
+        """Return the exact value of an endgame state for player, or None if it is not solved."""
+        if not self.is_endgame(state):
+            return None
+        value, _ = self.solve(state, self.max_leaf_nodes)
+        if value is None:
+            return None
+        return value if state.active_player == player else -value
+
+
+class _Negamax(object):
+    def __init__(self, table, max_nodes):
+        self.table = table
+        self.max_nodes = max_nodes
+        self.num_nodes = 0
+
+    def negamax(self, state, depth, alpha, beta):
+        """
+        Return the value of unfinished state for the player to move (within alpha and beta) and whether it does not
+        depend on the depth limit.
+        """
+        self.num_nodes += 1
+        if self.num_nodes > self.max_nodes:
+            raise SearchAbortedException()
+
+        original_alpha = alpha
+        best_move_hint = None
+        entry = self.table.get(state.position_hash)
+        if entry is not None:
+            entry_depth, entry_value, entry_bound, best_move_hint = entry
+            # wins and losses are exact for any depth
+            if entry_depth >= depth or entry_value != VALUE_DRAW:
+                solved = entry_depth == SOLVED_DEPTH or entry_value != VALUE_DRAW
+                # a loss from below or a win from above does not bound the value at all
+                if entry_value == (VALUE_LOSS if entry_bound == LOWER_BOUND else VALUE_WIN):
+                    solved = entry_bound == EXACT
+                if entry_bound == EXACT:
+                    return entry_value, solved
+                if entry_bound == LOWER_BOUND:
+                    alpha = max(alpha, entry_value)
+                else:
+                    beta = min(beta, entry_value)
+                if alpha >= beta:
+                    return entry_value, solved
+
+        if depth == 0:
+            return VALUE_DRAW, False
+
+        player = state.active_player
+        best_value = None
+        best_move = None
+        solved = True
+        for move in self._order_moves(state, best_move_hint):
+            state.play_move(player, move)
+            if state.is_winner(player):
+                value, move_solved = VALUE_WIN, True
+            elif state.is_draw():
+                value, move_solved = VALUE_DRAW, True
+            else:
+                value, move_solved = self.negamax(state, depth - 1, -beta, -alpha)
+                value = -value
+            state.undo_move()
+
+            solved = solved and move_solved
+            if best_value is None or value > best_value:
+                best_value, best_move = value, move
+            alpha = max(alpha, value)
+            if alpha >= beta:
+                break
+
+        if best_value <= original_alpha:
+            bound = UPPER_BOUND
+        elif best_value >= beta:
+            bound = LOWER_BOUND
+        else:
+            bound = EXACT
+        solved = solved or best_value != VALUE_DRAW
+        self.table[state.position_hash] = (SOLVED_DEPTH if solved else depth, best_value, bound, best_move)
+        return best_value, solved
+
+    @staticmethod
+    def _order_moves(state, best_move_hint):
+        center = (len(state.get_all_moves()) - 1) / 2
+        moves = sorted(state.get_possible_moves(), key=lambda move: abs(move - center))
+        if best_move_hint in moves:
+            moves.remove(best_move_hint)
+            moves.insert(0, best_move_hint)
+        return moves
+
+
+def create_endgame_solver(max_empty_fields=0):
+    """Create a solver for positions with at most max_empty_fields empty fields, or None if it is 0."""
+    if max_empty_fields <= 0:
+        return None
+    return EndgameSolver(max_empty_fields)
@@ -5,6 +5,9 @@ class HumanAgent(object):
     def __init__(self, **kwargs):
         pass
 
+    def seed(self, random_seed):
+        pass
+
     def get_next_move(self, state):
         selected_move = None
         possible_moves = state.get_possible_moves()
@@ -0,0 +1,68 @@
+import enum
+import math
+import multiprocessing
+
+import numpy as np
+
+from ..worker import set_single_thread_inference
+from .time_control import TimeControl
+
+# agent of a worker process, set up once by the pool initializer
+_worker_agent = None
+
+
+class SearchMode(enum.Enum):
+    # independent searches in worker processes, merged at the root
+    ROOT = "root"
+    # one search tree shared by threads
+    TREE = "tree"
+
+
+class RootParallelSearch(object):
+    """
+    Pool of worker processes which run independent searches with copies of an agent and merge the results.
+
+    The search steps are split between the workers, so a move takes less time on a machine with enough cores.
+    Every worker returns the root statistics of its search (agent.search_root), which are summed.
+
+    The agent is copied to the workers when they start, so the pool has to be started again when the parameters of
+    its estimator change. parameters_version is the version of the copied parameters, if the agent has any.
+    """
+
+    def __init__(self, agent, num_workers, parameters_version=None):
+        self.num_workers = num_workers
+        self.mcts_steps = agent.mcts_steps
+        self.parameters_version = parameters_version
+        # spawn is safe also after torch has used threads in this process
+        context = multiprocessing.get_context("spawn")
+        self.pool = context.Pool(num_workers, initializer=_initialize_worker, initargs=(agent,))
+
+    def search_root(self, state, move_time=None):
+        """
+        Search state in all workers and return the sum of their root statistics. With a move_time (milliseconds),
+        all workers search for that time instead of a number of steps.
+        """
+        num_steps = math.ceil(self.mcts_steps / self.num_workers)
+        # worker seeds are drawn from the global numpy random state, like the exploration noise
+        random_seeds = np.random.randint(2**31, size=self.num_workers)
+        tasks = [(state, num_steps, move_time, int(random_seed)) for random_seed in random_seeds]
+        return np.sum(self.pool.map(_search_root, tasks), axis=0)
+
+    def close(self):
+        self.pool.close()
+        self.pool.join()
+
+
+def _initialize_worker(agent):
+    global _worker_agent
+    _worker_agent = agent
+    set_single_thread_inference()
+
+
+def _search_root(task):
+    state, num_steps, move_time, random_seed = task
+    np.random.seed(random_seed)
+    _worker_agent.seed(random_seed)
+    _worker_agent.mcts_steps = num_steps
+    _worker_agent.time_control = TimeControl(move_time=move_time) if move_time is not None else None
+    return _worker_agent.search_root(state)
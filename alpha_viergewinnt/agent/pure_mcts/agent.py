@@ -1,64 +1,213 @@
+import logging
+import time
 from random import Random
-from copy import deepcopy
+
+import numpy as np
 
 from .tree import Tree
+from .array_tree import ArrayTree
 from .tree_search import TreeSearch, Simulator
+from .batch_simulator import BatchSimulator
+from ..parallel_search import RootParallelSearch
+from ..tree_reuse import find_reusable_node
 
 
-def create_random_choice_strategy(random_seed):
-    random = Random(random_seed)
+class RandomChoiceStrategy(object):
+    def __init__(self, random_seed):
+        self.random = Random(random_seed)
+
+    def __call__(self, moves):
+        return self.random.choice(list(moves))
 
-    def random_choice_strategy(moves):
-        return random.choice(list(moves))
+    def seed(self, random_seed):
+        self.random.seed(random_seed)
 
-    return random_choice_strategy
+
+def create_random_choice_strategy(random_seed):
+    return RandomChoiceStrategy(random_seed)
 
 
 class PureMctsAgent(object):
     def __init__(
-        self, player, selection_strategy, expansion_strategy, simulation_strategy, mcts_steps, mcts_rollouts, **kwargs
+        self,
+        player,
+        selection_strategy,
+        expansion_strategy,
+        simulation_strategy,
+        mcts_steps,
+        mcts_rollouts,
+        array_tree=False,
+        reuse_tree=True,
+        batch_rollouts=False,
+        random_seed=None,
+        search_workers=1,
+        time_control=None,
+        endgame_solver=None,
+        **kwargs
     ):
-
+        self.logger = logging.getLogger(self.__class__.__module__ + "." + self.__class__.__name__)
         self.player = player
         self.selection_strategy = selection_strategy
         self.expansion_strategy = expansion_strategy
         self.simulation_strategy = simulation_strategy
         self.mcts_steps = mcts_steps
         self.mcts_rollouts = mcts_rollouts
+        self.array_tree = array_tree
+        self.reuse_tree = reuse_tree
+        # rollouts are plain python, so only independent searches in worker processes run in parallel
+        self.search_workers = search_workers
+        self.root_parallel_search = None
+        # with a time control, moves are searched for a time budget instead of mcts_steps
+        self.time_control = time_control
+        # endgames are solved exactly instead of searched and rolled out
+        self.endgame_solver = endgame_solver
+        self.num_simulations = 0
+        self.num_reused_simulations = 0
 
         self.simulator = Simulator(strategy=self.simulation_strategy, player=player)
+        # rollouts of a state are played all at once instead of one after another
+        self.batch_simulator = BatchSimulator(player, random_seed) if batch_rollouts else None
         self._last_tree = None
 
+    def seed(self, random_seed):
+        for strategy in (self.selection_strategy, self.expansion_strategy, self.simulation_strategy):
+            strategy.seed(random_seed)
+        if self.batch_simulator is not None:
+            self.batch_simulator.seed(random_seed)
+
+    def __getstate__(self):
+        # the search tree of the last move is not copied to other processes
+        state = self.__dict__.copy()
+        state["_last_tree"] = None
+        state["root_parallel_search"] = None
+        return state
+
+    def close(self):
+        """Stop the worker processes of a root parallel search."""
+        if self.root_parallel_search is not None:
+            self.root_parallel_search.close()
+            self.root_parallel_search = None
+
+    def _create_tree(self, state):
+        if self.array_tree:
+            return ArrayTree(state, num_transitions=len(state.get_all_moves()))
+        return Tree(state)
+
+    def _reset_tree(self, state):
+        """
+        Keep the subtree of state from the last search if possible, otherwise start with a new tree.
+
+        Return the number of simulations already done in the kept subtree.
+        """
+        tree = self._last_tree
+        if self.reuse_tree and tree is not None:
+            node = find_reusable_node(
+                tree.root,
+                state,
+                tree.get_state,
+                lambda node: [tree.get_successor(node, transition) for transition in tree.get_transitions(node)],
+            )
+            if node is not None:
+                tree.reset_root(node)
+                return tree, tree.get_visit_count(tree.root)
+        # the search keeps states across moves, so it must not hold the live game state
+        return self._create_tree(state.clone()), 0
+
+    def get_reused_simulations_fraction(self):
+        """Fraction of all simulations behind the searches so far which were reused from previous searches."""
+        if self.num_simulations == 0:
+            return 0.0
+        return self.num_reused_simulations / self.num_simulations
+
+    def get_num_tree_nodes(self):
+        """Number of nodes of the tree of the last search, or None before the first search."""
+        return self._last_tree.get_num_nodes() if self._last_tree is not None else None
+
     def get_next_move(self, state):
-        initial_state = state
-        tree = Tree(initial_state)
+        if self.endgame_solver is not None and self.endgame_solver.is_endgame(state):
+            value, move = self.endgame_solver.solve(state)
+            if move is not None:
+                self.logger.debug("solved endgame value: %d" % value)
+                return move
+        # the worker processes start before the clock
+        if self.search_workers > 1 and self.root_parallel_search is None:
+            self.root_parallel_search = RootParallelSearch(self, self.search_workers)
+        start_time = time.perf_counter()
+        clock = self.time_control.start_move(state) if self.time_control is not None else None
+        if self.search_workers > 1:
+            weights, visit_counts = self.root_parallel_search.search_root(
+                state, clock.budget if clock is not None else None
+            )
+            # the searches of the workers are only known by their root visits
+            num_steps = int(np.sum(visit_counts))
+            self.num_simulations += num_steps
+            # moves not explored by any worker are not considered, like in a single tree
+            move = int(np.argmax(np.where(visit_counts > 0, weights, -np.inf)))
+        else:
+            tree, num_steps = self._search(state, clock)
+            move = tree.get_transition_to_max_weight(tree.root)
+        if clock is not None:
+            self.time_control.end_move(clock)
+
+        duration = time.perf_counter() - start_time
+        self.logger.debug("simulations: %d in %.0f ms (%.0f/sec)" % (num_steps, 1000 * duration, num_steps / duration))
+        return move
+
+    def search_root(self, state):
+        """Search state and return the weights and visit counts of all moves of the root (stacked)."""
+        clock = self.time_control.start_move(state) if self.time_control is not None else None
+        tree, _ = self._search(state, clock)
+        root_statistics = np.zeros((2, len(state.get_all_moves())))
+        for transition in tree.get_transitions(tree.root):
+            successor = tree.get_successor(tree.root, transition)
+            root_statistics[:, transition] = tree.get_weight(successor), tree.get_visit_count(successor)
+        return root_statistics
+
+    def _search(self, state, clock=None):
+        """Search state until the clock (if any) runs out or for mcts_steps. Return the tree and the steps run."""
+        tree, num_reused_simulations = self._reset_tree(state)
         tree_search = TreeSearch(
             tree, selection_strategy=self.selection_strategy, expansion_strategy=self.expansion_strategy
         )
 
-        self._explore_tree_and_update_weights(tree_search, initial_state)
+        num_steps = self._explore_tree_and_update_weights(tree_search, tree.root, clock)
+        self.num_reused_simulations += num_reused_simulations
+        self.num_simulations += num_reused_simulations + num_steps
         self._last_tree = tree
-        return tree.get_transition_to_max_weight(initial_state)
+        return tree, num_steps
 
-    def _explore_tree_and_update_weights(self, tree_search, initial_state):
-        for _ in range(self.mcts_steps):
-            leaf_state = tree_search.select_leaf(initial_state)
-            if not self._is_final_state(leaf_state):
-                expanded_state = tree_search.expand(leaf_state)
+    def _explore_tree_and_update_weights(self, tree_search, root, clock=None):
+        tree = tree_search.tree
+        num_steps = 0
+        while not self._is_search_finished(num_steps, clock):
+            leaf = tree_search.select_leaf(root)
+            if not self._is_final_state(tree.get_state(leaf)):
+                expanded = tree_search.expand(leaf)
             else:
-                expanded_state = leaf_state
-            state_utility = self._get_state_utility(expanded_state)
-            tree_search.backpropagate(expanded_state, state_utility)
+                expanded = leaf
+            state_utility = self._get_state_utility(tree.get_state(expanded))
+            tree_search.backpropagate(expanded, state_utility)
+            num_steps += 1
+        return num_steps
+
+    def _is_search_finished(self, num_steps, clock):
+        if clock is not None:
+            return clock.is_search_finished(num_steps)
+        return num_steps >= self.mcts_steps
 
     def _is_final_state(self, state):
         return state.is_winner(self.player) or state.is_winner(self.player.opponent()) or state.is_draw()
 
     def _get_state_utility(self, state):
+        if self.endgame_solver is not None:
+            solved_value = self.endgame_solver.get_value(state, self.player)
+            if solved_value is not None:
+                return solved_value
+        if self.batch_simulator is not None:
+            return self.batch_simulator.get_mean_rollout_value(state, self.mcts_rollouts)
         rollout_value_sum = 0
         for _ in range(self.mcts_rollouts):
-            initial_state = deepcopy(state)
-            final_state = self.simulator.rollout(initial_state)
-            rollout_value_sum += self.simulator.get_rollout_value(final_state)
+            rollout_value_sum += self.simulator.rollout_and_rewind(state)
         return rollout_value_sum / self.mcts_rollouts
 
     def draw_last_tree(self):
@@ -0,0 +1,135 @@
+import numpy as np
+
+from .tree import Tree, TransitionAlreadyExistsException
+
+NO_NODE = -1
+
+
+class ArrayTree(object):
+    """
+    Search tree stored in preallocated numpy arrays, with the same interface as Tree.
+
+    Nodes are addressed by integer ids (the root has id 0) instead of by game states, and successors
+    are found by indexing the children array with node id and transition. The arrays double their
+    capacity when they are full.
+    """
+
+    def __init__(self, root, num_transitions, capacity=1024):
+        self.num_transitions = num_transitions
+        self.root = 0
+        self.num_nodes = 0
+        self.node_states = []
+        self._allocate(capacity)
+        self._add_node(root, parent=NO_NODE)
+
+    def _allocate(self, capacity):
+        self.capacity = capacity
+        self.children = np.full((capacity, self.num_transitions), NO_NODE, dtype=np.int32)
+        self.parents = np.full(capacity, NO_NODE, dtype=np.int32)
+        self.visit_counts = np.zeros(capacity, dtype=np.int64)
+        self.weights = np.zeros(capacity)
+
+    def _grow(self):
+        arrays = (self.children, self.parents, self.visit_counts, self.weights)
+        self._allocate(2 * self.capacity)
+        new_arrays = (self.children, self.parents, self.visit_counts, self.weights)
+        for array, new_array in zip(arrays, new_arrays):
+            new_array[: self.num_nodes] = array[: self.num_nodes]
+
+    def _add_node(self, state, parent):
+        if self.num_nodes == self.capacity:
+            self._grow()
+        node = self.num_nodes
+        self.num_nodes += 1
+        self.node_states.append(state)
+        self.parents[node] = parent
+        return node
+
+    def reset_root(self, root):
+        """
+        Make node root the new root and keep only its subtree (including the attributes).
+
+        The subtree is moved to the front of the arrays level by level, so the cost depends on the size
+        of the kept subtree only.
+        """
+        levels = [np.array([root])]
+        while levels[-1].size > 0:
+            successors = self.children[levels[-1]].reshape(-1)
+            levels.append(successors[successors != NO_NODE])
+        kept_nodes = np.concatenate(levels)
+        num_kept_nodes = kept_nodes.size
+
+        new_ids = np.full(self.num_nodes, NO_NODE, dtype=np.int32)
+        new_ids[kept_nodes] = np.arange(num_kept_nodes)
+        kept_children = self.children[kept_nodes]
+        has_child = kept_children != NO_NODE
+        kept_children[has_child] = new_ids[kept_children[has_child]]
+        kept_parents = self.parents[kept_nodes]
+        kept_parents[0] = NO_NODE
+        kept_parents[1:] = new_ids[kept_parents[1:]]
+
+        self.children[:num_kept_nodes] = kept_children
+        self.children[num_kept_nodes : self.num_nodes] = NO_NODE
+        self.parents[:num_kept_nodes] = kept_parents
+        self.visit_counts[:num_kept_nodes] = self.visit_counts[kept_nodes]
+        self.visit_counts[num_kept_nodes : self.num_nodes] = 0
+        self.weights[:num_kept_nodes] = self.weights[kept_nodes]
+        self.weights[num_kept_nodes : self.num_nodes] = 0
+        self.node_states = [self.node_states[node] for node in kept_nodes]
+        self.num_nodes = num_kept_nodes
+        self.root = 0
+
+    def get_visit_count(self, node):
+        return int(self.visit_counts[node])
+
+    def get_weight(self, node):
+        return float(self.weights[node])
+
+    def get_state(self, node):
+        return self.node_states[node]
+
+    def get_num_nodes(self):
+        return self.num_nodes
+
+    def get_transitions(self, source):
+        return set(np.flatnonzero(self.children[source] != NO_NODE).tolist())
+
+    def get_successor(self, source, transition):
+        return int(self.children[source, transition])
+
+    def add_successor(self, source, transition, successor):
+        if self.children[source, transition] != NO_NODE:
+            raise TransitionAlreadyExistsException()
+        node = self._add_node(successor, parent=source)
+        self.children[source, transition] = node
+        return node
+
+    def get_path_to_root(self, source):
+        path = [source]
+        while self.parents[path[-1]] != NO_NODE:
+            path.append(int(self.parents[path[-1]]))
+        return path
+
+    def add_visit(self, states, delta_weight):
+        self.visit_counts[states] += 1
+        self.weights[states] += delta_weight
+
+    def get_transition_to_max_weight(self, source):
+        transitions = np.flatnonzero(self.children[source] != NO_NODE)
+        weights = self.weights[self.children[source, transitions]]
+        return int(transitions[np.argmax(weights)])
+
+    def to_tree(self):
+        """Convert to a Tree with game states as nodes."""
+        tree = Tree(self.node_states[self.root])
+        for source in range(self.num_nodes):
+            for transition in self.get_transitions(source):
+                successor = self.get_successor(source, transition)
+                tree.add_successor(self.node_states[source], transition, self.node_states[successor])
+        for node in range(self.num_nodes):
+            tree.attributes[self.node_states[node]].visit_count = int(self.visit_counts[node])
+            tree.attributes[self.node_states[node]].weight = float(self.weights[node])
+        return tree
+
+    def draw(self):
+        self.to_tree().draw()
@@ -0,0 +1,120 @@
+from functools import lru_cache
+
+import numpy as np
+
+from alpha_viergewinnt.game.viergewinnt import DropdownBoard, DropdownBitboard
+
+
+class BatchSimulator(object):
+    """
+    Simulator playing many uniformly random rollouts of a state at once.
+
+    Every rollout is a pair of 64 bit bitboards (same layout as the bitboard game engine: fields column by column
+    with a spare bit on top of every column), stored in numpy arrays over all rollouts. Legal moves, stone
+    placement and win detection (by shifting the bitboards) are vectorized over the rollouts. Stones are dropped
+    into columns for games with dropdown boards and placed on fields otherwise.
+    """
+
+    def __init__(self, player, random_seed=None):
+        self.player = player
+        self.random_state = np.random.RandomState(random_seed)
+
+    def seed(self, random_seed):
+        self.random_state.seed(random_seed)
+
+    def get_mean_rollout_value(self, state, num_rollouts):
+        """Play num_rollouts random rollouts from state and return the mean value (win 1, loss -1, draw 0)."""
+        if state.is_winner(self.player):
+            return 1
+        if state.is_winner(self.player.opponent()):
+            return -1
+        if state.is_draw():
+            return 0
+
+        num_stones_in_row = state.win_conditions[self.player].num_stones_in_row
+        dropdown = isinstance(state, (DropdownBoard, DropdownBitboard))
+        return np.mean(self._rollout(state.state, state.active_player, num_stones_in_row, dropdown, num_rollouts))
+
+    def _rollout(self, board, active_player, num_stones_in_row, dropdown, num_rollouts):
+        """Play rollouts from board (a state array) with active_player to move and return the value of each."""
+        num_rows, num_columns = board.shape
+        field_masks = self._get_field_masks(board.shape)
+        direction_shifts = self._get_direction_shifts(board.shape)
+
+        # bitboards of the player to move and of the other player, swapped after every move
+        active_bitboards = np.full(num_rollouts, self._get_bitboard(board, active_player.value, field_masks))
+        idle_bitboards = np.full(num_rollouts, self._get_bitboard(board, active_player.opponent().value, field_masks))
+        column_heights = np.tile(np.count_nonzero(board, axis=0), (num_rollouts, 1))
+        flat_field_masks = field_masks.reshape(-1)
+
+        # every move fills one field, so all running rollouts are filled after the same number of moves
+        num_empty_fields = board.size - np.count_nonzero(board)
+        values = np.zeros(num_rollouts)
+        rollout_indices = np.arange(num_rollouts)
+        win_value = 1 if active_player == self.player else -1
+        while True:
+            if dropdown:
+                legal_moves = column_heights < num_rows
+            else:
+                occupied = active_bitboards | idle_bitboards
+                legal_moves = (occupied[:, np.newaxis] & flat_field_masks) == 0
+
+            # uniform choice among legal moves: the legal move with the largest random number
+            moves = np.argmax(self.random_state.random_sample(legal_moves.shape) * legal_moves, axis=1)
+            if dropdown:
+                running = np.arange(len(moves))
+                stones = field_masks[column_heights[running, moves], moves]
+                column_heights[running, moves] += 1
+            else:
+                stones = flat_field_masks[moves]
+            active_bitboards |= stones
+
+            won = self._check_wins(active_bitboards, direction_shifts, num_stones_in_row)
+            values[rollout_indices[won]] = win_value
+            num_empty_fields -= 1
+            # rollouts filled without a win are a draw
+            if num_empty_fields == 0:
+                break
+
+            if won.any():
+                not_won = ~won
+                if not not_won.any():
+                    break
+                rollout_indices = rollout_indices[not_won]
+                active_bitboards, idle_bitboards = active_bitboards[not_won], idle_bitboards[not_won]
+                column_heights = column_heights[not_won]
+            active_bitboards, idle_bitboards = idle_bitboards, active_bitboards
+            win_value = -win_value
+        return values
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _get_field_masks(size):
+        num_rows, num_columns = size
+        column_height = num_rows + 1
+        field_shifts = (
+            np.arange(num_columns, dtype=np.uint64)[np.newaxis, :] * np.uint64(column_height)
+            + np.arange(num_rows, dtype=np.uint64)[:, np.newaxis]
+        )
+        return np.left_shift(np.uint64(1), field_shifts)
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _get_direction_shifts(size):
+        """Shifts for vertical, horizontal, diagonal and flipped diagonal neighbors."""
+        column_height = size[0] + 1
+        return tuple(np.uint64(shift) for shift in (1, column_height, column_height + 1, column_height - 1))
+
+    @staticmethod
+    def _get_bitboard(board, player_value, field_masks):
+        return np.bitwise_or.reduce(field_masks[board == player_value], initial=np.uint64(0))
+
+    @staticmethod
+    def _check_wins(bitboards, direction_shifts, num_stones_in_row):
+        won = np.zeros(len(bitboards), dtype=bool)
+        for shift in direction_shifts:
+            matches = bitboards
+            for stone_index in range(1, num_stones_in_row):
+                matches = matches & (bitboards >> (np.uint64(stone_index) * shift))
+            won |= matches != 0
+        return won
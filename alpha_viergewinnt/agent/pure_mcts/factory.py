@@ -1,7 +1,22 @@
 from alpha_viergewinnt.agent.pure_mcts import PureMctsAgent, create_random_choice_strategy
+from alpha_viergewinnt.agent.time_control import create_time_control
+from alpha_viergewinnt.agent.endgame_solver import create_endgame_solver
 
 
-def create_pure_mcts_agent(player, mcts_steps=30, mcts_rollouts=30, random_seed=None):
+def create_pure_mcts_agent(
+    player,
+    mcts_steps=30,
+    mcts_rollouts=30,
+    random_seed=None,
+    array_tree=False,
+    reuse_tree=True,
+    batch_rollouts=False,
+    search_workers=1,
+    move_time=None,
+    game_time=None,
+    move_increment=0,
+    endgame_empty_fields=0,
+):
     return PureMctsAgent(
         player=player,
         selection_strategy=create_random_choice_strategy(random_seed),
@@ -9,4 +24,11 @@ def create_pure_mcts_agent(player, mcts_steps=30, mcts_rollouts=30, random_seed=
         simulation_strategy=create_random_choice_strategy(random_seed),
         mcts_steps=mcts_steps,
         mcts_rollouts=mcts_rollouts,
+        array_tree=array_tree,
+        reuse_tree=reuse_tree,
+        batch_rollouts=batch_rollouts,
+        random_seed=random_seed,
+        search_workers=search_workers,
+        time_control=create_time_control(move_time, game_time, move_increment),
+        endgame_solver=create_endgame_solver(endgame_empty_fields),
     )
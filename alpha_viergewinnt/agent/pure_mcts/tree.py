@@ -18,11 +18,16 @@ class Attributes(object):
 class Tree(nx.DiGraph):
     def __init__(self, root):
         super().__init__()
+        self.root = root
         self.attributes = {}
 
         self.add_node(root)
         self.attributes[root] = Attributes(visit_count=0, weight=0)
 
+    def get_state(self, node):
+        # nodes are the game states themselves
+        return node
+
     def get_transitions(self, source):
         return {self.get_edge_data(*edge)["transition"] for edge in self.edges(source)}
 
@@ -33,13 +38,44 @@ class Tree(nx.DiGraph):
     def add_successor(self, source, transition, successor):
         if transition in self.get_transitions(source):
             raise TransitionAlreadyExistsException()
-        self.add_node(successor)
-        self.attributes[successor] = Attributes(visit_count=0, weight=0)
+        # with transpositions the successor may already be in the tree (reached by another path)
+        if successor not in self.attributes:
+            self.add_node(successor)
+            self.attributes[successor] = Attributes(visit_count=0, weight=0)
         self.add_edge(source, successor, transition=transition)
+        return successor
+
+    def reset_root(self, root):
+        """
+        Make root the new root and keep only its subtree (including the attributes).
+
+        The subtree is copied, so the cost depends on the size of the kept subtree only.
+        """
+        subtree_nodes = list(nx.dfs_preorder_nodes(self, root))
+        edges = list(self.out_edges(subtree_nodes, data=True))
+        self.attributes = {node: self.attributes[node] for node in subtree_nodes}
+        self.clear()
+        self.add_nodes_from(subtree_nodes)
+        self.add_edges_from(edges)
+        self.root = root
+
+    def get_visit_count(self, node):
+        return self.attributes[node].visit_count
+
+    def get_weight(self, node):
+        return self.attributes[node].weight
+
+    def get_num_nodes(self):
+        return self.number_of_nodes()
 
     def get_path_to_root(self, source):
         return nx.ancestors(self, source) | {source}
 
+    def add_visit(self, states, delta_weight):
+        for state in states:
+            self.attributes[state].visit_count += 1
+            self.attributes[state].weight += delta_weight
+
     def get_transition_to_max_weight(self, source):
         transition_successor_pairs = self._get_transition_successor_pairs(source)
         weights = [self.attributes[successor].weight for _, successor in transition_successor_pairs]
@@ -4,8 +4,6 @@ Chaslot, Guillaume & Winands, Mark & Herik, H & Uiterwijk, Jos & Bouzy, Bruno. (
 Progressive Strategies for Monte-Carlo Tree Search. New Mathematics and Natural Computation.
 04. 343-357. 10.1142/S1793005708001094."""
 
-from copy import deepcopy
-
 
 class NoUnexploredMovesException(Exception):
     pass
@@ -27,12 +25,12 @@ class TreeSearch(object):
 
     def _is_leaf(self, state):
         has_unexplored_moves = len(self._get_unexplored_moves(state)) > 0
-        no_moves_possible = len(state.get_possible_moves()) == 0
+        no_moves_possible = len(self.tree.get_state(state).get_possible_moves()) == 0
         return has_unexplored_moves or no_moves_possible
 
     def _get_unexplored_moves(self, state):
         explored_moves = self.tree.get_transitions(state)
-        possible_moves = state.get_possible_moves()
+        possible_moves = self.tree.get_state(state).get_possible_moves()
         return set(possible_moves) - set(explored_moves)
 
     def expand(self, source):
@@ -40,15 +38,13 @@ class TreeSearch(object):
         if len(unexplored_moves) == 0:
             raise NoUnexploredMovesException()
         selected_move = self.expansion_strategy(unexplored_moves)
-        successor = deepcopy(source)
-        successor.play_move(player=source.active_player, move=selected_move)
-        self.tree.add_successor(source=source, transition=selected_move, successor=successor)
-        return successor
+        source_state = self.tree.get_state(source)
+        successor = source_state.clone()
+        successor.play_move(player=source_state.active_player, move=selected_move)
+        return self.tree.add_successor(source=source, transition=selected_move, successor=successor)
 
     def backpropagate(self, source, delta_weight):
-        for state in self.tree.get_path_to_root(source):
-            self.tree.attributes[state].visit_count += 1
-            self.tree.attributes[state].weight += delta_weight
+        self.tree.add_visit(self.tree.get_path_to_root(source), delta_weight)
 
 
 class Simulator(object):
@@ -76,3 +72,19 @@ class Simulator(object):
             selected_move = self.strategy(possible_moves)
             state.play_move(state.active_player, selected_move)
         return state
+
+    def rollout_and_rewind(self, state):
+        """
+        Play a rollout in place, get its value and undo all rollout moves again.
+        """
+        num_moves = 0
+        while not self._is_final_state(state):
+            possible_moves = state.get_possible_moves()
+            selected_move = self.strategy(possible_moves)
+            state.play_move(state.active_player, selected_move)
+            num_moves += 1
+
+        rollout_value = self.get_rollout_value(state)
+        for _ in range(num_moves):
+            state.undo_move()
+        return rollout_value
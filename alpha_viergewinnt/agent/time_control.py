@@ -0,0 +1,80 @@
+import time
+
+
+class TimeControl(object):
+    """
+    Time budget for the move searches of an agent, all times in milliseconds.
+
+    A move gets at most move_time. With a game_time, a move also gets at most a fixed fraction of the remaining game
+    time plus the increment, and the remaining game time grows by the increment after every move. The game time
+    starts again with every game the agent plays.
+    """
+
+    # fraction of the remaining game time spent on a single move
+    GAME_TIME_FRACTION = 0.05
+
+    def __init__(self, move_time=None, game_time=None, increment=0):
+        assert move_time is not None or game_time is not None, "time control needs a move time or a game time"
+        self.move_time = move_time
+        self.game_time = game_time
+        self.increment = increment
+        self.remaining_game_time = game_time
+        # number of moves of the state of the last move, to notice new games
+        self.num_moves = None
+
+    def start_game(self):
+        self.remaining_game_time = self.game_time
+        self.num_moves = None
+
+    def get_move_budget(self):
+        """Time budget of the next move in milliseconds."""
+        budgets = []
+        if self.move_time is not None:
+            budgets.append(self.move_time)
+        if self.game_time is not None:
+            budgets.append(
+                min(self.remaining_game_time, self.GAME_TIME_FRACTION * self.remaining_game_time + self.increment)
+            )
+        return min(budgets)
+
+    def start_move(self, state):
+        """Start the clock of the move searched for state."""
+        if self.game_time is not None:
+            num_moves = len(state.recorded_moves)
+            # moves are only added during a game, so a state with no more moves than the last one starts a new game
+            if self.num_moves is not None and num_moves <= self.num_moves:
+                self.start_game()
+            self.num_moves = num_moves
+        return SearchClock(self.get_move_budget())
+
+    def end_move(self, clock):
+        """Charge the time of a finished move to the game time."""
+        if self.game_time is not None:
+            self.remaining_game_time = max(0, self.remaining_game_time - clock.get_elapsed_time()) + self.increment
+
+
+class SearchClock(object):
+    """Deadline of a single search, checked before every search step."""
+
+    # a search runs at least this many steps, so that the root has been expanded and visited
+    MIN_STEPS = 2
+
+    def __init__(self, budget):
+        """budget in milliseconds"""
+        self.budget = budget
+        self.start_time = time.perf_counter()
+        self.deadline = self.start_time + budget / 1000
+
+    def is_search_finished(self, num_steps):
+        return num_steps >= self.MIN_STEPS and time.perf_counter() >= self.deadline
+
+    def get_elapsed_time(self):
+        """Elapsed time since the start in milliseconds."""
+        return 1000 * (time.perf_counter() - self.start_time)
+
+
+def create_time_control(move_time=None, game_time=None, increment=0):
+    """Create a time control, or None for searches with a fixed number of steps."""
+    if move_time is None and game_time is None:
+        return None
+    return TimeControl(move_time, game_time, increment)
@@ -0,0 +1,16 @@
+def find_reusable_node(root, state, get_state, get_successors, max_depth=2):
+    """
+    Find state among the root of a search tree, its successors and their successors (after our move and the reply)
+    and return its node, or None if it is not in the tree.
+
+    get_state returns the state of a node and get_successors the successor nodes of a node, so that trees and graphs
+    of all agents can be searched.
+    """
+    nodes = [root]
+    for depth in range(max_depth + 1):
+        for node in nodes:
+            if get_state(node) == state:
+                return node
+        if depth < max_depth:
+            nodes = [successor for node in nodes for successor in get_successors(node)]
+    return None
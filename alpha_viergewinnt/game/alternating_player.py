@@ -18,6 +18,9 @@ class AlternatingPlayer(object):
         self.idle_player = self.active_player
         self.active_player = Player.opponent(self.active_player)
 
+    def revert_player_turn(self):
+        self.active_player, self.idle_player = self.idle_player, self.active_player
+
     def get_state_from_active_player_perspective(self):
         return self.get_state_from_player_perspective(self.active_player)
 
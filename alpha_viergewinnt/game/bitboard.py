@@ -0,0 +1,94 @@
+import numpy as np
+
+from .board import Board
+
+
+class Bitboard(Board):
+    """
+    Generic playing board with one integer bitmask per player instead of a numpy state array.
+
+    Fields are stored column by column, with one spare bit on top of every column. The spare bits
+    always stay empty, so shifting a bitmask never carries stones from one column into the next.
+    The numpy state is only built on demand for output and array views.
+    """
+
+    def __init__(self, size, output_row_order):
+        self.num_rows, self.num_columns = size
+        self.column_height = self.num_rows + 1
+        self.output_row_order = output_row_order
+        # index by player value (index 0 is unused)
+        self.bitboards = [0, 0, 0]
+
+        self.field_shifts = (
+            np.arange(self.num_columns, dtype=np.uint64)[np.newaxis, :] * np.uint64(self.column_height)
+            + np.arange(self.num_rows, dtype=np.uint64)[:, np.newaxis]
+        )
+        # field masks in row-major order (same order as the numpy state array)
+        self.field_masks = tuple(1 << int(shift) for shift in self.field_shifts.reshape(-1))
+        self.full_mask = sum(self.field_masks)
+        # shifts for vertical, horizontal, diagonal and flipped diagonal neighbors
+        self.direction_shifts = (1, self.column_height, self.column_height + 1, self.column_height - 1)
+
+    @property
+    def state(self):
+        state = np.zeros((self.num_rows, self.num_columns), dtype=np.int16)
+        for player_value in (1, 2):
+            state += self._get_field_array(self.bitboards[player_value]) * player_value
+        return state
+
+    def _get_field_array(self, bitboard):
+        return ((np.uint64(bitboard) >> self.field_shifts) & np.uint64(1)).astype(np.int16)
+
+    def __hash__(self):
+        # only consider state for hash
+        return hash((self.bitboards[1], self.bitboards[2]))
+
+    def clone(self):
+        """Copy the board, sharing all attributes except the bitboards."""
+        clone = object.__new__(self.__class__)
+        clone.__dict__.update(self.__dict__)
+        clone.bitboards = list(self.bitboards)
+        return clone
+
+    def get_array_view(self, player, player_value, opponent=None, opponent_value=0):
+        """
+        Get board state as an array, where stones of player have the value player_value and stones
+        of the opponent (optional) have the value opponent_value.
+        """
+        player_array = self._get_field_array(self.bitboards[player.value]) * player_value
+
+        if opponent is not None:
+            opponent_array = self._get_field_array(self.bitboards[opponent.value]) * opponent_value
+            return player_array + opponent_array
+        else:
+            return player_array
+
+
+class BitboardNStonesInRowCondition(object):
+    """Condition checker for n stones in a row using shifts of the player bitboard"""
+
+    def __init__(self, num_stones_in_row, player):
+        self.player = player
+        self.num_stones_in_row = num_stones_in_row
+
+    def check(self, board):
+        bitboard = board.bitboards[self.player.value]
+        for shift in board.direction_shifts:
+            matches = bitboard
+            for stone_index in range(1, self.num_stones_in_row):
+                matches &= bitboard >> (stone_index * shift)
+            if matches:
+                return True
+        return False
+
+    def check_stone(self, board, position):
+        # shifting the whole bitboard is as cheap as looking at the rows through one stone
+        return self.check(board)
+
+
+class BitboardFullCondition(object):
+    def check(self, board):
+        return (board.bitboards[1] | board.bitboards[2]) == board.full_mask
+
+    def check_stone(self, board, position):
+        return self.check(board)
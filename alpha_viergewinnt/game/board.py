@@ -58,6 +58,18 @@ class Board(object):
         # only consider state for hash
         return hash(self.state.tobytes())
 
+    def clone(self):
+        """
+        Copy the board, sharing all attributes except the state array.
+
+        Mixins only rebind their other attributes to new (immutable) values instead of mutating them,
+        so they may be shared between clones.
+        """
+        clone = object.__new__(self.__class__)
+        clone.__dict__.update(self.__dict__)
+        clone.state = self.state.copy()
+        return clone
+
     def __eq__(self, other):
         return hash(self) == hash(other)
 
@@ -3,22 +3,50 @@ from scipy.signal import convolve2d
 
 
 class ConditionChecker(object):
-    """Functionality for checking board conditions."""
+    """
+    Functionality for checking board conditions.
+
+    The conditions are only checked for the last placed stone and the result is cached,
+    so checking for a winner or a draw afterwards is a lookup. Boards without played stones
+    (e.g. set up through the state array) are checked completely.
+    """
 
     def __init__(self, win_conditions, draw_condition):
         self.win_conditions = win_conditions
         self.draw_condition = draw_condition
+        self.winners = frozenset()
+        self.draw = False
+        self.previous_conditions = tuple()
+
+    def update_conditions(self, player, position):
+        """Update cached winners and draw after player placed a stone at position."""
+        self.previous_conditions += ((self.winners, self.draw),)
+        if self.win_conditions[player].check_stone(self, position):
+            self.winners = self.winners | {player}
+        self.draw = self.draw_condition.check_stone(self, position)
+
+    def revert_conditions(self):
+        """Restore cached winners and draw from before the last update."""
+        self.winners, self.draw = self.previous_conditions[-1]
+        self.previous_conditions = self.previous_conditions[:-1]
 
     def is_winner(self, player):
-        return self.win_conditions[player].check(self)
+        if not self.previous_conditions:
+            return self.win_conditions[player].check(self)
+        return player in self.winners
 
     def is_draw(self):
-        return self.draw_condition.check(self)
+        if not self.previous_conditions:
+            return self.draw_condition.check(self)
+        return self.draw
 
 
 class NStonessInRowCondition(object):
     """Condition checker for n stones in a row"""
 
+    # row and column steps for vertical, horizontal, diagonal and flipped diagonal rows
+    DIRECTIONS = ((1, 0), (0, 1), (1, 1), (1, -1))
+
     def __init__(self, num_stones_in_row, player):
         self.player = player
         self.num_stones_in_row = num_stones_in_row
@@ -36,7 +64,39 @@ class NStonessInRowCondition(object):
                 return True
         return False
 
+    def check_stone(self, board, position):
+        """Check only the rows through the stone at position (row, column)."""
+        state = board.state
+        num_rows, num_columns = state.shape
+        row, column = position
+        for row_step, column_step in self.DIRECTIONS:
+            num_stones = 1
+            for sign in (1, -1):
+                neighbor_row, neighbor_column = row + sign * row_step, column + sign * column_step
+                while (
+                    0 <= neighbor_row < num_rows
+                    and 0 <= neighbor_column < num_columns
+                    and state.item(neighbor_row, neighbor_column) == self.player.value
+                ):
+                    num_stones += 1
+                    neighbor_row += sign * row_step
+                    neighbor_column += sign * column_step
+            if num_stones >= self.num_stones_in_row:
+                return True
+        return False
+
 
 class NoMovesPossibleCondition(object):
     def check(self, board):
         return len(board.get_possible_moves()) == 0
+
+    def check_stone(self, board, position):
+        return self.check(board)
+
+
+class FullBoardCondition(object):
+    def check(self, board):
+        return bool(board.state.all())
+
+    def check_stone(self, board, position):
+        return self.check(board)
@@ -1,3 +1,7 @@
+class NoRecordedMovesException(Exception):
+    pass
+
+
 class MoveRecorder(object):
     def __init__(self):
         self.recorded_moves = tuple()
@@ -5,5 +9,12 @@ class MoveRecorder(object):
     def record_move(self, move):
         self.recorded_moves += (move,)
 
+    def remove_last_move(self):
+        if len(self.recorded_moves) == 0:
+            raise NoRecordedMovesException("no moves recorded")
+        move = self.recorded_moves[-1]
+        self.recorded_moves = self.recorded_moves[:-1]
+        return move
+
     def __hash__(self):
         return hash(self.recorded_moves)
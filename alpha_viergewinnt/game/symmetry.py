@@ -0,0 +1,63 @@
+from functools import lru_cache
+
+import numpy as np
+
+
+class Symmetry(object):
+    """
+    Symmetry of a board: a rotation (by multiples of 90 degrees) after an optional left-right mirroring of the
+    board, with the corresponding permutation of moves.
+
+    Arrays are transformed along their last two axes, so batches of boards are transformed alike. Distributions
+    over moves are transformed along their last axis.
+    """
+
+    def __init__(self, move_grid, num_rotations=0, mirrored=False):
+        """move_grid is an array of the board size with the move which places a stone on each field."""
+        self.num_rotations = num_rotations
+        self.mirrored = mirrored
+
+        # the move of a field on the original board becomes the move of the field it is transformed to
+        transformed_move_grid = self.transform_array(move_grid)
+        self.move_permutation = np.empty(np.max(move_grid) + 1, dtype=np.int64)
+        self.move_permutation[transformed_move_grid.reshape(-1)] = move_grid.reshape(-1)
+
+    def transform_array(self, array):
+        if self.mirrored:
+            array = np.flip(array, axis=-1)
+        return np.ascontiguousarray(np.rot90(array, self.num_rotations, axes=(-2, -1)))
+
+    def transform_move(self, move):
+        return int(self.move_permutation[move])
+
+    def transform_distribution(self, distribution):
+        transformed_distribution = np.empty_like(distribution)
+        transformed_distribution[..., self.move_permutation] = distribution
+        return transformed_distribution
+
+    def inverse_transform_distribution(self, transformed_distribution):
+        return transformed_distribution[..., self.move_permutation]
+
+    def __repr__(self):
+        return "Symmetry(num_rotations=%d, mirrored=%s)" % (self.num_rotations, self.mirrored)
+
+
+@lru_cache(maxsize=None)
+def get_mirror_symmetries(size):
+    """Identity and left-right mirroring of a board with a column per move (stones are dropped)."""
+    num_rows, num_columns = size
+    move_grid = np.tile(np.arange(num_columns), (num_rows, 1))
+    return (Symmetry(move_grid), Symmetry(move_grid, mirrored=True))
+
+
+@lru_cache(maxsize=None)
+def get_dihedral_symmetries(size):
+    """All 8 rotations and reflections of a square board with a field per move (stones are placed)."""
+    num_rows, num_columns = size
+    assert num_rows == num_columns, "only square boards have all dihedral symmetries"
+    move_grid = np.arange(num_rows * num_columns).reshape(size)
+    return tuple(
+        Symmetry(move_grid, num_rotations=num_rotations, mirrored=mirrored)
+        for mirrored in (False, True)
+        for num_rotations in range(4)
+    )
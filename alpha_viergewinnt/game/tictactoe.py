@@ -1,9 +1,12 @@
 import numpy as np
 
 from .board import Board, Player, RowOrder
-from .condition import ConditionChecker, NStonessInRowCondition, NoMovesPossibleCondition
+from .bitboard import Bitboard, BitboardNStonesInRowCondition, BitboardFullCondition
+from .condition import ConditionChecker, NStonessInRowCondition, FullBoardCondition
 from .alternating_player import AlternatingPlayer
 from .move_recorder import MoveRecorder
+from .symmetry import get_dihedral_symmetries
+from .zobrist import ZobristHasher
 
 
 class IllegalMoveException(Exception):
@@ -18,6 +21,7 @@ class FreeplayBoard(object):
     """Functionality for placing stones."""
 
     def play_move(self, player, move):
+        """Place a stone on field move and return its position (row, column)."""
         state_index = (move // self.state.shape[1], move % self.state.shape[1])
         try:
             field = self.state[state_index]
@@ -28,6 +32,13 @@ class FreeplayBoard(object):
             raise FieldOccupiedException("field %s is occupied" % (move,))
 
         self.state[state_index] = player.value
+        return state_index
+
+    def remove_move(self, move):
+        """Remove the stone from field move and return its position (row, column)."""
+        state_index = (move // self.state.shape[1], move % self.state.shape[1])
+        self.state[state_index] = 0
+        return state_index
 
     def get_all_moves(self):
         return list(range(self.state.size))
@@ -36,27 +47,63 @@ class FreeplayBoard(object):
         return np.flatnonzero(self.state.reshape(-1) == 0).tolist()
 
 
-class Tictactoe(Board, FreeplayBoard, AlternatingPlayer, ConditionChecker, MoveRecorder):
+class FreeplayBitboard(object):
+    """Functionality for placing stones on a bitboard."""
+
+    def play_move(self, player, move):
+        """Place a stone on field move and return its position (row, column)."""
+        if not 0 <= move < len(self.field_masks):
+            raise IllegalMoveException("field %s does not exist." % (move,))
+
+        field_mask = self.field_masks[move]
+        if (self.bitboards[1] | self.bitboards[2]) & field_mask:
+            raise FieldOccupiedException("field %s is occupied" % (move,))
+
+        self.bitboards[player.value] |= field_mask
+        return divmod(move, self.num_columns)
+
+    def remove_move(self, move):
+        """Remove the stone from field move and return its position (row, column)."""
+        field_mask = self.field_masks[move]
+        self.bitboards[1] &= ~field_mask
+        self.bitboards[2] &= ~field_mask
+        return divmod(move, self.num_columns)
+
+    def get_all_moves(self):
+        return list(range(len(self.field_masks)))
+
+    def get_possible_moves(self):
+        occupied = self.bitboards[1] | self.bitboards[2]
+        return [move for move, field_mask in enumerate(self.field_masks) if not occupied & field_mask]
+
+
+class Tictactoe(Board, FreeplayBoard, AlternatingPlayer, ConditionChecker, MoveRecorder, ZobristHasher):
     """
-    Combination of board, condition checker, alternating player and move recorder
+    Combination of board, condition checker, alternating player, move recorder and Zobrist hasher
     with parameters of the game Tictactoe.
     """
 
-    def __init__(self):
+    def __init__(self, transpositions=False):
         self.board_size = (3, 3)
         Board.__init__(self, size=self.board_size, output_row_order=RowOrder.NORMAL)
         AlternatingPlayer.__init__(self, starting_player=Player.X)
         MoveRecorder.__init__(self)
+        ZobristHasher.__init__(self, size=self.board_size, transpositions=transpositions)
         ConditionChecker.__init__(
             self,
             win_conditions={
                 Player.X: NStonessInRowCondition(num_stones_in_row=3, player=Player.X),
                 Player.O: NStonessInRowCondition(num_stones_in_row=3, player=Player.O),
             },
-            draw_condition=NoMovesPossibleCondition(),
+            draw_condition=FullBoardCondition(),
         )
 
+    def get_symmetries(self):
+        return get_dihedral_symmetries(self.board_size)
+
     def __hash__(self):
+        if self.transpositions:
+            return self.position_hash
         return Board.__hash__(self) ^ MoveRecorder.__hash__(self)
 
     def __eq__(self, other):
@@ -64,5 +111,61 @@ class Tictactoe(Board, FreeplayBoard, AlternatingPlayer, ConditionChecker, MoveR
 
     def play_move(self, player, move):
         AlternatingPlayer.register_player_turn(self, player)
-        FreeplayBoard.play_move(self, player, move)
+        position = FreeplayBoard.play_move(self, player, move)
+        ZobristHasher.toggle_stone(self, player, position)
+        MoveRecorder.record_move(self, move)
+        ConditionChecker.update_conditions(self, player, position)
+
+    def undo_move(self):
+        move = MoveRecorder.remove_last_move(self)
+        position = FreeplayBoard.remove_move(self, move)
+        ZobristHasher.toggle_stone(self, self.idle_player, position)
+        AlternatingPlayer.revert_player_turn(self)
+        ConditionChecker.revert_conditions(self)
+
+
+class BitboardTictactoe(Bitboard, FreeplayBitboard, AlternatingPlayer, ConditionChecker, MoveRecorder, ZobristHasher):
+    """
+    Combination of bitboard, condition checker, alternating player, move recorder and Zobrist hasher
+    with parameters of the game Tictactoe.
+    """
+
+    def __init__(self, transpositions=False):
+        self.board_size = (3, 3)
+        Bitboard.__init__(self, size=self.board_size, output_row_order=RowOrder.NORMAL)
+        AlternatingPlayer.__init__(self, starting_player=Player.X)
+        MoveRecorder.__init__(self)
+        ZobristHasher.__init__(self, size=self.board_size, transpositions=transpositions)
+        ConditionChecker.__init__(
+            self,
+            win_conditions={
+                Player.X: BitboardNStonesInRowCondition(num_stones_in_row=3, player=Player.X),
+                Player.O: BitboardNStonesInRowCondition(num_stones_in_row=3, player=Player.O),
+            },
+            draw_condition=BitboardFullCondition(),
+        )
+
+    def get_symmetries(self):
+        return get_dihedral_symmetries(self.board_size)
+
+    def __hash__(self):
+        if self.transpositions:
+            return self.position_hash
+        return Bitboard.__hash__(self) ^ MoveRecorder.__hash__(self)
+
+    def __eq__(self, other):
+        return hash(self) == hash(other)
+
+    def play_move(self, player, move):
+        AlternatingPlayer.register_player_turn(self, player)
+        position = FreeplayBitboard.play_move(self, player, move)
+        ZobristHasher.toggle_stone(self, player, position)
         MoveRecorder.record_move(self, move)
+        ConditionChecker.update_conditions(self, player, position)
+
+    def undo_move(self):
+        move = MoveRecorder.remove_last_move(self)
+        position = FreeplayBitboard.remove_move(self, move)
+        ZobristHasher.toggle_stone(self, self.idle_player, position)
+        AlternatingPlayer.revert_player_turn(self)
+        ConditionChecker.revert_conditions(self)
@@ -1,7 +1,12 @@
+import numpy as np
+
 from .board import Board, Player, RowOrder
-from .condition import ConditionChecker, NStonessInRowCondition, NoMovesPossibleCondition
+from .bitboard import Bitboard, BitboardNStonesInRowCondition, BitboardFullCondition
+from .condition import ConditionChecker, NStonessInRowCondition, FullBoardCondition
 from .alternating_player import AlternatingPlayer
 from .move_recorder import MoveRecorder
+from .symmetry import get_mirror_symmetries
+from .zobrist import ZobristHasher
 
 
 class IllegalMoveException(Exception):
@@ -16,6 +21,7 @@ class DropdownBoard(object):
     """Functionality for dropping stones."""
 
     def play_move(self, player, move):
+        """Drop a stone into column move and return its position (row, column)."""
         try:
             column_vector = self.state.T[move]
         except IndexError:
@@ -24,9 +30,15 @@ class DropdownBoard(object):
         for index, element in enumerate(column_vector):
             if element == 0:
                 column_vector[index] = player.value
-                break
-        else:
-            raise ColumnFullException("column %d is full" % move)
+                return index, move
+        raise ColumnFullException("column %d is full" % move)
+
+    def remove_move(self, move):
+        """Remove the top stone from column move and return its position (row, column)."""
+        column_vector = self.state.T[move]
+        index = np.flatnonzero(column_vector)[-1]
+        column_vector[index] = 0
+        return index, move
 
     def get_all_moves(self):
         return list(range(self.state.shape[0] + 1))
@@ -35,27 +47,69 @@ class DropdownBoard(object):
         return [column for column, column_vector in enumerate(self.state.T) if (column_vector == 0).any()]
 
 
-class Viergewinnt(Board, DropdownBoard, AlternatingPlayer, ConditionChecker, MoveRecorder):
+class DropdownBitboard(object):
+    """Functionality for dropping stones on a bitboard with a table of column heights."""
+
+    def __init__(self):
+        self.column_heights = [0] * self.num_columns
+
+    def play_move(self, player, move):
+        """Drop a stone into column move and return its position (row, column)."""
+        if not 0 <= move < self.num_columns:
+            raise IllegalMoveException("column %d does not exist." % move)
+
+        height = self.column_heights[move]
+        if height == self.num_rows:
+            raise ColumnFullException("column %d is full" % move)
+
+        # numpy integer moves (e.g. from argmax) would turn the bitboards into fixed width numpy integers
+        self.bitboards[player.value] |= 1 << int(move * self.column_height + height)
+        self.column_heights[move] = height + 1
+        return height, move
+
+    def remove_move(self, move):
+        """Remove the top stone from column move and return its position (row, column)."""
+        height = self.column_heights[move] - 1
+        field_mask = 1 << int(move * self.column_height + height)
+        self.bitboards[1] &= ~field_mask
+        self.bitboards[2] &= ~field_mask
+        self.column_heights[move] = height
+        return height, move
+
+    def get_all_moves(self):
+        return list(range(self.num_columns))
+
+    def get_possible_moves(self):
+        return [column for column, height in enumerate(self.column_heights) if height < self.num_rows]
+
+
+class Viergewinnt(Board, DropdownBoard, AlternatingPlayer, ConditionChecker, MoveRecorder, ZobristHasher):
     """
-    Combination of board, condition checker, alternating player and move recorder
+    Combination of board, condition checker, alternating player, move recorder and Zobrist hasher
     with parameters of the game Viergewinnt.
     """
 
-    def __init__(self):
+    def __init__(self, transpositions=False):
         self.board_size = (6, 7)
         Board.__init__(self, size=self.board_size, output_row_order=RowOrder.REVERSED)
         AlternatingPlayer.__init__(self, starting_player=Player.X)
         MoveRecorder.__init__(self)
+        ZobristHasher.__init__(self, size=self.board_size, transpositions=transpositions)
         ConditionChecker.__init__(
             self,
             win_conditions={
                 Player.X: NStonessInRowCondition(num_stones_in_row=4, player=Player.X),
                 Player.O: NStonessInRowCondition(num_stones_in_row=4, player=Player.O),
             },
-            draw_condition=NoMovesPossibleCondition(),
+            draw_condition=FullBoardCondition(),
         )
 
+    def get_symmetries(self):
+        return get_mirror_symmetries(self.board_size)
+
     def __hash__(self):
+        if self.transpositions:
+            return self.position_hash
         return Board.__hash__(self) ^ MoveRecorder.__hash__(self)
 
     def __eq__(self, other):
@@ -63,5 +117,67 @@ class Viergewinnt(Board, DropdownBoard, AlternatingPlayer, ConditionChecker, Mov
 
     def play_move(self, player, move):
         AlternatingPlayer.register_player_turn(self, player)
-        DropdownBoard.play_move(self, player, move)
+        position = DropdownBoard.play_move(self, player, move)
+        ZobristHasher.toggle_stone(self, player, position)
+        MoveRecorder.record_move(self, move)
+        ConditionChecker.update_conditions(self, player, position)
+
+    def undo_move(self):
+        move = MoveRecorder.remove_last_move(self)
+        position = DropdownBoard.remove_move(self, move)
+        ZobristHasher.toggle_stone(self, self.idle_player, position)
+        AlternatingPlayer.revert_player_turn(self)
+        ConditionChecker.revert_conditions(self)
+
+
+class BitboardViergewinnt(Bitboard, DropdownBitboard, AlternatingPlayer, ConditionChecker, MoveRecorder, ZobristHasher):
+    """
+    Combination of bitboard, condition checker, alternating player, move recorder and Zobrist hasher
+    with parameters of the game Viergewinnt.
+    """
+
+    def __init__(self, transpositions=False):
+        self.board_size = (6, 7)
+        Bitboard.__init__(self, size=self.board_size, output_row_order=RowOrder.REVERSED)
+        DropdownBitboard.__init__(self)
+        AlternatingPlayer.__init__(self, starting_player=Player.X)
+        MoveRecorder.__init__(self)
+        ZobristHasher.__init__(self, size=self.board_size, transpositions=transpositions)
+        ConditionChecker.__init__(
+            self,
+            win_conditions={
+                Player.X: BitboardNStonesInRowCondition(num_stones_in_row=4, player=Player.X),
+                Player.O: BitboardNStonesInRowCondition(num_stones_in_row=4, player=Player.O),
+            },
+            draw_condition=BitboardFullCondition(),
+        )
+
+    def get_symmetries(self):
+        return get_mirror_symmetries(self.board_size)
+
+    def __hash__(self):
+        if self.transpositions:
+            return self.position_hash
+        return Bitboard.__hash__(self) ^ MoveRecorder.__hash__(self)
+
+    def __eq__(self, other):
+        return hash(self) == hash(other)
+
+    def clone(self):
+        clone = Bitboard.clone(self)
+        clone.column_heights = list(self.column_heights)
+        return clone
+
+    def play_move(self, player, move):
+        AlternatingPlayer.register_player_turn(self, player)
+        position = DropdownBitboard.play_move(self, player, move)
+        ZobristHasher.toggle_stone(self, player, position)
         MoveRecorder.record_move(self, move)
+        ConditionChecker.update_conditions(self, player, position)
+
+    def undo_move(self):
+        move = MoveRecorder.remove_last_move(self)
+        position = DropdownBitboard.remove_move(self, move)
+        ZobristHasher.toggle_stone(self, self.idle_player, position)
+        AlternatingPlayer.revert_player_turn(self)
+        ConditionChecker.revert_conditions(self)
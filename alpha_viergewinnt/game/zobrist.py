@@ -0,0 +1,49 @@
+from functools import lru_cache
+
+import numpy as np
+
+from .board import Player
+
+# fixed seed, so hashes are equal across processes and runs
+ZOBRIST_RANDOM_SEED = 0
+
+
+class ZobristKeys(object):
+    """Random 64 bit keys for a stone of each player on each field and for a change of the player to move."""
+
+    def __init__(self, size, random_seed):
+        random_state = np.random.RandomState(random_seed)
+        num_rows, num_columns = size
+        self.field_keys = {
+            player: [[self._random_key(random_state) for _ in range(num_columns)] for _ in range(num_rows)]
+            for player in Player
+        }
+        self.player_to_move_key = self._random_key(random_state)
+
+    @staticmethod
+    def _random_key(random_state):
+        return int.from_bytes(random_state.bytes(8), "little")
+
+
+@lru_cache(maxsize=None)
+def get_zobrist_keys(size, random_seed=ZOBRIST_RANDOM_SEED):
+    return ZobristKeys(size, random_seed)
+
+
+class ZobristHasher(object):
+    """
+    Functionality for a Zobrist hash of the position and the player to move, updated with every placed stone.
+
+    In transposition mode the game hash is the position hash, so the same position reached by different move
+    orders is the same game state.
+    """
+
+    def __init__(self, size, transpositions):
+        self.zobrist_keys = get_zobrist_keys(size)
+        self.position_hash = 0
+        self.transpositions = transpositions
+
+    def toggle_stone(self, player, position):
+        """Add or remove the stone of player at position (row, column) and change the player to move."""
+        row, column = position
+        self.position_hash ^= self.zobrist_keys.field_keys[player][row][column] ^ self.zobrist_keys.player_to_move_key
@@ -1,2 +1,3 @@
 from .interface import set_logger, log
 from .value_logger import ValueLogger
+from .profiler import Profiler, profile_run
@@ -0,0 +1,188 @@
+import contextlib
+import cProfile
+import functools
+import logging
+import time
+from collections import OrderedDict
+
+from ..agent.alpha.alpha import AlphaAgent, AlphaTrainer
+from ..agent.alpha.evaluator import Evaluator
+from ..agent.alpha.mcts import Mcts
+from ..agent.pure_mcts.agent import PureMctsAgent
+from ..agent.pure_mcts.batch_simulator import BatchSimulator
+from ..agent.pure_mcts.tree_search import TreeSearch, Simulator
+from ..game.tictactoe import Tictactoe, BitboardTictactoe
+from ..game.viergewinnt import Viergewinnt, BitboardViergewinnt
+from ..match import Match
+
+GAME_CLASSES = (Tictactoe, BitboardTictactoe, Viergewinnt, BitboardViergewinnt)
+AGENT_CLASSES = (AlphaAgent, AlphaTrainer, PureMctsAgent)
+
+# instrumented methods by section, as (class, method name) pairs
+SECTIONS = OrderedDict(
+    [
+        ("move", [(Match, "_play_move")]),
+        ("selection", [(Mcts, "_select_path"), (TreeSearch, "select_leaf")]),
+        ("expansion", [(Mcts, "_expand"), (TreeSearch, "expand")]),
+        ("evaluation", [(Evaluator, "evaluate"), (Evaluator, "evaluate_batch")]),
+        ("rollout", [(Simulator, "rollout_and_rewind"), (BatchSimulator, "get_mean_rollout_value")]),
+        ("backup", [(Mcts, "_backup"), (TreeSearch, "backpropagate")]),
+        ("clone", [(game_class, "clone") for game_class in GAME_CLASSES]),
+        (
+            "terminal check",
+            [(game_class, name) for game_class in GAME_CLASSES for name in ("is_winner", "is_draw")],
+        ),
+    ]
+)
+
+# marks methods which are inherited and not defined by the instrumented class itself
+_INHERITED = object()
+
+
+class Profiler(object):
+    """
+    Count and time calls of the hot paths of searches and matches, and record statistics of every searched move.
+
+    The instrumented methods are replaced by timing wrappers in install() and restored in uninstall(), so the
+    instrumentation costs nothing when it is not installed. Times of nested sections (e.g. the evaluation of an
+    expansion) are included in the time of the enclosing section. Only the current process is instrumented.
+    """
+
+    def __init__(self):
+        self.sections = OrderedDict((section, [0, 0.0]) for section in SECTIONS)
+        self.num_moves = 0
+        self.search_time = 0.0
+        self.num_simulations = 0
+        self.tree_sizes = []
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.originals = []
+
+    def install(self):
+        for section, methods in SECTIONS.items():
+            for cls, name in methods:
+                self._replace(cls, name, self._create_timed(section, getattr(cls, name)))
+        for cls in AGENT_CLASSES:
+            self._replace(cls, "get_next_move", self._create_recorded(cls.get_next_move))
+
+    def uninstall(self):
+        for cls, name, original in reversed(self.originals):
+            if original is _INHERITED:
+                delattr(cls, name)
+            else:
+                setattr(cls, name, original)
+        self.originals = []
+
+    def __enter__(self):
+        self.install()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.uninstall()
+
+    def _replace(self, cls, name, method):
+        self.originals.append((cls, name, cls.__dict__.get(name, _INHERITED)))
+        setattr(cls, name, method)
+
+    def _create_timed(self, section, method):
+        counter = self.sections[section]
+
+        @functools.wraps(method)
+        def timed(*args, **kwargs):
+            start_time = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                counter[0] += 1
+                counter[1] += time.perf_counter() - start_time
+
+        return timed
+
+    def _create_recorded(self, get_next_move):
+        @functools.wraps(get_next_move)
+        def recorded(agent, state):
+            statistics = _get_agent_statistics(agent)
+            start_time = time.perf_counter()
+            move = get_next_move(agent, state)
+            self._record_move(agent, time.perf_counter() - start_time, statistics)
+            return move
+
+        return recorded
+
+    def _record_move(self, agent, search_time, previous_statistics):
+        num_simulations, num_reused_simulations, cache_hits, cache_misses = [
+            value - previous_value for value, previous_value in zip(_get_agent_statistics(agent), previous_statistics)
+        ]
+        self.num_moves += 1
+        self.search_time += search_time
+        # reused simulations are not run during this move
+        self.num_simulations += num_simulations - num_reused_simulations
+        self.cache_hits += cache_hits
+        self.cache_misses += cache_misses
+        tree_size = agent.get_num_tree_nodes()
+        if tree_size is not None:
+            self.tree_sizes.append(tree_size)
+
+    def get_simulations_per_second(self):
+        return self.num_simulations / self.search_time if self.search_time > 0 else 0.0
+
+    def get_cache_hit_rate(self):
+        num_lookups = self.cache_hits + self.cache_misses
+        return self.cache_hits / num_lookups if num_lookups > 0 else 0.0
+
+    def __str__(self):
+        lines = ["%-16s %10s %10s %12s" % ("section", "calls", "time [s]", "per call [us]")]
+        for section, (num_calls, total_time) in self.sections.items():
+            if num_calls > 0:
+                lines.append(
+                    "%-16s %10d %10.3f %12.1f" % (section, num_calls, total_time, 1e6 * total_time / num_calls)
+                )
+        lines.append(
+            "%d searched moves, %d simulations (%.0f/sec), cache hit rate %.2f"
+            % (self.num_moves, self.num_simulations, self.get_simulations_per_second(), self.get_cache_hit_rate())
+        )
+        if self.tree_sizes:
+            lines.append(
+                "tree size: mean %.0f, max %d nodes"
+                % (sum(self.tree_sizes) / len(self.tree_sizes), max(self.tree_sizes))
+            )
+        return "\n".join(lines)
+
+
+def _get_agent_statistics(agent):
+    """Counters of agent which are compared before and after a move."""
+    evaluator = getattr(agent, "evaluator", None)
+    evaluation_cache = getattr(evaluator, "evaluation_cache", None)
+    return (
+        agent.num_simulations,
+        agent.num_reused_simulations,
+        evaluation_cache.hits if evaluation_cache is not None else 0,
+        evaluation_cache.misses if evaluation_cache is not None else 0,
+    )
+
+
+@contextlib.contextmanager
+def profile_run(instrument=False, profile_filename=None):
+    """
+    Instrument the hot paths (if instrument) and run cProfile (if profile_filename is given) within the context.
+
+    On exit, the summary of the instrumentation is logged and the cProfile statistics are written to
+    profile_filename (to be read with pstats).
+    """
+    logger = logging.getLogger(__name__)
+    profiler = Profiler() if instrument else None
+    c_profile = cProfile.Profile() if profile_filename is not None else None
+    if profiler is not None:
+        profiler.install()
+    if c_profile is not None:
+        c_profile.enable()
+    try:
+        yield profiler
+    finally:
+        if c_profile is not None:
+            c_profile.disable()
+            c_profile.dump_stats(profile_filename)
+            logger.info("Wrote profile statistics to %s" % profile_filename)
+        if profiler is not None:
+            profiler.uninstall()
+            logger.info("Instrumentation summary:\n%s" % profiler)
@@ -1,8 +1,15 @@
 import logging
-from copy import deepcopy
+import math
+import multiprocessing
+from statistics import NormalDist
 
 import numpy as np
 
+from .worker import set_single_thread_inference
+
+# match of a worker process, set up once by the pool initializer
+_worker_match = None
+
 
 class Match(object):
     def __init__(self, game, agents):
@@ -28,18 +35,56 @@ class Match(object):
 
 
 class CompetitionMatch(Match):
-    def compare(self, iterations):
+    def compare(self, iterations, workers=None, random_seed=0, stop_condition=None):
+        """
+        Play iterations games and return the number of wins per player (None for draws).
+
+        Every game is seeded with its own seed derived from random_seed and its index, so the results do not
+        depend on the number of workers. If stop_condition is given, stop as soon as it is met by the results
+        of the games finished so far.
+        """
         results = {player: 0 for player in self.agents}
         results[None] = 0
 
-        for iteration in range(iterations):
-            winner = self.play()
+        for _, winner in self.compare_iter(iterations, workers, random_seed):
             results[winner] += 1
+            if stop_condition is not None and stop_condition(results):
+                self.logger.info("Stopped comparison after %d games" % sum(results.values()))
+                break
 
         return results
 
+    def compare_iter(self, iterations, workers=None, random_seed=0):
+        """
+        Play iterations games, spread across workers processes if given, and yield the index and the winner
+        of every game as soon as it is finished.
+        """
+        game_seeds = [self._get_game_seeds(random_seed, game_index) for game_index in range(iterations)]
+        if not workers:
+            for game_index, seeds in enumerate(game_seeds):
+                yield game_index, self._play_seeded(seeds)
+            return
+
+        # spawn is safe also after torch has used threads in this process
+        context = multiprocessing.get_context("spawn")
+        with context.Pool(workers, initializer=_initialize_worker, initargs=(self,)) as pool:
+            for game_index, winner in pool.imap_unordered(_play_seeded_game, enumerate(game_seeds)):
+                yield game_index, winner
+
+    def _get_game_seeds(self, random_seed, game_index):
+        """Seeds for the global numpy random state and for every agent."""
+        seed_sequence = np.random.SeedSequence([random_seed, game_index])
+        return [int(seed) for seed in seed_sequence.generate_state(1 + len(self.agents))]
+
+    def _play_seeded(self, seeds):
+        global_seed, *agent_seeds = seeds
+        np.random.seed(global_seed)
+        for agent, agent_seed in zip(self.agents.values(), agent_seeds):
+            agent.seed(agent_seed)
+        return self.play()
+
     def play(self):
-        game = deepcopy(self.game)
+        game = self.game.clone()
         while not self._is_game_finished(game):
             self._play_move(game)
         return self._get_result(game)
@@ -55,14 +100,64 @@ class CompetitionMatch(Match):
         return None
 
 
+def _initialize_worker(match):
+    global _worker_match
+    _worker_match = match
+    set_single_thread_inference()
+
+
+def _play_seeded_game(task):
+    game_index, seeds = task
+    return game_index, _worker_match._play_seeded(seeds)
+
+
+class ScoreSettledCondition(object):
+    """
+    Stop condition for comparisons, which is met when the mean score of player (1 for a win, -1 for a loss,
+    0 for a draw) differs from threshold by more than z standard errors.
+
+    The condition is checked again after every game, so the error probability alpha is split over the at most
+    max_checks checks (Bonferroni bound). The chance that any of the checks stops on a difference which is not
+    there stays below alpha.
+    """
+
+    def __init__(self, player, threshold=0.0, max_checks=1, alpha=0.05, min_games=10):
+        self.player = player
+        self.threshold = threshold
+        self.z_value = NormalDist().inv_cdf(1 - alpha / (2 * max_checks))
+        self.min_games = min_games
+
+    def __call__(self, results):
+        num_games = sum(results.values())
+        if num_games < self.min_games:
+            return False
+        num_wins = results[self.player]
+        num_losses = results[self.player.opponent()]
+        mean_score = (num_wins - num_losses) / num_games
+        score_variance = (num_wins + num_losses) / num_games - mean_score**2
+        standard_error = math.sqrt(max(score_variance, 0) / num_games)
+        return abs(mean_score - self.threshold) > self.z_value * standard_error
+
+
 class TrainingMatch(Match):
     def train(self):
-        game = deepcopy(self.game)
-        while not self._is_game_finished(game):
-            self._play_move(game)
+        game = self._play()
         loss = self._train(game)
         return loss
 
+    def collect(self):
+        """Play a game and return the training batches of all training agents, without training them."""
+        game = self._play()
+        return [
+            agent.get_training_batch(game) for agent in self.agents.values() if hasattr(agent, "get_training_batch")
+        ]
+
+    def _play(self):
+        game = self.game.clone()
+        while not self._is_game_finished(game):
+            self._play_move(game)
+        return game
+
     def _train(self, game):
         losses = []
         for agent in self.agents.values():
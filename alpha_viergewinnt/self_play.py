@@ -0,0 +1,299 @@
+import logging
+import multiprocessing
+import os
+import queue
+import shutil
+import tempfile
+import time
+
+import numpy as np
+
+from .agent.alpha.factory import create_alpha_agent, create_alpha_trainer
+from .game.board import Player
+from .match import TrainingMatch
+from .worker import set_single_thread_inference
+
+# state of a worker process, set up once by the pool initializer
+_worker = None
+
+
+class SelfPlayPool(object):
+    """
+    Pool of worker processes which play training games of a trainer against an opponent.
+
+    Every worker holds its own copy of the trainer and opponent estimators. Parameters are broadcast through
+    versioned files (written with the estimator save method), so only filenames are sent with the games.
+    Workers return the training batches of their games, the parent process trains the estimator on them.
+    Workers are started with spawn, which is safe also after torch has used threads in the parent process.
+    """
+
+    def __init__(self, num_workers, game, create_trainer_estimator, create_opponent_estimator, agent_options):
+        self.logger = logging.getLogger(self.__class__.__module__ + "." + self.__class__.__name__)
+        self.num_workers = num_workers
+        self.directory = tempfile.mkdtemp(prefix="self_play_")
+        self.parameters_version = 0
+        self.filenames = None
+
+        context = multiprocessing.get_context("spawn")
+        self.pool = context.Pool(
+            num_workers,
+            initializer=_initialize_worker,
+            initargs=(game, create_trainer_estimator, create_opponent_estimator, agent_options),
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def broadcast(self, trainer_estimator, opponent_estimator):
+        """Make the current parameters of the estimators available to the workers for the following games."""
+        self.parameters_version += 1
+        filenames = (
+            os.path.join(self.directory, "trainer_%d.params" % self.parameters_version),
+            os.path.join(self.directory, "opponent_%d.params" % self.parameters_version),
+        )
+        trainer_estimator.save(filenames[0])
+        opponent_estimator.save(filenames[1])
+
+        # no games are running between broadcasts, so files of the last version are not needed anymore
+        if self.filenames is not None:
+            for filename in self.filenames:
+                if os.path.exists(filename):
+                    os.remove(filename)
+        self.filenames = filenames
+
+    def play(self, num_games, random_seed=0):
+        """
+        Play num_games training games with the broadcast parameters, alternating the starting player of the
+        trainer. Yield the training batches of every game as soon as it is finished.
+        """
+        assert self.filenames is not None, "broadcast parameters before playing"
+        tasks = [
+            (self.filenames, Player.X if game_index % 2 == 0 else Player.O, random_seed + game_index)
+            for game_index in range(num_games)
+        ]
+        for training_batches in self.pool.imap_unordered(_play_training_game, tasks):
+            yield training_batches
+
+    def close(self):
+        self.pool.close()
+        self.pool.join()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+class _Worker(object):
+    def __init__(self, game, create_trainer_estimator, create_opponent_estimator, agent_options):
+        self.game = game
+        self.trainer_estimator = create_trainer_estimator(game=game)
+        self.opponent_estimator = create_opponent_estimator(game=game)
+        self.agent_options = agent_options
+        self.loaded_filenames = None
+
+    def load(self, filenames):
+        if filenames != self.loaded_filenames:
+            trainer_filename, opponent_filename = filenames
+            self.trainer_estimator.load(trainer_filename)
+            self.opponent_estimator.load(opponent_filename)
+            self.loaded_filenames = filenames
+
+
+def _initialize_worker(game, create_trainer_estimator, create_opponent_estimator, agent_options):
+    global _worker
+    _worker = _Worker(game, create_trainer_estimator, create_opponent_estimator, agent_options)
+    # after creating the estimators, which import torch if they use it
+    set_single_thread_inference()
+
+
+def _play_training_game(task):
+    filenames, trainer_player, random_seed = task
+    _worker.load(filenames)
+    return _play_game(_worker, trainer_player, random_seed)
+
+
+def _play_game(worker, trainer_player, random_seed):
+    # exploration noise is drawn from the global numpy random state
+    np.random.seed(random_seed)
+
+    opponent_player = trainer_player.opponent()
+    trainer = create_alpha_trainer(
+        estimator=worker.trainer_estimator, player=trainer_player, random_seed=random_seed, **worker.agent_options
+    )
+    opponent = create_alpha_agent(
+        estimator=worker.opponent_estimator, player=opponent_player, random_seed=random_seed, **worker.agent_options
+    )
+    match = TrainingMatch(game=worker.game, agents={trainer_player: trainer, opponent_player: opponent})
+    return match.collect()
+
+
+class AsyncSelfPlay(object):
+    """
+    Actor processes which continuously play training games of a trainer against an opponent, while the learner
+    (the parent process) trains on the finished games.
+
+    Parameters are published as versioned snapshot files, actors load the newest snapshot before every game.
+    Finished games are put in a bounded queue together with the version they were played with, so actors wait
+    when the learner falls behind (backpressure). Games played with parameters more than max_staleness versions
+    older than the newest snapshot are dropped by the learner.
+    """
+
+    # seconds between checks of the stop event by waiting actors
+    POLL_INTERVAL = 0.1
+
+    def __init__(
+        self,
+        num_actors,
+        game,
+        create_trainer_estimator,
+        create_opponent_estimator,
+        agent_options,
+        queue_size=None,
+        max_staleness=4,
+        random_seed=0,
+    ):
+        self.num_actors = num_actors
+        self.max_staleness = max_staleness
+        self.directory = tempfile.mkdtemp(prefix="async_self_play_")
+        self.parameters_version = 0
+        self.num_games = 0
+        self.num_stale_games = 0
+        self.waiting_time = 0
+
+        context = multiprocessing.get_context("spawn")
+        # the published version is only changed (and old snapshots only removed) while holding the lock
+        self.snapshot_lock = context.Lock()
+        self.published_version = context.Value("i", 0, lock=False)
+        self.results = context.Queue(queue_size if queue_size is not None else 2 * num_actors)
+        self.stop_event = context.Event()
+        self.actors = [
+            context.Process(
+                target=_run_actor,
+                args=(
+                    actor_index,
+                    num_actors,
+                    (game, create_trainer_estimator, create_opponent_estimator, agent_options),
+                    self.directory,
+                    self.snapshot_lock,
+                    self.published_version,
+                    self.results,
+                    self.stop_event,
+                    random_seed,
+                ),
+                daemon=True,
+            )
+            for actor_index in range(num_actors)
+        ]
+        for actor in self.actors:
+            actor.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def publish(self, trainer_estimator, opponent_estimator):
+        """Publish the current parameters of the estimators, actors use them from their next game on."""
+        version = self.parameters_version + 1
+        trainer_filename, opponent_filename = _get_snapshot_filenames(self.directory, version)
+        trainer_estimator.save(trainer_filename)
+        opponent_estimator.save(opponent_filename)
+
+        with self.snapshot_lock:
+            self.published_version.value = version
+            # actors load snapshots while holding the lock, so only the newest snapshot is still needed
+            for filename in _get_snapshot_filenames(self.directory, self.parameters_version):
+                if os.path.exists(filename):
+                    os.remove(filename)
+        self.parameters_version = version
+
+    def get(self):
+        """Wait for the next game which is not too stale and return its training batches."""
+        assert self.parameters_version > 0, "publish parameters before playing"
+        while True:
+            start_time = time.perf_counter()
+            version, training_batches = self._get_result()
+            self.waiting_time += time.perf_counter() - start_time
+            if self.parameters_version - version > self.max_staleness:
+                self.num_stale_games += 1
+                continue
+            self.num_games += 1
+            return training_batches
+
+    def _get_result(self):
+        while True:
+            try:
+                return self.results.get(timeout=self.POLL_INTERVAL)
+            except queue.Empty:
+                if not any(actor.is_alive() for actor in self.actors):
+                    raise RuntimeError("all actors have stopped")
+
+    def close(self):
+        self.stop_event.set()
+        for actor in self.actors:
+            # actors may wait for space in the queue, so it is drained until they have stopped
+            while actor.is_alive():
+                self._drain()
+                actor.join(self.POLL_INTERVAL)
+        self._drain()
+        self.results.close()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def _drain(self):
+        try:
+            while True:
+                self.results.get_nowait()
+        except queue.Empty:
+            pass
+
+    def __str__(self):
+        return "%d games, %d stale games dropped, %.1f s waited for games" % (
+            self.num_games,
+            self.num_stale_games,
+            self.waiting_time,
+        )
+
+
+def _get_snapshot_filenames(directory, version):
+    return (
+        os.path.join(directory, "trainer_%d.params" % version),
+        os.path.join(directory, "opponent_%d.params" % version),
+    )
+
+
+def _run_actor(
+    actor_index,
+    num_actors,
+    worker_args,
+    directory,
+    snapshot_lock,
+    published_version,
+    results,
+    stop_event,
+    random_seed,
+):
+    _initialize_worker(*worker_args)
+    loaded_version = 0
+    game_index = 0
+    while not stop_event.is_set():
+        with snapshot_lock:
+            version = published_version.value
+            if version > loaded_version:
+                _worker.load(_get_snapshot_filenames(directory, version))
+                loaded_version = version
+        if loaded_version == 0:
+            stop_event.wait(AsyncSelfPlay.POLL_INTERVAL)
+            continue
+
+        # every actor alternates the starting player of the trainer, neighbouring actors start differently
+        trainer_player = Player.X if (game_index + actor_index) % 2 == 0 else Player.O
+        training_batches = _play_game(_worker, trainer_player, random_seed + game_index * num_actors + actor_index)
+        game_index += 1
+
+        while not stop_event.is_set():
+            try:
+                results.put((loaded_version, training_batches), timeout=AsyncSelfPlay.POLL_INTERVAL)
+                break
+            except queue.Full:
+                pass
@@ -0,0 +1,11 @@
+import sys
+
+
+def set_single_thread_inference():
+    """
+    Use a single thread for inference in a worker process. The workers of a pool run in parallel already, so more
+    threads would only compete for the same cores. torch is only configured if it has been imported.
+    """
+    torch = sys.modules.get("torch")
+    if torch is not None:
+        torch.set_num_threads(1)
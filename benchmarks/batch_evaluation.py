@@ -0,0 +1,49 @@
+"""Benchmark simulations per second of the alpha MCTS with the MLP estimator for different evaluation batch sizes.
+
+Run with: python -m benchmarks.batch_evaluation
+"""
+
+import time
+
+import click
+import numpy as np
+
+from alpha_viergewinnt.game.viergewinnt import BitboardViergewinnt
+from alpha_viergewinnt.agent.alpha.factory import create_mlp_estimator, create_alpha_agent
+
+from .mcts_search import MIDGAME_MOVES, create_position
+
+
+def benchmark_batch_size(estimator, state, mcts_steps, batch_size, array_tree):
+    """Return simulations per second of one move search."""
+    agent = create_alpha_agent(
+        estimator, state.active_player, mcts_steps, random_seed=0, array_tree=array_tree, batch_size=batch_size
+    )
+    start_time = time.perf_counter()
+    agent.get_next_move(state)
+    duration = time.perf_counter() - start_time
+    return mcts_steps / duration
+
+
+@click.command()
+@click.option("--batch-sizes", default="1,2,4,8,16,32", help="Comma separated evaluation batch sizes")
+@click.option("--mcts-steps", type=int, default=400, help="Number of MCTS steps per search")
+@click.option("--array-tree", is_flag=True, help="Store the search tree in numpy arrays")
+@click.option("--random-seed", type=int, default=0, help="Seed for the global numpy random state")
+def cmd(batch_sizes, mcts_steps, array_tree, random_seed):
+    positions = {
+        "empty": create_position(BitboardViergewinnt, []),
+        "midgame": create_position(BitboardViergewinnt, MIDGAME_MOVES),
+    }
+    estimator = create_mlp_estimator(positions["empty"])
+
+    click.echo("%-10s %-8s %16s" % ("batch size", "position", "simulations/sec"))
+    for batch_size in [int(batch_size) for batch_size in batch_sizes.split(",")]:
+        for position_name, position in positions.items():
+            np.random.seed(random_seed)
+            simulations_per_second = benchmark_batch_size(estimator, position, mcts_steps, batch_size, array_tree)
+            click.echo("%-10d %-8s %16.0f" % (batch_size, position_name, simulations_per_second))
+
+
+if __name__ == "__main__":
+    cmd()
@@ -0,0 +1,35 @@
+import time
+from random import Random
+
+
+def measure_rate(function, count):
+    """Call function once and return the number of operations per second, given it performs count operations."""
+    start_time = time.perf_counter()
+    function()
+    duration = time.perf_counter() - start_time
+    return count / duration
+
+
+def generate_move_sequences(create_game, num_games, random_seed):
+    """Generate move sequences of complete random games."""
+    random = Random(random_seed)
+    move_sequences = []
+    for _ in range(num_games):
+        game = create_game()
+        moves = []
+        while not _is_game_finished(game):
+            move = random.choice(game.get_possible_moves())
+            game.play_move(player=game.active_player, move=move)
+            moves.append(move)
+        move_sequences.append(moves)
+    return move_sequences
+
+
+def play_move_sequence(game, moves):
+    for move in moves:
+        game.play_move(player=game.active_player, move=move)
+    return game
+
+
+def _is_game_finished(game):
+    return game.is_draw() or any(game.is_winner(player) for player in (game.active_player, game.idle_player))
@@ -0,0 +1,70 @@
+"""Benchmark the cost of the trainable estimators: parameters, inference latency and training step time.
+
+Run with: python -m benchmarks.estimators
+"""
+
+import time
+
+import click
+import numpy as np
+import torch
+
+from alpha_viergewinnt.game.tictactoe import Tictactoe
+from alpha_viergewinnt.game.viergewinnt import Viergewinnt
+from alpha_viergewinnt.agent.alpha.mlp_estimator import MlpEstimator
+from alpha_viergewinnt.agent.alpha.cnn_estimator import CnnEstimator
+
+GAME_FACTORIES = {"tictactoe": Tictactoe, "viergewinnt": Viergewinnt}
+ESTIMATOR_CLASSES = {"mlp": MlpEstimator, "cnn": CnnEstimator}
+
+
+def get_num_parameters(estimator):
+    return sum(parameter.numel() for parameter in estimator.parameters())
+
+
+def measure_latency(function, num_repetitions):
+    """Call function num_repetitions times (after a warm up call) and return the mean duration in milliseconds."""
+    function()
+    start_time = time.perf_counter()
+    for _ in range(num_repetitions):
+        function()
+    return 1000 * (time.perf_counter() - start_time) / num_repetitions
+
+
+def create_training_batch(game, batch_size, random_state):
+    state_array = random_state.randint(-1, 2, size=(batch_size,) + game.state.shape).astype(np.int8)
+    target_distribution = random_state.dirichlet(np.ones(len(game.get_all_moves())), size=batch_size)
+    target_state_value = random_state.uniform(-1, 1, size=batch_size)
+    return state_array, target_distribution, target_state_value
+
+
+@click.command()
+@click.option("--game", type=click.Choice(GAME_FACTORIES.keys()), default="viergewinnt", help="Game of the estimators")
+@click.option("--batch-sizes", default="1,8,64", help="Comma separated inference batch sizes")
+@click.option("--minibatch-size", type=int, default=64, help="Number of samples per training step")
+@click.option("--num-repetitions", type=int, default=100, help="Number of measured calls per configuration")
+@click.option("--random-seed", type=int, default=0, help="Seed for parameters and inputs")
+def cmd(game, batch_sizes, minibatch_size, num_repetitions, random_seed):
+    game = GAME_FACTORIES[game]()
+    batch_sizes = [int(batch_size) for batch_size in batch_sizes.split(",")]
+
+    header = ["estimator", "params"] + ["infer %d ms" % batch_size for batch_size in batch_sizes] + ["train ms"]
+    click.echo(("%-10s %10s" + " %12s" * (len(header) - 2)) % tuple(header))
+    for name, estimator_class in ESTIMATOR_CLASSES.items():
+        torch.manual_seed(random_seed)
+        random_state = np.random.RandomState(random_seed)
+        estimator = estimator_class(board_size=game.board_size, actions=game.get_all_moves())
+
+        latencies = []
+        for batch_size in batch_sizes:
+            state_array_batch, _, _ = create_training_batch(game, batch_size, random_state)
+            latencies.append(measure_latency(lambda: estimator.infer_batch(state_array_batch), num_repetitions))
+        training_batch = create_training_batch(game, minibatch_size, random_state)
+        training_time = measure_latency(lambda: estimator.train(*training_batch), num_repetitions)
+
+        row = [name, get_num_parameters(estimator)] + latencies + [training_time]
+        click.echo(("%-10s %10d" + " %12.3f" * (len(row) - 2)) % tuple(row))
+
+
+if __name__ == "__main__":
+    cmd()
@@ -0,0 +1,86 @@
+"""Benchmark moves and terminal checks per second of the numpy and bitboard game engines.
+
+Terminal checks are the cached results of the last move, full rescans check the win and
+draw conditions on the whole board.
+
+Run with: python -m benchmarks.game_engine
+"""
+
+import click
+
+from alpha_viergewinnt.game.board import Player
+from alpha_viergewinnt.game.tictactoe import Tictactoe, BitboardTictactoe
+from alpha_viergewinnt.game.viergewinnt import Viergewinnt, BitboardViergewinnt
+
+from .common import measure_rate, generate_move_sequences, play_move_sequence
+
+GAME_FACTORIES = {
+    "tictactoe": (Tictactoe, BitboardTictactoe),
+    "viergewinnt": (Viergewinnt, BitboardViergewinnt),
+}
+
+
+def benchmark_moves(create_game, move_sequences):
+    games = [create_game() for _ in move_sequences]
+    num_moves = sum(len(moves) for moves in move_sequences)
+
+    def play_all():
+        for game, moves in zip(games, move_sequences):
+            play_move_sequence(game, moves)
+
+    return measure_rate(play_all, num_moves)
+
+
+def _get_all_positions(create_game, move_sequences):
+    positions = []
+    for moves in move_sequences:
+        for num_moves in range(1, len(moves) + 1):
+            positions.append(play_move_sequence(create_game(), moves[:num_moves]))
+    return positions
+
+
+def benchmark_terminal_checks(create_game, move_sequences):
+    positions = _get_all_positions(create_game, move_sequences)
+
+    def check_all():
+        for position in positions:
+            position.is_winner(Player.X)
+            position.is_winner(Player.O)
+            position.is_draw()
+
+    return measure_rate(check_all, 3 * len(positions))
+
+
+def benchmark_full_rescans(create_game, move_sequences):
+    positions = _get_all_positions(create_game, move_sequences)
+
+    def rescan_all():
+        for position in positions:
+            position.win_conditions[Player.X].check(position)
+            position.win_conditions[Player.O].check(position)
+            position.draw_condition.check(position)
+
+    return measure_rate(rescan_all, 3 * len(positions))
+
+
+@click.command()
+@click.option("--game", type=click.Choice(GAME_FACTORIES.keys()), default="viergewinnt", help="Game to benchmark")
+@click.option("--num-games", type=int, default=200, help="Number of random games to replay")
+@click.option("--random-seed", type=int, default=0, help="Seed for generating the random games")
+def cmd(game, num_games, random_seed):
+    numpy_factory, bitboard_factory = GAME_FACTORIES[game]
+    move_sequences = generate_move_sequences(numpy_factory, num_games, random_seed)
+
+    click.echo("%-22s %14s %22s %20s" % ("engine", "moves/sec", "terminal checks/sec", "full rescans/sec"))
+    for create_game in (numpy_factory, bitboard_factory):
+        moves_per_second = benchmark_moves(create_game, move_sequences)
+        checks_per_second = benchmark_terminal_checks(create_game, move_sequences)
+        rescans_per_second = benchmark_full_rescans(create_game, move_sequences)
+        click.echo(
+            "%-22s %14.0f %22.0f %20.0f"
+            % (create_game.__name__, moves_per_second, checks_per_second, rescans_per_second)
+        )
+
+
+if __name__ == "__main__":
+    cmd()
@@ -0,0 +1,51 @@
+"""Benchmark evaluations per second of the torch MlpEstimator and its inference only numpy export.
+
+Run with: python -m benchmarks.inference
+"""
+
+import click
+import numpy as np
+
+from alpha_viergewinnt.game.viergewinnt import Viergewinnt
+from alpha_viergewinnt.agent.alpha.factory import create_mlp_estimator
+
+from .common import measure_rate
+
+
+def benchmark_infer(estimator, state_array_batch):
+    def infer():
+        for state_array in state_array_batch:
+            estimator.infer(state_array)
+
+    return measure_rate(infer, len(state_array_batch))
+
+
+def benchmark_infer_batch(estimator, state_array_batch, batch_size):
+    def infer_batch():
+        for start in range(0, len(state_array_batch), batch_size):
+            estimator.infer_batch(state_array_batch[start : start + batch_size])
+
+    return measure_rate(infer_batch, len(state_array_batch))
+
+
+@click.command()
+@click.option("--num-states", type=int, default=2000, help="Number of evaluated states")
+@click.option("--batch-sizes", default="1,8,64", help="Comma separated batch sizes")
+@click.option("--random-seed", type=int, default=0, help="Seed for the random states")
+def cmd(num_states, batch_sizes, random_seed):
+    game = Viergewinnt()
+    random_state = np.random.RandomState(random_seed)
+    state_array_batch = random_state.randint(-1, 2, size=(num_states,) + game.state.shape).astype(np.int8)
+    mlp_estimator = create_mlp_estimator(game)
+    estimators = {"torch": mlp_estimator, "numpy": mlp_estimator.to_numpy_estimator()}
+
+    click.echo("%-8s %-10s %16s" % ("engine", "batch", "evaluations/sec"))
+    for name, estimator in estimators.items():
+        click.echo("%-8s %-10s %16.0f" % (name, "single", benchmark_infer(estimator, state_array_batch)))
+        for batch_size in [int(batch_size) for batch_size in batch_sizes.split(",")]:
+            rate = benchmark_infer_batch(estimator, state_array_batch, batch_size)
+            click.echo("%-8s %-10d %16.0f" % (name, batch_size, rate))
+
+
+if __name__ == "__main__":
+    cmd()
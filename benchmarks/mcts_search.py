@@ -0,0 +1,85 @@
+"""Benchmark simulations per second and memory of the alpha MCTS and the pure MCTS tree search.
+
+Run with: python -m benchmarks.mcts_search
+"""
+
+import time
+import tracemalloc
+
+import click
+import numpy as np
+
+from alpha_viergewinnt.game.board import Player
+from alpha_viergewinnt.game.viergewinnt import Viergewinnt, BitboardViergewinnt
+from alpha_viergewinnt.agent.alpha.factory import create_generic_estimator, create_alpha_agent
+from alpha_viergewinnt.agent.pure_mcts.factory import create_pure_mcts_agent
+
+GAME_FACTORIES = {"numpy": Viergewinnt, "bitboard": BitboardViergewinnt}
+# fixed midgame position (column moves starting with player X)
+MIDGAME_MOVES = [3, 3, 2, 4, 4, 2, 5, 1, 3, 3, 6, 0]
+
+
+def create_position(create_game, moves, transpositions=False):
+    game = create_game(transpositions=transpositions)
+    for move in moves:
+        game.play_move(player=game.active_player, move=move)
+    return game
+
+
+def benchmark_search(agent, state, measure_memory):
+    """Return simulations per second and peak memory (MB) of one move search."""
+    if measure_memory:
+        tracemalloc.start()
+    start_time = time.perf_counter()
+    agent.get_next_move(state)
+    duration = time.perf_counter() - start_time
+    peak_memory = 0
+    if measure_memory:
+        _, peak_memory = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return agent.mcts_steps / duration, peak_memory / 1e6
+
+
+def create_alpha(state, mcts_steps, array_tree):
+    estimator = create_generic_estimator(state)
+    return create_alpha_agent(estimator, state.active_player, mcts_steps, random_seed=0, array_tree=array_tree)
+
+
+def create_pure_mcts(state, mcts_steps, array_tree):
+    return create_pure_mcts_agent(
+        state.active_player, mcts_steps, mcts_rollouts=1, random_seed=0, array_tree=array_tree
+    )
+
+
+AGENT_FACTORIES = {"alpha": create_alpha, "pure_mcts": create_pure_mcts}
+
+
+@click.command()
+@click.option("--agent", type=click.Choice(AGENT_FACTORIES.keys()), default="alpha", help="Search to benchmark")
+@click.option("--engine", type=click.Choice(GAME_FACTORIES.keys()), default="bitboard", help="Game engine")
+@click.option("--mcts-steps", type=int, default=1000, help="Number of MCTS steps per search")
+@click.option("--memory", is_flag=True, help="Measure peak memory (slows down the search)")
+@click.option("--random-seed", type=int, default=0, help="Seed for the global numpy random state")
+@click.option(
+    "--transpositions", is_flag=True, help="Share search nodes between move orders reaching the same position"
+)
+def cmd(agent, engine, mcts_steps, memory, random_seed, transpositions):
+    create_game = GAME_FACTORIES[engine]
+    create_agent = AGENT_FACTORIES[agent]
+    positions = {
+        "empty": create_position(create_game, [], transpositions),
+        "midgame": create_position(create_game, MIDGAME_MOVES, transpositions),
+    }
+
+    click.echo("%-10s %-8s %16s %16s" % ("tree", "position", "simulations/sec", "peak memory MB"))
+    for array_tree in (False, True):
+        for position_name, position in positions.items():
+            np.random.seed(random_seed)
+            search_agent = create_agent(position, mcts_steps, array_tree)
+            simulations_per_second, peak_memory = benchmark_search(search_agent, position, memory)
+            tree_name = "array" if array_tree else "graph"
+            click.echo("%-10s %-8s %16.0f %16.1f" % (tree_name, position_name, simulations_per_second, peak_memory))
+
+
+if __name__ == "__main__":
+    cmd()
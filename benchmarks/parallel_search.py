@@ -0,0 +1,84 @@
+"""Benchmark the scaling of root parallel and tree parallel search with the number of search workers.
+
+Run with: python -m benchmarks.parallel_search
+"""
+
+import time
+
+import click
+import numpy as np
+
+from alpha_viergewinnt.game.viergewinnt import BitboardViergewinnt
+from alpha_viergewinnt.agent.alpha.factory import create_mlp_estimator, create_alpha_agent
+from alpha_viergewinnt.agent.parallel_search import SearchMode
+from alpha_viergewinnt.agent.pure_mcts.factory import create_pure_mcts_agent
+
+from .mcts_search import MIDGAME_MOVES, create_position
+
+
+def benchmark_search(agent, state, num_searches):
+    """Return simulations per second of num_searches move searches, after a warm up search (starting the workers)."""
+    agent.get_next_move(state)
+    start_time = time.perf_counter()
+    for _ in range(num_searches):
+        agent.get_next_move(state)
+    duration = time.perf_counter() - start_time
+    return num_searches * agent.mcts_steps / duration
+
+
+def create_alpha(state, mcts_steps, search_workers, search_mode):
+    # the mlp estimator runs in torch, which releases the GIL during inference
+    estimator = create_mlp_estimator(state)
+    return create_alpha_agent(
+        estimator,
+        state.active_player,
+        mcts_steps,
+        random_seed=0,
+        reuse_tree=False,
+        search_workers=search_workers,
+        search_mode=search_mode,
+    )
+
+
+def create_pure_mcts(state, mcts_steps, search_workers, search_mode):
+    return create_pure_mcts_agent(
+        state.active_player,
+        mcts_steps,
+        mcts_rollouts=10,
+        random_seed=0,
+        reuse_tree=False,
+        search_workers=search_workers,
+    )
+
+
+AGENT_FACTORIES = {"alpha": create_alpha, "pure_mcts": create_pure_mcts}
+# tree parallelism shares the search graph of the alpha MCTS only
+SEARCH_MODES = {"alpha": [SearchMode.ROOT, SearchMode.TREE], "pure_mcts": [SearchMode.ROOT]}
+
+
+@click.command()
+@click.option("--agent", type=click.Choice(AGENT_FACTORIES.keys()), default="alpha", help="Search to benchmark")
+@click.option("--mcts-steps", type=int, default=800, help="Number of MCTS steps per search")
+@click.option("--num-searches", type=int, default=3, help="Number of measured searches per configuration")
+@click.option("--search-workers", default="1,2,4,8", help="Comma separated numbers of search workers")
+@click.option("--random-seed", type=int, default=0, help="Seed for the global numpy random state")
+def cmd(agent, mcts_steps, num_searches, search_workers, random_seed):
+    position = create_position(BitboardViergewinnt, MIDGAME_MOVES)
+    create_agent = AGENT_FACTORIES[agent]
+
+    click.echo("%-6s %-8s %16s %8s" % ("mode", "workers", "simulations/sec", "speedup"))
+    for search_mode in SEARCH_MODES[agent]:
+        base_rate = None
+        for num_workers in [int(num_workers) for num_workers in search_workers.split(",")]:
+            np.random.seed(random_seed)
+            search_agent = create_agent(position, mcts_steps, num_workers, search_mode)
+            try:
+                rate = benchmark_search(search_agent, position, num_searches)
+            finally:
+                search_agent.close()
+            base_rate = base_rate or rate
+            click.echo("%-6s %-8d %16.0f %8.2f" % (search_mode.value, num_workers, rate, rate / base_rate))
+
+
+if __name__ == "__main__":
+    cmd()
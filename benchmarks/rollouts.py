@@ -0,0 +1,50 @@
+"""Benchmark rollouts per second of the sequential simulator and the vectorized batch simulator of the pure MCTS.
+
+Run with: python -m benchmarks.rollouts
+"""
+
+import click
+
+from alpha_viergewinnt.game.viergewinnt import BitboardViergewinnt
+from alpha_viergewinnt.agent.pure_mcts.agent import create_random_choice_strategy
+from alpha_viergewinnt.agent.pure_mcts.batch_simulator import BatchSimulator
+from alpha_viergewinnt.agent.pure_mcts.tree_search import Simulator
+
+from .common import measure_rate
+from .mcts_search import MIDGAME_MOVES, create_position
+
+
+def benchmark_simulator(state, num_rollouts, random_seed):
+    simulator = Simulator(strategy=create_random_choice_strategy(random_seed), player=state.active_player)
+
+    def rollouts():
+        for _ in range(num_rollouts):
+            simulator.rollout_and_rewind(state)
+
+    return measure_rate(rollouts, num_rollouts)
+
+
+def benchmark_batch_simulator(state, num_rollouts, random_seed):
+    batch_simulator = BatchSimulator(state.active_player, random_seed)
+    return measure_rate(lambda: batch_simulator.get_mean_rollout_value(state, num_rollouts), num_rollouts)
+
+
+@click.command()
+@click.option("--num-rollouts", default="1,30,300,3000", help="Comma separated numbers of rollouts per state")
+@click.option("--random-seed", type=int, default=0, help="Seed for the rollout strategies")
+def cmd(num_rollouts, random_seed):
+    positions = {
+        "empty": create_position(BitboardViergewinnt, []),
+        "midgame": create_position(BitboardViergewinnt, MIDGAME_MOVES),
+    }
+
+    click.echo("%-10s %-8s %16s %16s" % ("rollouts", "position", "sequential/sec", "batch/sec"))
+    for rollouts_per_state in [int(rollouts_per_state) for rollouts_per_state in num_rollouts.split(",")]:
+        for position_name, position in positions.items():
+            sequential_rate = benchmark_simulator(position, rollouts_per_state, random_seed)
+            batch_rate = benchmark_batch_simulator(position, rollouts_per_state, random_seed)
+            click.echo("%-10d %-8s %16.0f %16.0f" % (rollouts_per_state, position_name, sequential_rate, batch_rate))
+
+
+if __name__ == "__main__":
+    cmd()
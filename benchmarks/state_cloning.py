@@ -0,0 +1,88 @@
+"""Benchmark node expansion throughput with deepcopy and with clone, and rollouts with undo.
+
+Run with: python -m benchmarks.state_cloning
+"""
+
+from copy import deepcopy
+from random import Random
+
+import click
+
+from alpha_viergewinnt.game.tictactoe import Tictactoe, BitboardTictactoe
+from alpha_viergewinnt.game.viergewinnt import Viergewinnt, BitboardViergewinnt
+
+from .common import measure_rate, generate_move_sequences, play_move_sequence
+
+GAME_FACTORIES = {
+    "tictactoe": (Tictactoe, BitboardTictactoe),
+    "viergewinnt": (Viergewinnt, BitboardViergewinnt),
+}
+COPY_FUNCTIONS = {"deepcopy": deepcopy, "clone": lambda state: state.clone()}
+
+
+def _get_midgame_positions(create_game, move_sequences):
+    return [play_move_sequence(create_game(), moves[: len(moves) // 2]) for moves in move_sequences]
+
+
+def benchmark_expansion(create_game, move_sequences, copy_function):
+    """Expand all successors of midgame positions, as done by the alpha MCTS."""
+    positions = _get_midgame_positions(create_game, move_sequences)
+    num_successors = sum(len(position.get_possible_moves()) for position in positions)
+
+    def expand_all():
+        for position in positions:
+            for move in position.get_possible_moves():
+                successor = copy_function(position)
+                successor.play_move(player=position.active_player, move=move)
+
+    return measure_rate(expand_all, num_successors)
+
+
+def benchmark_rollouts(create_game, move_sequences, rewind, random_seed):
+    """Play random rollouts from midgame positions, on a copy of the position or in place and rewind."""
+    positions = _get_midgame_positions(create_game, move_sequences)
+    random = Random(random_seed)
+
+    def rollout(state):
+        num_moves = 0
+        while not (state.is_draw() or state.is_winner(state.idle_player)):
+            state.play_move(player=state.active_player, move=random.choice(state.get_possible_moves()))
+            num_moves += 1
+        return num_moves
+
+    def rollout_all():
+        for position in positions:
+            if rewind:
+                for _ in range(rollout(position)):
+                    position.undo_move()
+            else:
+                rollout(deepcopy(position))
+
+    return measure_rate(rollout_all, len(positions))
+
+
+@click.command()
+@click.option("--game", type=click.Choice(GAME_FACTORIES.keys()), default="viergewinnt", help="Game to benchmark")
+@click.option("--num-games", type=int, default=200, help="Number of random games to take positions from")
+@click.option("--random-seed", type=int, default=0, help="Seed for generating the random games")
+def cmd(game, num_games, random_seed):
+    numpy_factory, bitboard_factory = GAME_FACTORIES[game]
+    move_sequences = generate_move_sequences(numpy_factory, num_games, random_seed)
+
+    click.echo("%-22s %-10s %18s" % ("engine", "copy", "expansions/sec"))
+    for create_game in (numpy_factory, bitboard_factory):
+        for copy_name, copy_function in COPY_FUNCTIONS.items():
+            expansions_per_second = benchmark_expansion(create_game, move_sequences, copy_function)
+            click.echo("%-22s %-10s %18.0f" % (create_game.__name__, copy_name, expansions_per_second))
+
+    click.echo("")
+    click.echo("%-22s %-10s %18s" % ("engine", "rollout", "rollouts/sec"))
+    for create_game in (numpy_factory, bitboard_factory):
+        for rewind in (False, True):
+            rollouts_per_second = benchmark_rollouts(create_game, move_sequences, rewind, random_seed)
+            rollout_name = "undo" if rewind else "deepcopy"
+            click.echo("%-22s %-10s %18.0f" % (create_game.__name__, rollout_name, rollouts_per_second))
+
+
+if __name__ == "__main__":
+    cmd()
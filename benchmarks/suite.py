@@ -0,0 +1,257 @@
+"""Benchmark suite of game engine, search and training throughput with JSON results and a regression check.
+
+Every benchmark uses fixed seeds and fixed positions and is repeated, keeping the best result, so the results of
+two runs on the same machine are comparable. With --baseline, the results are compared with the results of an
+earlier run and the command fails if any benchmark got slower by more than --threshold.
+
+Run with: python -m benchmarks.suite --output results.json
+Compare with: python -m benchmarks.suite --baseline results.json
+"""
+
+import json
+import math
+import platform
+import sys
+import time
+from collections import OrderedDict
+from copy import deepcopy
+
+import click
+import numpy as np
+import torch
+
+from alpha_viergewinnt.game.board import Player
+from alpha_viergewinnt.game.viergewinnt import Viergewinnt, BitboardViergewinnt
+from alpha_viergewinnt.agent.alpha.evaluator import Evaluator
+from alpha_viergewinnt.agent.alpha.factory import (
+    create_generic_estimator,
+    create_mlp_estimator,
+    create_alpha_agent,
+    create_alpha_trainer,
+)
+from alpha_viergewinnt.agent.pure_mcts.factory import create_pure_mcts_agent
+from alpha_viergewinnt.match import TrainingMatch
+
+from .common import measure_rate, generate_move_sequences, play_move_sequence
+from .estimators import measure_latency
+from .game_engine import benchmark_moves, benchmark_terminal_checks
+from .mcts_search import MIDGAME_MOVES, create_position
+from .state_cloning import benchmark_expansion
+
+GAME_FACTORIES = {"numpy": Viergewinnt, "bitboard": BitboardViergewinnt}
+RANDOM_SEED = 0
+
+
+class Benchmark(object):
+    def __init__(self, name, function, unit, higher_is_better=True):
+        """function takes the scale of the benchmark and returns the measured value."""
+        self.name = name
+        self.function = function
+        self.unit = unit
+        self.higher_is_better = higher_is_better
+
+    def run(self, scale, repeat):
+        """Return the best value of repeat runs."""
+        values = []
+        for _ in range(repeat):
+            np.random.seed(RANDOM_SEED)
+            torch.manual_seed(RANDOM_SEED)
+            values.append(self.function(scale))
+        return max(values) if self.higher_is_better else min(values)
+
+
+def _get_move_sequences(scale):
+    return generate_move_sequences(Viergewinnt, max(1, int(50 * scale)), RANDOM_SEED)
+
+
+def benchmark_possible_moves(create_game, move_sequences):
+    positions = [play_move_sequence(create_game(), moves[: len(moves) // 2]) for moves in move_sequences]
+    num_repetitions = 100
+
+    def get_all():
+        for _ in range(num_repetitions):
+            for position in positions:
+                position.get_possible_moves()
+
+    return measure_rate(get_all, num_repetitions * len(positions))
+
+
+def benchmark_alpha_search(create_estimator, scale):
+    """Simulations per second of one search of the midgame position."""
+    state = create_position(BitboardViergewinnt, MIDGAME_MOVES)
+    mcts_steps = max(1, int(400 * scale))
+    agent = create_alpha_agent(create_estimator(state), state.active_player, mcts_steps, random_seed=RANDOM_SEED)
+    return measure_rate(lambda: agent.get_next_move(state), mcts_steps)
+
+
+def benchmark_pure_mcts_rollouts(scale):
+    """Rollouts per second of one search of the midgame position."""
+    state = create_position(BitboardViergewinnt, MIDGAME_MOVES)
+    mcts_steps, mcts_rollouts = max(1, int(100 * scale)), 10
+    agent = create_pure_mcts_agent(state.active_player, mcts_steps, mcts_rollouts, random_seed=RANDOM_SEED)
+    return measure_rate(lambda: agent.get_next_move(state), mcts_steps * mcts_rollouts)
+
+
+def benchmark_evaluator_train(scale):
+    """Milliseconds of one training step of the MLP estimator on the positions of a random game."""
+    [moves] = generate_move_sequences(Viergewinnt, 1, RANDOM_SEED)
+    game = Viergewinnt()
+    num_actions = len(game.get_all_moves())
+    states_and_search_distributions = []
+    for move in moves:
+        states_and_search_distributions.append((game.clone(), np.full(num_actions, 1 / num_actions)))
+        game.play_move(player=game.active_player, move=move)
+    evaluator = Evaluator(create_mlp_estimator(game), Player.X)
+    return measure_latency(lambda: evaluator.train(states_and_search_distributions, game), max(1, int(20 * scale)))
+
+
+def benchmark_self_play(scale):
+    """Self-play games per hour of the MLP estimator against itself, as played by bin/train."""
+    game = BitboardViergewinnt()
+    estimator = create_mlp_estimator(game)
+    options = dict(mcts_steps=max(1, int(50 * scale)), random_seed=RANDOM_SEED)
+    agents = {
+        Player.X: create_alpha_trainer(estimator, Player.X, **options),
+        Player.O: create_alpha_agent(estimator, Player.O, **options),
+    }
+    num_games = 2
+
+    def play_games():
+        for _ in range(num_games):
+            TrainingMatch(game=game, agents=agents).train()
+
+    return 3600 * measure_rate(play_games, num_games)
+
+
+def _create_benchmarks():
+    benchmarks = []
+    for engine, create_game in GAME_FACTORIES.items():
+        benchmarks += [
+            Benchmark(
+                "play_move/%s" % engine,
+                lambda scale, create_game=create_game: benchmark_moves(create_game, _get_move_sequences(scale)),
+                "moves/sec",
+            ),
+            Benchmark(
+                "terminal_checks/%s" % engine,
+                lambda scale, create_game=create_game: benchmark_terminal_checks(
+                    create_game, _get_move_sequences(scale)
+                ),
+                "checks/sec",
+            ),
+            Benchmark(
+                "get_possible_moves/%s" % engine,
+                lambda scale, create_game=create_game: benchmark_possible_moves(
+                    create_game, _get_move_sequences(scale)
+                ),
+                "calls/sec",
+            ),
+            Benchmark(
+                "deepcopy/%s" % engine,
+                lambda scale, create_game=create_game: benchmark_expansion(
+                    create_game, _get_move_sequences(scale), deepcopy
+                ),
+                "copies/sec",
+            ),
+            Benchmark(
+                "clone/%s" % engine,
+                lambda scale, create_game=create_game: benchmark_expansion(
+                    create_game, _get_move_sequences(scale), lambda state: state.clone()
+                ),
+                "copies/sec",
+            ),
+        ]
+    benchmarks += [
+        Benchmark(
+            "mcts/generic", lambda scale: benchmark_alpha_search(create_generic_estimator, scale), "simulations/sec"
+        ),
+        Benchmark("mcts/mlp", lambda scale: benchmark_alpha_search(create_mlp_estimator, scale), "simulations/sec"),
+        Benchmark("pure_mcts/rollouts", benchmark_pure_mcts_rollouts, "rollouts/sec"),
+        Benchmark("evaluator/train", benchmark_evaluator_train, "ms/step", higher_is_better=False),
+        Benchmark("self_play/mlp", benchmark_self_play, "games/hour"),
+    ]
+    return OrderedDict((benchmark.name, benchmark) for benchmark in benchmarks)
+
+
+BENCHMARKS = _create_benchmarks()
+
+
+def run_benchmarks(names, scale=1.0, repeat=3, echo=None):
+    """Run the benchmarks of names and return the results (a dict which can be written as JSON)."""
+    results = OrderedDict()
+    for name in names:
+        benchmark = BENCHMARKS[name]
+        value = benchmark.run(scale, repeat)
+        results[name] = dict(value=value, unit=benchmark.unit, higher_is_better=benchmark.higher_is_better)
+        if echo is not None:
+            echo("%-28s %14.1f %s" % (name, value, benchmark.unit))
+    return dict(
+        benchmarks=results,
+        scale=scale,
+        repeat=repeat,
+        time=time.strftime("%Y-%m-%dT%H:%M:%S"),
+        machine=dict(platform=platform.platform(), python=platform.python_version(), processor=platform.processor()),
+    )
+
+
+def get_relative_change(result, baseline_result):
+    """
+    Relative change of a benchmark result towards better (positive) or worse (negative) performance. Any change
+    from a baseline value of 0 is infinite.
+    """
+    difference = result["value"] - baseline_result["value"]
+    if baseline_result["value"] == 0:
+        change = 0.0 if difference == 0 else math.copysign(math.inf, difference)
+    else:
+        change = difference / baseline_result["value"]
+    return change if baseline_result["higher_is_better"] else -change
+
+
+def find_regressions(results, baseline, threshold):
+    """Return the names and relative changes of the benchmarks which got worse than baseline by more than threshold."""
+    regressions = OrderedDict()
+    for name, result in results["benchmarks"].items():
+        baseline_result = baseline["benchmarks"].get(name)
+        if baseline_result is None:
+            continue
+        change = get_relative_change(result, baseline_result)
+        if change < -threshold:
+            regressions[name] = change
+    return regressions
+
+
+@click.command()
+@click.option("--benchmark", "names", multiple=True, type=click.Choice(BENCHMARKS.keys()), help="Benchmarks to run")
+@click.option(
+    "--scale", type=float, default=1.0, help="Factor for the size of the benchmarks (e.g. 0.1 for a quick run)"
+)
+@click.option("--repeat", type=int, default=3, help="Number of runs per benchmark, the best result is kept")
+@click.option("--output", type=click.Path(dir_okay=False), help="Write the results as JSON to this file")
+@click.option("--baseline", type=click.Path(exists=True, dir_okay=False), help="JSON results of an earlier run")
+@click.option("--threshold", type=float, default=0.1, help="Relative slowdown against the baseline which fails")
+def cmd(names, scale, repeat, output, baseline, threshold):
+    click.echo("%-28s %14s" % ("benchmark", "result"))
+    results = run_benchmarks(names or list(BENCHMARKS), scale, repeat, echo=click.echo)
+    if output is not None:
+        with open(output, "w") as file:
+            json.dump(results, file, indent=2)
+
+    if baseline is None:
+        return
+    with open(baseline) as file:
+        baseline = json.load(file)
+    if baseline["scale"] != scale:
+        click.echo("Warning: baseline was run with scale %g" % baseline["scale"])
+    click.echo("")
+    click.echo("%-28s %14s" % ("benchmark", "change"))
+    for name, result in results["benchmarks"].items():
+        if name in baseline["benchmarks"]:
+            click.echo("%-28s %13.1f%%" % (name, 100 * get_relative_change(result, baseline["benchmarks"][name])))
+    regressions = find_regressions(results, baseline, threshold)
+    if regressions:
+        click.echo("Regressions beyond %.0f%%: %s" % (100 * threshold, ", ".join(regressions)))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    cmd()
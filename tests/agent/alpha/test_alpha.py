@@ -1,5 +1,6 @@
 import pytest
 import matplotlib
+import numpy as np
 
 from alpha_viergewinnt.agent.alpha import *
 
@@ -24,3 +25,56 @@ def test_get_next_move(max_first_evaluator):
     action = agent.get_next_move(root)
 
     assert action == root.get_possible_moves()[0]
+
+
+@pytest.mark.parametrize("array_tree", [False, True], ids=["graph", "array_graph"])
+def test_reuse_subtree(max_first_evaluator, array_tree):
+    agent = AlphaAgent(
+        evaluator=max_first_evaluator, mcts_steps=10, random_seed=0, draw_graph=False, array_tree=array_tree
+    )
+    state = DummyState()
+    action = agent.get_next_move(state)
+    assert agent.graph.get_state(agent.graph.root) is not state
+
+    successor = agent.graph.get_successor(agent.graph.root, action)
+    grandchild = agent.graph.get_successor(successor, 0)
+    num_reused_simulations = int(np.sum(agent.graph.get_attributes(grandchild).visit_count))
+    assert num_reused_simulations > 0
+
+    state.play_move(player=None, move=action)
+    state.play_move(player=None, move=0)
+    agent.get_next_move(state)
+
+    assert agent.graph.get_state(agent.graph.root) == state
+    assert agent.num_reused_simulations == num_reused_simulations
+    assert agent.get_reused_simulations_fraction() == num_reused_simulations / (num_reused_simulations + 2 * 10)
+
+
+def test_no_reuse_for_unknown_state(max_first_evaluator):
+    agent = AlphaAgent(evaluator=max_first_evaluator, mcts_steps=10, random_seed=0, draw_graph=False)
+    agent.get_next_move(DummyState())
+    state = DummyState()
+    for _ in range(3):
+        state.play_move(player=None, move=2)
+    agent.get_next_move(state)
+
+    assert agent.num_reused_simulations == 0
+    assert agent.get_reused_simulations_fraction() == 0
+
+
+@pytest.mark.parametrize("array_tree", [False, True], ids=["graph", "array_graph"])
+def test_max_tree_nodes(max_first_evaluator, array_tree):
+    agent = AlphaAgent(
+        evaluator=max_first_evaluator,
+        mcts_steps=20,
+        random_seed=0,
+        draw_graph=False,
+        array_tree=array_tree,
+        max_tree_nodes=6,
+    )
+    state = DummyState()
+    agent.get_next_move(state)
+
+    assert agent.graph.get_num_nodes() <= 6
+    # the first step expands the root
+    assert np.sum(agent.graph.get_attributes(agent.graph.root).visit_count) == 19
@@ -0,0 +1,161 @@
+import pytest
+
+from alpha_viergewinnt.agent.alpha.array_graph import *
+from alpha_viergewinnt.agent.alpha.mcts import *
+
+from .test_mcts import DummyState, MaxFirstEvaluator
+
+
+@pytest.fixture
+def graph():
+    graph = ArrayGameStateGraph(root="r", num_actions=4, capacity=2)
+    return graph
+
+
+def test_add_defaults(graph):
+    successor = graph.add_successor("r.1", source=graph.root, action=1)
+
+    assert graph.get_successor(source=graph.root, action=1) == successor
+    assert graph.get_state(successor) == "r.1"
+    assert graph.get_attributes(state=graph.root) is None
+
+
+def test_add_existing_action(graph):
+    graph.add_successor("r.1", source=graph.root, action=1)
+
+    with pytest.raises(ActionAlreadyExistsException):
+        graph.add_successor("r.1", source=graph.root, action=1)
+
+
+def test_actions_and_successors(graph):
+    node_1 = graph.add_successor("r.1", source=graph.root, action=1)
+    node_3 = graph.add_successor("r.3", source=graph.root, action=3)
+    node_1_0 = graph.add_successor("r.1.0", source=node_1, action=0)
+
+    assert len(graph.states) == 4
+    assert graph.get_actions(source=graph.root) == [1, 3]
+    assert graph.get_successor(source=graph.root, action=3) == node_3
+    assert graph.get_actions(source=node_1) == [0]
+    assert graph.get_state(graph.get_successor(source=node_1, action=0)) == "r.1.0"
+    assert graph.has_successors(graph.root)
+    assert not graph.has_successors(node_1_0)
+    assert graph.get_mean_node_depth() == pytest.approx((0 + 1 + 1 + 2) / 4)
+
+
+def test_attributes_are_views_and_survive_growth(graph):
+    attributes = Attributes(state_value=0.5, prior_distribution=np.array([0.1, 0.2, 0.3, 0.4]))
+    graph.set_attributes(attributes, state=graph.root)
+    graph.get_attributes(graph.root).visit_count[2] += 1
+    assert graph.visit_counts[graph.root, 2] == 1
+
+    # grow beyond initial capacity
+    for action in range(4):
+        graph.add_successor("r.%d" % action, source=graph.root, action=action)
+    assert graph.capacity > 2
+
+    root_attributes = graph.get_attributes(graph.root)
+    assert root_attributes.state_value == 0.5
+    assert root_attributes.prior_distribution.tolist() == [0.1, 0.2, 0.3, 0.4]
+    assert root_attributes.visit_count.tolist() == [0, 0, 1, 0]
+    root_attributes.action_value_sum[1] = 0.7
+    assert graph.action_value_sums[graph.root, 1] == 0.7
+
+
+def test_simulate_step():
+    root = DummyState()
+    graph = ArrayGameStateGraph(root, num_actions=3)
+    mcts = Mcts(graph, evaluator=MaxFirstEvaluator())
+
+    mcts.simulate_step(source=graph.root)
+    mcts.simulate_step(source=graph.root)
+
+    assert graph.get_attributes(state=graph.root).visit_count.tolist() == [1, 0, 0]
+    second_expanded = graph.get_successor(graph.root, action=0)
+    assert graph.get_state(second_expanded).played_moves == [0]
+    assert graph.get_attributes(state=second_expanded).visit_count.tolist() == [0, 0, 0]
+    assert graph.get_attributes(state=second_expanded).state_value == 1
+
+
+def test_to_game_state_graph(graph):
+    node_1 = graph.add_successor("r.1", source=graph.root, action=1)
+    graph.add_successor("r.1.2", source=node_1, action=2)
+
+    game_state_graph = graph.to_game_state_graph()
+    assert set(game_state_graph.states) == {"r", "r.1", "r.1.2"}
+    assert game_state_graph.get_successor(source="r.1", action=2) == "r.1.2"
+
+
+def test_reset_root(graph):
+    node_1 = graph.add_successor("r.1", source=graph.root, action=1)
+    graph.add_successor("r.3", source=graph.root, action=3)
+    node_1_0 = graph.add_successor("r.1.0", source=node_1, action=0)
+    node_1_0_2 = graph.add_successor("r.1.0.2", source=node_1_0, action=2)
+    attributes = Attributes(state_value=0.5, prior_distribution=np.array([0.1, 0.2, 0.3, 0.4]))
+    attributes.visit_count[2] = 3
+    graph.set_attributes(attributes, state=node_1_0)
+
+    graph.reset_root(node_1)
+
+    assert len(graph.states) == 3
+    assert graph.get_state(graph.root) == "r.1"
+    assert graph.get_attributes(graph.root) is None
+    assert graph.get_actions(source=graph.root) == [0]
+    new_node_1_0 = graph.get_successor(source=graph.root, action=0)
+    assert graph.get_state(new_node_1_0) == "r.1.0"
+    assert graph.get_attributes(new_node_1_0).visit_count.tolist() == [0, 0, 3, 0]
+    assert graph.get_attributes(new_node_1_0).state_value == 0.5
+    assert graph.get_state(graph.get_successor(source=new_node_1_0, action=2)) == "r.1.0.2"
+    assert graph.get_mean_node_depth() == pytest.approx((0 + 1 + 2) / 3)
+
+    # freed rows can be used again
+    node_1_1 = graph.add_successor("r.1.1", source=graph.root, action=1)
+    assert node_1_1 == 3
+    assert graph.get_attributes(node_1_1) is None
+    assert not graph.has_successors(node_1_1)
+
+
+def test_prune(graph):
+    node_1 = graph.add_successor("r.1", source=graph.root, action=1)
+    node_3 = graph.add_successor("r.3", source=graph.root, action=3)
+    graph.add_successor("r.1.0", source=node_1, action=0)
+    graph.add_successor("r.3.2", source=node_3, action=2)
+    attributes = Attributes(state_value=0.5, prior_distribution=np.array([0.1, 0.2, 0.3, 0.4]))
+    attributes.visit_count[1] = 1
+    attributes.visit_count[3] = 4
+    graph.set_attributes(attributes, state=graph.root)
+    node_3_attributes = Attributes(state_value=0.5, prior_distribution=np.array([0.1, 0.2, 0.3, 0.4]))
+    node_3_attributes.visit_count[2] = 3
+    graph.set_attributes(node_3_attributes, state=node_3)
+    assert graph.get_num_nodes() == 5
+
+    graph.prune(3)
+
+    assert graph.get_num_nodes() == 3
+    assert graph.get_state(graph.root) == "r"
+    assert graph.get_actions(source=graph.root) == [3]
+    assert not graph.has_successor(graph.root, 1)
+    # the statistics of dropped successors are kept
+    assert graph.get_attributes(graph.root).visit_count.tolist() == [0, 1, 0, 4]
+    new_node_3 = graph.get_successor(source=graph.root, action=3)
+    assert graph.get_state(graph.get_successor(source=new_node_3, action=2)) == "r.3.2"
+
+    # dropped successors can be added again
+    assert graph.add_successor("r.1", source=graph.root, action=1) == 3
+
+
+def test_transpositions():
+    graph = ArrayGameStateGraph(root="r", num_actions=4, capacity=2, transpositions=True)
+    node_1 = graph.add_successor("r.1", source=graph.root, action=1)
+    node_2 = graph.add_successor("r.2", source=graph.root, action=2)
+    node_12 = graph.add_successor("r.12", source=node_1, action=2)
+
+    assert graph.add_successor("r.12", source=node_2, action=1) == node_12
+    assert len(graph.states) == 4
+    assert graph.get_successor(source=node_2, action=1) == node_12
+
+    graph.reset_root(graph.root)
+    assert len(graph.states) == 4
+    new_node_12 = graph.get_successor(source=graph.get_successor(source=graph.root, action=1), action=2)
+    assert graph.get_successor(source=graph.get_successor(source=graph.root, action=2), action=1) == new_node_12
+    assert graph.get_state(new_node_12) == "r.12"
+    assert graph.add_successor("r.12.3", source=new_node_12, action=3) == 4
@@ -0,0 +1,128 @@
+import numpy as np
+import pytest
+import torch
+
+from alpha_viergewinnt.game.tictactoe import Tictactoe
+from alpha_viergewinnt.game.viergewinnt import Viergewinnt
+from alpha_viergewinnt.agent.alpha.generic_estimator import GenericEstimator
+from alpha_viergewinnt.agent.alpha.mlp_estimator import MlpEstimator
+from alpha_viergewinnt.agent.alpha.cnn_estimator import CnnEstimator
+
+
+def create_generic_estimator(game):
+    return GenericEstimator(actions=game.get_all_moves())
+
+
+def create_mlp_estimator(game):
+    return MlpEstimator(board_size=game.board_size, actions=game.get_all_moves())
+
+
+def create_cnn_estimator(game):
+    return CnnEstimator(board_size=game.board_size, actions=game.get_all_moves())
+
+
+@pytest.mark.parametrize(
+    "create_estimator",
+    [create_generic_estimator, create_mlp_estimator, create_cnn_estimator],
+    ids=["generic", "mlp", "cnn"],
+)
+def test_infer_batch_equals_infer(create_estimator):
+    game = Viergewinnt()
+    estimator = create_estimator(game)
+    random_state = np.random.RandomState(0)
+    state_array_batch = random_state.randint(-1, 2, size=(5,) + game.state.shape)
+
+    prior_distribution_batch, state_value_batch = estimator.infer_batch(state_array_batch)
+
+    assert prior_distribution_batch.shape == (5, len(game.get_all_moves()))
+    assert state_value_batch.shape == (5,)
+    for state_array, prior_distribution, state_value in zip(
+        state_array_batch, prior_distribution_batch, state_value_batch
+    ):
+        expected_prior_distribution, expected_state_value = estimator.infer(state_array)
+        assert prior_distribution == pytest.approx(expected_prior_distribution, abs=1e-6)
+        assert state_value == pytest.approx(expected_state_value, abs=1e-6)
+
+
+def test_parameters_version(tmp_path):
+    game = Viergewinnt()
+    estimator = create_mlp_estimator(game)
+    assert estimator.parameters_version == 0
+
+    state_array_batch = np.zeros((2,) + game.state.shape)
+    target_distribution_batch = np.ones((2, len(game.get_all_moves()))) / len(game.get_all_moves())
+    estimator.train(state_array_batch, target_distribution_batch, np.zeros(2))
+    assert estimator.parameters_version == 1
+
+    filename = str(tmp_path / "estimator.params")
+    estimator.save(filename)
+    estimator.load(filename)
+    assert estimator.parameters_version == 2
+    estimator.load(str(tmp_path / "missing.params"))
+    assert estimator.parameters_version == 2
+
+
+def test_mlp_hidden_layers_are_registered(tmp_path):
+    game = Viergewinnt()
+    estimator = create_mlp_estimator(game)
+    hidden_layers = (
+        list(estimator.fc_common_hidden) + list(estimator.fc_action_hidden) + list(estimator.fc_value_hidden)
+    )
+    parameter_ids = {id(parameter) for parameter in estimator.parameters()}
+    assert all(id(layer.weight) in parameter_ids for layer in hidden_layers)
+
+    # a loaded estimator infers exactly like the saved one
+    filename = str(tmp_path / "estimator.params")
+    estimator.save(filename)
+    loaded_estimator = create_mlp_estimator(game)
+    loaded_estimator.load(filename)
+    state_array = np.random.RandomState(0).randint(-1, 2, size=game.state.shape)
+    assert loaded_estimator.infer(state_array)[0] == pytest.approx(estimator.infer(state_array)[0])
+    assert loaded_estimator.infer(state_array)[1] == pytest.approx(estimator.infer(state_array)[1])
+
+
+def test_cnn_input_planes():
+    game = Viergewinnt()
+    estimator = create_cnn_estimator(game)
+    state_array = np.zeros(game.state.shape, dtype=np.int8)
+    state_array[5, 3] = 1
+    planes = estimator._get_input_planes(state_array).numpy()
+    assert planes.shape == (1, 3) + game.state.shape
+    assert planes[0, 0, 5, 3] == 1 and planes[0, 0].sum() == 1
+    assert planes[0, 1].sum() == 0
+    # one stone, so the second player is to move
+    assert np.all(planes[0, 2] == 0)
+
+    state_array[5, 4] = -1
+    planes = estimator._get_input_planes(state_array).numpy()
+    assert planes[0, 1, 5, 4] == 1
+    assert np.all(planes[0, 2] == 1)
+
+
+@pytest.mark.parametrize("create_game", [Tictactoe, Viergewinnt], ids=["tictactoe", "viergewinnt"])
+def test_cnn_training(create_game):
+    # the initial parameters depend on the torch random state
+    torch.manual_seed(0)
+    game = create_game()
+    estimator = create_cnn_estimator(game)
+    random_state = np.random.RandomState(0)
+    state_array_batch = random_state.randint(-1, 2, size=(8,) + game.state.shape)
+    target_distribution_batch = np.zeros((8, len(game.get_all_moves())))
+    target_distribution_batch[:, 0] = 1
+
+    first_loss = estimator.train(state_array_batch, target_distribution_batch, np.ones(8))
+    for _ in range(20):
+        loss = estimator.train(state_array_batch, target_distribution_batch, np.ones(8))
+    assert loss < first_loss
+    prior_distribution, state_value = estimator.infer(state_array_batch[0])
+    assert prior_distribution.shape == (len(game.get_all_moves()),)
+    assert np.argmax(prior_distribution) == 0
+
+
+def test_cnn_has_fewer_parameters_than_mlp():
+    game = Viergewinnt()
+
+    def get_num_parameters(estimator):
+        return sum(parameter.numel() for parameter in estimator.parameters())
+
+    assert get_num_parameters(create_cnn_estimator(game)) < get_num_parameters(create_mlp_estimator(game)) / 10
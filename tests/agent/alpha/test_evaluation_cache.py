@@ -0,0 +1,130 @@
+import threading
+
+import numpy as np
+import pytest
+
+from alpha_viergewinnt.game.board import Player
+from alpha_viergewinnt.game.viergewinnt import Viergewinnt
+from alpha_viergewinnt.agent.alpha.evaluation_cache import *
+from alpha_viergewinnt.agent.alpha.evaluator import Evaluator
+
+
+@pytest.fixture
+def cache():
+    return EvaluationCache(capacity=2)
+
+
+def test_hit_and_miss(cache):
+    state_array = np.array([[1, 0], [0, -1]])
+    assert cache.get(state_array, parameters_version=0) is None
+    cache.put(state_array, 0, prior_distribution=np.array([0.5, 0.5]), state_value=0.3)
+
+    prior_distribution, state_value = cache.get(state_array.copy(), parameters_version=0)
+    assert prior_distribution.tolist() == [0.5, 0.5]
+    assert state_value == 0.3
+    assert not prior_distribution.flags.writeable
+    assert (cache.hits, cache.misses, cache.evictions) == (1, 1, 0)
+    assert cache.get_hit_rate() == 0.5
+
+
+def test_least_recently_used_eviction(cache):
+    state_arrays = [np.array([value]) for value in range(3)]
+    cache.put(state_arrays[0], 0, np.array([1.0]), 0)
+    cache.put(state_arrays[1], 0, np.array([1.0]), 1)
+    # use entry 0, so entry 1 is the least recently used one
+    cache.get(state_arrays[0], 0)
+    cache.put(state_arrays[2], 0, np.array([1.0]), 2)
+
+    assert len(cache) == 2
+    assert cache.evictions == 1
+    assert cache.get(state_arrays[1], 0) is None
+    assert cache.get(state_arrays[0], 0) is not None
+    assert cache.get(state_arrays[2], 0) is not None
+
+
+def test_invalidate_on_new_parameters_version(cache):
+    state_array = np.array([1])
+    cache.put(state_array, 0, np.array([1.0]), 0)
+    assert cache.get(state_array, parameters_version=1) is None
+    assert len(cache) == 0
+
+
+def test_thread_safety():
+    cache = EvaluationCache(capacity=50)
+
+    def put_and_get(offset):
+        for value in range(200):
+            state_array = np.array([offset, value])
+            cache.put(state_array, 0, np.array([1.0]), value)
+            cache.get(state_array, 0)
+
+    threads = [threading.Thread(target=put_and_get, args=(offset,)) for offset in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(cache) == 50
+    assert cache.hits + cache.misses == 800
+    assert cache.evictions == 800 - 50
+
+
+class CountingEstimator(object):
+    def __init__(self, actions):
+        self.actions = actions
+        self.parameters_version = 0
+        self.num_inferred = 0
+
+    def infer(self, state_array):
+        self.num_inferred += 1
+        return np.ones(len(self.actions)) / len(self.actions), float(state_array.sum())
+
+    def infer_batch(self, state_array_batch):
+        self.num_inferred += len(state_array_batch)
+        prior_distribution_batch = np.ones((len(state_array_batch), len(self.actions))) / len(self.actions)
+        return prior_distribution_batch, state_array_batch.reshape(len(state_array_batch), -1).sum(axis=1)
+
+
+def test_evaluator_shares_cache_between_players():
+    game = Viergewinnt()
+    estimator = CountingEstimator(game.get_all_moves())
+    cache = EvaluationCache(capacity=100)
+    evaluator_x = Evaluator(estimator, Player.X, cache)
+    evaluator_o = Evaluator(estimator, Player.O, cache)
+
+    game_x = Viergewinnt()
+    game_x.play_move(player=Player.X, move=3)
+    game_x.play_move(player=Player.O, move=4)
+    # same position with swapped colors
+    game_o = Viergewinnt()
+    game_o.play_move(player=Player.X, move=4)
+    game_o.play_move(player=Player.O, move=3)
+
+    evaluation_x = evaluator_x.evaluate(game_x)
+    evaluation_o = evaluator_o.evaluate(game_o)
+    assert estimator.num_inferred == 1
+    assert evaluation_o[1] == evaluation_x[1]
+
+    # new parameters invalidate the cached evaluations
+    estimator.parameters_version += 1
+    evaluator_x.evaluate(game_x)
+    assert estimator.num_inferred == 2
+
+
+def test_evaluate_batch_uses_cache():
+    game = Viergewinnt()
+    estimator = CountingEstimator(game.get_all_moves())
+    evaluator = Evaluator(estimator, Player.X, EvaluationCache(capacity=100))
+    states = []
+    for move in range(3):
+        state = game.clone()
+        state.play_move(player=Player.X, move=move)
+        states.append(state)
+
+    evaluator.evaluate(states[1])
+    evaluations = evaluator.evaluate_batch(states)
+    assert estimator.num_inferred == 3
+    assert [evaluation[1] for evaluation in evaluations] == [1, 1, 1]
+
+    evaluator.evaluate_batch(states)
+    assert estimator.num_inferred == 3
@@ -3,7 +3,10 @@ from collections import namedtuple
 import pytest
 
 from alpha_viergewinnt.game.board import Player
+from alpha_viergewinnt.game.tictactoe import Tictactoe
+from alpha_viergewinnt.game.viergewinnt import Viergewinnt
 from alpha_viergewinnt.agent.alpha.evaluator import *
+from alpha_viergewinnt.agent.alpha.evaluation_cache import EvaluationCache
 
 
 class DummyState(object):
@@ -41,6 +44,10 @@ class DummyEstimator(object):
         state_value = 0.5
         return uniform_prior_distribution, state_value
 
+    def infer_batch(self, state_array_batch):
+        prior_distributions, state_values = zip(*[self.infer(state_array) for state_array in state_array_batch])
+        return np.stack(prior_distributions), np.array(state_values)
+
     def train(self, state_array, target_distribution, target_state_value):
         knowledge_entry = DummyEstimator.KnowledgeEntry(state_array, target_distribution, target_state_value)
         self.knowledge.append(knowledge_entry)
@@ -100,6 +107,21 @@ def test_evaluate_not_win_loss_draw(state, actions, evaluator):
     assert game_finished is False
 
 
+def test_evaluate_batch(actions, evaluator):
+    states = [DummyState() for _ in range(3)]
+    states[1].winner = Player.O
+
+    evaluations = evaluator.evaluate_batch(states)
+
+    assert len(evaluations) == 3
+    for index, (prior_distribution, state_value, game_finished) in enumerate(evaluations):
+        expected_prior_distribution, expected_state_value, expected_game_finished = evaluator.evaluate(states[index])
+        assert prior_distribution.tolist() == expected_prior_distribution.tolist()
+        assert state_value == expected_state_value
+        assert game_finished is expected_game_finished
+    assert evaluations[1][1] == evaluator.STATE_VALUE_LOSS
+
+
 def test_train_when_finished(state, actions, evaluator):
     state.winner = Player.X
     search_distribution = np.array([0.1, 0.2, 0.7])
@@ -120,3 +142,80 @@ def test_train_when_finished(state, actions, evaluator):
 def test_train_when_not_finished(state, actions, evaluator):
     with pytest.raises(GameNotFinishedException):
         evaluator.train(states_and_search_distributions=[], final_state=state)
+
+
+class LinearEstimator(object):
+    """Estimator without any symmetry: a random linear function of the state array."""
+
+    def __init__(self, game):
+        self.actions = game.get_all_moves()
+        self.parameters_version = 0
+        random_state = np.random.RandomState(0)
+        num_fields = np.prod(game.board_size)
+        self.prior_weights = random_state.normal(size=(num_fields, len(self.actions)))
+        self.value_weights = random_state.normal(size=num_fields)
+
+    def infer(self, state_array):
+        prior_distribution_batch, state_value_batch = self.infer_batch(state_array[np.newaxis])
+        return prior_distribution_batch[0], state_value_batch[0]
+
+    def infer_batch(self, state_array_batch):
+        inputs = np.reshape(state_array_batch, (len(state_array_batch), -1))
+        likelihoods = np.exp(inputs @ self.prior_weights)
+        return likelihoods / np.sum(likelihoods, axis=1, keepdims=True), np.tanh(inputs @ self.value_weights)
+
+
+def create_symmetric_games(create_game, moves):
+    game = create_game()
+    for move in moves:
+        game.play_move(player=game.active_player, move=move)
+
+    symmetric_games = []
+    for symmetry in game.get_symmetries():
+        symmetric_game = create_game()
+        for move in moves:
+            symmetric_game.play_move(player=symmetric_game.active_player, move=symmetry.transform_move(move))
+        symmetric_games.append((symmetry, symmetric_game))
+    return game, symmetric_games
+
+
+@pytest.mark.parametrize("symmetric_inference", list(SymmetricInference))
+@pytest.mark.parametrize("create_game,moves", [(Tictactoe, [0, 4, 5]), (Viergewinnt, [0, 1, 1, 3])])
+def test_symmetric_inference(symmetric_inference, create_game, moves):
+    game, symmetric_games = create_symmetric_games(create_game, moves)
+    estimator = LinearEstimator(game)
+    evaluation_cache = EvaluationCache(capacity=100)
+    evaluator = Evaluator(estimator, Player.X, evaluation_cache, symmetric_inference=symmetric_inference)
+
+    prior_distribution, state_value, _ = evaluator.evaluate(game)
+    assert sum(prior_distribution) == pytest.approx(1)
+    for symmetry, symmetric_game in symmetric_games:
+        symmetric_prior_distribution, symmetric_state_value, _ = evaluator.evaluate(symmetric_game)
+        expected_prior_distribution = symmetry.transform_distribution(prior_distribution)
+        assert symmetric_prior_distribution == pytest.approx(expected_prior_distribution)
+        assert symmetric_state_value == pytest.approx(state_value)
+
+    [(batch_prior_distribution, batch_state_value, _)] = evaluator.evaluate_batch([game])
+    assert batch_prior_distribution == pytest.approx(prior_distribution)
+    assert batch_state_value == pytest.approx(state_value)
+
+    if symmetric_inference == SymmetricInference.CANONICAL:
+        # all symmetric games share a single cache entry
+        assert len(evaluation_cache) == 1
+
+
+def test_augment_symmetries():
+    game, symmetric_games = create_symmetric_games(Tictactoe, [0, 4, 5, 2, 1, 6])
+    assert game.is_winner(Player.O)
+    evaluator = Evaluator(DummyEstimator(game.get_all_moves()), Player.X, augment_symmetries=True)
+    search_distribution = np.arange(9) / 36
+
+    training_batch = evaluator.get_training_batch([(game, search_distribution)], final_state=game)
+
+    assert len(training_batch.state_array) == len(symmetric_games)
+    for index, (symmetry, symmetric_game) in enumerate(symmetric_games):
+        expected_state_array = evaluator._get_array_from_state(symmetric_game)
+        assert training_batch.state_array[index].tolist() == expected_state_array.tolist()
+        expected_distribution = symmetry.transform_distribution(search_distribution)
+        assert training_batch.target_distribution[index].tolist() == expected_distribution.tolist()
+        assert training_batch.target_state_value[index] == evaluator.STATE_VALUE_LOSS
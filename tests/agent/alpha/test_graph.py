@@ -2,6 +2,7 @@ import pytest
 
 import matplotlib
 
+from alpha_viergewinnt.agent.alpha.attributes import Attributes
 from alpha_viergewinnt.agent.alpha.graph import *
 
 
@@ -72,6 +73,30 @@ def test_reset_root(graph):
     assert graph.get_attributes(4) is not None
 
 
+def test_prune(graph):
+    graph.add_successor(1, source=0, action=10)
+    graph.add_successor(5, source=0, action=50)
+    graph.add_successor(3, source=1, action=30)
+    graph.add_successor(4, source=5, action=40)
+    root_attributes = Attributes(state_value=0, prior_distribution=np.zeros(60))
+    root_attributes.visit_count[10] = 1
+    root_attributes.visit_count[50] = 4
+    graph.set_attributes(root_attributes, state=0)
+    node_5_attributes = Attributes(state_value=0, prior_distribution=np.zeros(60))
+    node_5_attributes.visit_count[40] = 3
+    graph.set_attributes(node_5_attributes, state=5)
+    assert graph.get_num_nodes() == 5
+
+    graph.prune(3)
+
+    assert set(graph.states) == {0, 5, 4}
+    assert graph.get_actions(source=0) == [50]
+    # the statistics of dropped successors are kept
+    assert graph.get_attributes(0).visit_count[10] == 1
+    assert not graph.has_successor(0, 10)
+    assert graph.has_successor(0, 50)
+
+
 def test_get_mean_node_depth(graph):
     # root at depth 0
     graph.add_successor(1, source=0, action=10)  # depth 1
@@ -118,3 +143,18 @@ def test_hash_equality_is_identity(graph_with_hashable_root):
 
     assert len(graph.states) == 4
     assert graph.get_predecessors(state=HashableState(3)) == {HashableState(1), HashableState(2)}
+
+
+def test_transposition_keeps_attributes(graph):
+    graph.add_successor(1, source=0, action=10)
+    graph.add_successor(2, source=0, action=20)
+    graph.add_successor(3, source=1, action=20)
+    graph.set_attributes(300, state=3)
+
+    # same state reached by another path
+    graph.add_successor(3, source=2, action=10)
+
+    assert graph.get_successor(source=2, action=10) == 3
+    assert graph.get_attributes(3) == 300
+    assert graph.get_predecessors(3) == {1, 2}
+    assert graph.get_mean_node_depth() == pytest.approx((0 + 1 + 1 + 2) / 4)
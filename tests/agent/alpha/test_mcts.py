@@ -11,6 +11,9 @@ class MaxFirstEvaluator:
         game_finished = False
         return max_first_prior_distribution, dummy_state_value, game_finished
 
+    def evaluate_batch(self, states):
+        return [self.evaluate(state) for state in states]
+
 
 @pytest.fixture
 def max_first_evaluator():
@@ -29,6 +32,9 @@ class DummyState(object):
     def __eq__(self, other):
         return self.played_moves == other.played_moves
 
+    def get_all_moves(self):
+        return [0, 1, 2]
+
     def get_possible_moves(self):
         if self.step <= 3:
             return [0, 1, 2]
@@ -39,6 +45,12 @@ class DummyState(object):
         self.step += 1
         self.played_moves.append(move)
 
+    def clone(self):
+        clone = DummyState()
+        clone.step = self.step
+        clone.played_moves = list(self.played_moves)
+        return clone
+
 
 @pytest.fixture
 def dummy_state_mcts(max_first_evaluator):
@@ -53,15 +65,12 @@ def test_expand(dummy_state_mcts):
     root, graph, mcts = dummy_state_mcts
 
     mcts._expand(root)
-    actions = graph.get_actions(root)
     attributes = graph.get_attributes(root)
-    assert len(actions) == 3
-    assert set(actions) == {0, 1, 2}
+    # successors are only added when selected
+    assert graph.get_actions(root) == []
+    assert all(attributes.legal_action_mask)
     assert all(attributes.action_value == 0)
     assert all(attributes.visit_count == 0)
-    assert all([graph.get_successor(root, action).step == 1 for action in actions])
-    assert all([len(graph.get_successor(root, action).played_moves) == 1 for action in actions])
-    assert all([action == graph.get_successor(root, action).played_moves[0] for action in actions])
     assert attributes.prior_distribution[0] == 1
     assert all(attributes.prior_distribution[1:] == 0)
     assert attributes.state_value == 1
@@ -71,20 +80,35 @@ def test_select_path(dummy_state_mcts):
     root, graph, mcts = dummy_state_mcts
 
     mcts._expand(root)
-    path = mcts._select_path(root)
+    leaf, path = mcts._select_path(root)
+    assert len(path) == 1
+    assert leaf.step == 1
+    assert path == [(root, 0)]
+
+    mcts._expand(leaf)
+    leaf, path = mcts._select_path(root)
     assert len(path) == 2
-    assert path.leaf.step == 1
-    assert path.get_predecessor(path.leaf) == root
-    assert path.get_action(root) == 0
-
-    mcts._expand(path.leaf)
-    path = mcts._select_path(root)
-    assert len(path) == 3
-    assert path.leaf.step == 2
-    predecessor = path.get_predecessor(path.leaf)
+    assert leaf.step == 2
+    predecessor, action = path[1]
     assert predecessor.step == 1
-    assert path.get_action(predecessor) == 0
-    assert path.get_predecessor(predecessor) == root
+    assert action == 0
+    assert path[0] == (root, 0)
+
+
+def test_successors_added_on_selection(dummy_state_mcts):
+    root, graph, mcts = dummy_state_mcts
+
+    mcts._expand(root)
+    leaf, _ = mcts._select_path(root)
+    assert graph.get_actions(root) == [0]
+    assert graph.get_successor(root, 0) is leaf
+    assert leaf.played_moves == [0]
+    # the selected state is not changed
+    assert root.played_moves == []
+
+    # the existing successor is selected again
+    assert mcts._select_path(root)[0] is leaf
+    assert graph.get_num_nodes() == 2
 
 
 @pytest.fixture
@@ -100,14 +124,30 @@ def test_select_action(simple_state_mcts):
     graph.add_successor("r.0", source="r", action=0)
     graph.add_successor("r.1", source="r", action=1)
     graph.add_successor("r.3", source="r", action=3)
-    attributes = Attributes(state_value=None, prior_distribution=np.array([1, 1, 1, 0.1]))
-    attributes.action_value = np.array([0.1, 0.1, 0.2, 0])
+    attributes = Attributes(
+        state_value=None,
+        prior_distribution=np.array([1, 1, 1, 0.1]),
+        legal_action_mask=np.array([True, True, False, True]),
+    )
     attributes.visit_count = np.array([10, 1, 0, 0])
+    attributes.action_value_sum = np.array([0.1, 0.1, 0.2, 0]) * np.maximum(attributes.visit_count, 1)
     graph.set_attributes(attributes, state="r")
 
     assert mcts._select_action(state="r") == 1
 
 
+def test_root_noise_sampled_once(simple_state_mcts):
+    graph, mcts = simple_state_mcts
+
+    attributes = Attributes(state_value=None, prior_distribution=np.array([0.5, 0.5]))
+    graph.set_attributes(attributes, state="r")
+
+    root_prior_distribution = mcts._get_root_prior_distribution("r", attributes)
+    assert root_prior_distribution.tolist() != attributes.prior_distribution.tolist()
+    assert np.sum(root_prior_distribution) == pytest.approx(1)
+    assert mcts._get_root_prior_distribution("r", attributes) is root_prior_distribution
+
+
 def test_backup(simple_state_mcts):
     graph, mcts = simple_state_mcts
 
@@ -124,28 +164,26 @@ def test_backup(simple_state_mcts):
     graph.add_successor("r.0", source="r", action=0)
     graph.set_attributes(common_node_attributes, state="r.0")
     root_node_attributes.visit_count[0] = 2
-    root_node_attributes.action_value[0] = (common_node_state_value + expanded_node_state_value) / 2
+    root_node_attributes.action_value_sum[0] = common_node_state_value + expanded_node_state_value
 
     # add expanded leaf node
     expanded_node_attributes = Attributes(state_value=expanded_node_state_value, prior_distribution=[None, None])
     graph.add_successor("r.0.0", source="r.0", action=0)
     graph.set_attributes(expanded_node_attributes, state="r.0.0")
     common_node_attributes.visit_count[0] = 1
-    common_node_attributes.action_value[0] = expanded_node_state_value
+    common_node_attributes.action_value_sum[0] = expanded_node_state_value
 
     # add unvisited leaf node
     graph.add_successor("r.0.1", source="r.0", action=1)
 
     # simulate selection of unvisited leaf node
-    path = graph.create_path(root="r")
-    path.add_successor("r.0", action=0)
-    path.add_successor("r.0.1", action=1)
+    path = [("r", 0), ("r.0", 1)]
 
     # simulate expansion of selected leaf node
     selected_node_attributes = Attributes(state_value=selected_node_state_value, prior_distribution=[None, None])
     graph.set_attributes(selected_node_attributes, state="r.0.1")
 
-    mcts._backup(path)
+    mcts._backup("r.0.1", path)
 
     # expect the attributes of an action which was not selected to be unmodified
     assert graph.get_attributes(state="r.0").action_value[0] == pytest.approx(expanded_node_state_value)
@@ -163,6 +201,41 @@ def test_backup(simple_state_mcts):
     assert graph.get_attributes(state="r").visit_count[0] == 3
 
 
+def test_virtual_loss(simple_state_mcts):
+    graph, mcts = simple_state_mcts
+
+    graph.add_successor("r.0", source="r", action=0)
+    attributes = Attributes(state_value=0.0, prior_distribution=np.array([1.0, 0.0]))
+    attributes.action_value_sum = np.array([1.0, 0.0])
+    attributes.visit_count = np.array([2.0, 0.0])
+    graph.set_attributes(attributes, state="r")
+    path = [("r", 0)]
+
+    mcts._update_path(path, mcts.VIRTUAL_LOSS)
+    assert attributes.visit_count[0] == 3
+    assert attributes.action_value[0] == pytest.approx((2 * 0.5 + mcts.VIRTUAL_LOSS) / 3)
+
+    mcts._update_path(path, -mcts.VIRTUAL_LOSS, visit_count_update=-1)
+    assert attributes.visit_count[0] == 2
+    assert attributes.action_value[0] == pytest.approx(0.5)
+
+
+def test_simulate_batch(dummy_state_mcts):
+    root, graph, mcts = dummy_state_mcts
+
+    # the root is the only leaf, so all but one selection collide
+    assert mcts.simulate_batch(source=root, batch_size=3) == 1
+    assert graph.get_attributes(state=root).visit_count.tolist() == [0, 0, 0]
+
+    # with uniform priors, the virtual loss on the first selected action makes the following selections diverge
+    graph.get_attributes(state=root).prior_distribution = np.ones(3) / 3
+    assert mcts.simulate_batch(source=root, batch_size=3) == 3
+    assert graph.get_attributes(state=root).visit_count.tolist() == [1, 1, 1]
+    assert graph.get_attributes(state=root).action_value.tolist() == [1, 1, 1]
+    for action in range(3):
+        assert graph.get_attributes(state=graph.get_successor(root, action)).state_value == 1
+
+
 def test_simulate_step(dummy_state_mcts):
     root, graph, mcts = dummy_state_mcts
 
@@ -0,0 +1,74 @@
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+from alpha_viergewinnt.game.viergewinnt import Viergewinnt
+from alpha_viergewinnt.agent.alpha.mlp_estimator import MlpEstimator
+from alpha_viergewinnt.agent.alpha.numpy_estimator import load_numpy_estimator
+
+
+@pytest.fixture
+def mlp_estimator():
+    game = Viergewinnt()
+    return MlpEstimator(board_size=game.board_size, actions=game.get_all_moves())
+
+
+@pytest.fixture
+def state_array_batch():
+    random_state = np.random.RandomState(0)
+    return random_state.randint(-1, 2, size=(5,) + Viergewinnt().state.shape).astype(np.int8)
+
+
+def test_numpy_estimator_equals_mlp_estimator(mlp_estimator, state_array_batch):
+    numpy_estimator = mlp_estimator.to_numpy_estimator()
+
+    prior_distribution_batch, state_value_batch = numpy_estimator.infer_batch(state_array_batch)
+    expected_prior_distribution_batch, expected_state_value_batch = mlp_estimator.infer_batch(state_array_batch)
+    assert prior_distribution_batch == pytest.approx(expected_prior_distribution_batch, abs=1e-5)
+    assert state_value_batch == pytest.approx(expected_state_value_batch, abs=1e-5)
+
+    prior_distribution, state_value = numpy_estimator.infer(state_array_batch[0])
+    expected_prior_distribution, expected_state_value = mlp_estimator.infer(state_array_batch[0])
+    assert prior_distribution == pytest.approx(expected_prior_distribution, abs=1e-5)
+    assert state_value == pytest.approx(expected_state_value, abs=1e-5)
+    assert isinstance(state_value, float)
+
+
+def test_parameters_are_frozen(mlp_estimator, state_array_batch):
+    numpy_estimator = mlp_estimator.to_numpy_estimator()
+    prior_distribution_batch, _ = numpy_estimator.infer_batch(state_array_batch)
+
+    target_distribution = np.ones((5, len(mlp_estimator.actions))) / len(mlp_estimator.actions)
+    mlp_estimator.train(state_array_batch, target_distribution, np.ones(5))
+    assert numpy_estimator.infer_batch(state_array_batch)[0] == pytest.approx(prior_distribution_batch)
+    # inference only
+    assert not hasattr(numpy_estimator, "train")
+
+
+def test_export_and_load(mlp_estimator, state_array_batch, tmp_path):
+    filename = str(tmp_path / "estimator.npz")
+    mlp_estimator.export(filename)
+    numpy_estimator = load_numpy_estimator(filename)
+
+    assert numpy_estimator.actions == mlp_estimator.actions
+    expected_prior_distribution_batch, expected_state_value_batch = mlp_estimator.infer_batch(state_array_batch)
+    prior_distribution_batch, state_value_batch = numpy_estimator.infer_batch(state_array_batch)
+    assert prior_distribution_batch == pytest.approx(expected_prior_distribution_batch, abs=1e-5)
+    assert state_value_batch == pytest.approx(expected_state_value_batch, abs=1e-5)
+
+
+def test_load_without_torch(mlp_estimator, tmp_path):
+    filename = str(tmp_path / "estimator.npz")
+    mlp_estimator.export(filename)
+    script = (
+        "import sys\n"
+        "import numpy as np\n"
+        "from alpha_viergewinnt.agent.alpha import *\n"
+        "from alpha_viergewinnt.agent.alpha.factory import create_alpha_agent\n"
+        "from alpha_viergewinnt.agent.alpha.numpy_estimator import load_numpy_estimator\n"
+        "load_numpy_estimator(%r).infer(np.zeros((6, 7)))\n"
+        "assert 'torch' not in sys.modules\n" % filename
+    )
+    subprocess.run([sys.executable, "-c", script], check=True)
@@ -0,0 +1,50 @@
+import numpy as np
+
+from alpha_viergewinnt.agent.alpha.evaluator import TrainingBatch
+from alpha_viergewinnt.agent.alpha.replay_buffer import ReplayBuffer
+
+
+def create_training_batch(first_value, num_samples):
+    values = np.arange(first_value, first_value + num_samples)
+    state_array = np.stack([np.full((2, 3), value % 2) for value in values])
+    target_distribution = np.stack([np.full(3, value) for value in values])
+    return TrainingBatch(state_array, target_distribution, values)
+
+
+def test_add_and_wrap_around():
+    replay_buffer = ReplayBuffer(capacity=5, state_shape=(2, 3), num_actions=3)
+    replay_buffer.add(create_training_batch(0, 3))
+    assert len(replay_buffer) == 3
+
+    replay_buffer.add(create_training_batch(3, 4))
+    assert len(replay_buffer) == 5
+    assert replay_buffer.num_added == 7
+    # oldest samples 0 and 1 are overwritten
+    assert sorted(replay_buffer.target_state_value.tolist()) == [2, 3, 4, 5, 6]
+    for state_array, target_distribution, value in zip(*replay_buffer.get_batch(np.arange(5))):
+        assert np.all(target_distribution == value)
+        assert np.all(state_array == value % 2)
+
+
+def test_add_more_than_capacity():
+    replay_buffer = ReplayBuffer(capacity=3, state_shape=(2, 3), num_actions=3)
+    replay_buffer.add(create_training_batch(0, 5))
+    assert sorted(replay_buffer.target_state_value.tolist()) == [2, 3, 4]
+
+
+def test_sample_minibatches():
+    replay_buffer = ReplayBuffer(capacity=10, state_shape=(2, 3), num_actions=3, random_seed=0)
+    replay_buffer.add(create_training_batch(0, 6))
+    minibatches = list(replay_buffer.sample_minibatches(num_steps=4, minibatch_size=3))
+    assert len(minibatches) == 4
+    for minibatch in minibatches:
+        assert len(minibatch.state_array) == 3
+    # every pass over the shuffled buffer uses every sample once
+    for first, second in [(0, 1), (2, 3)]:
+        values = np.concatenate([minibatches[first].target_state_value, minibatches[second].target_state_value])
+        assert sorted(values.tolist()) == list(range(6))
+
+
+def test_get_num_steps():
+    assert ReplayBuffer.get_num_steps(num_new_samples=100, minibatch_size=32, sample_reuse=4) == 13
+    assert ReplayBuffer.get_num_steps(num_new_samples=0, minibatch_size=32, sample_reuse=4) == 0
@@ -0,0 +1,128 @@
+import numpy as np
+import pytest
+
+from alpha_viergewinnt.agent.alpha.evaluator import Evaluator, TrainingBatch
+from alpha_viergewinnt.agent.alpha.self_play_dataset import SelfPlayDataset, SelfPlayDatasetWriter
+from alpha_viergewinnt.game.symmetry import get_mirror_symmetries
+
+STATE_SHAPE = (2, 3)
+NUM_ACTIONS = 3
+
+
+def create_training_batch(num_samples, outcome, random_state):
+    state_array = random_state.randint(-1, 2, size=(num_samples,) + STATE_SHAPE).astype(np.int8)
+    target_distribution = random_state.dirichlet(np.ones(NUM_ACTIONS), size=num_samples)
+    target_state_value = np.full(num_samples, outcome, dtype=np.float32)
+    return TrainingBatch(state_array, target_distribution, target_state_value)
+
+
+def write_games(filename, training_batches, chunk_size=4):
+    with SelfPlayDatasetWriter(filename, STATE_SHAPE, NUM_ACTIONS, chunk_size=chunk_size) as writer:
+        for training_batch in training_batches:
+            writer.add(training_batch)
+
+
+def test_round_trip(tmp_path):
+    filename = str(tmp_path / "dataset.bin")
+    random_state = np.random.RandomState(0)
+    training_batches = [create_training_batch(n, outcome, random_state) for n, outcome in ((3, 1), (5, -1), (2, 0))]
+    write_games(filename, training_batches)
+
+    dataset = SelfPlayDataset(filename)
+    assert len(dataset) == 10
+    assert dataset.num_games == 3
+    # written in several chunks
+    assert len(dataset.chunks) > 1
+
+    batch = dataset.get_batch(np.arange(10))
+    assert np.array_equal(batch.state_array, np.concatenate([b.state_array for b in training_batches]))
+    assert np.array_equal(batch.target_state_value, np.concatenate([b.target_state_value for b in training_batches]))
+    assert np.allclose(
+        batch.target_distribution, np.concatenate([b.target_distribution for b in training_batches]), atol=1e-3
+    )
+
+    game_index, move_index = dataset.get_game_and_move_indices(np.arange(10))
+    assert game_index.tolist() == [0, 0, 0, 1, 1, 1, 1, 1, 2, 2]
+    assert move_index.tolist() == [0, 1, 2, 0, 1, 2, 3, 4, 0, 1]
+
+
+def test_get_batch_across_chunks_in_any_order(tmp_path):
+    filename = str(tmp_path / "dataset.bin")
+    random_state = np.random.RandomState(0)
+    training_batches = [create_training_batch(3, 1, random_state) for _ in range(4)]
+    write_games(filename, training_batches, chunk_size=3)
+
+    dataset = SelfPlayDataset(filename)
+    assert len(dataset.chunks) == 4
+    all_states = np.concatenate([b.state_array for b in training_batches])
+    indices = np.array([11, 0, 5, 5, 7])
+    assert np.array_equal(dataset.get_batch(indices).state_array, all_states[indices])
+
+
+def test_compact_memory_mapped_arrays(tmp_path):
+    filename = str(tmp_path / "dataset.bin")
+    write_games(filename, [create_training_batch(8, 1, np.random.RandomState(0))], chunk_size=8)
+
+    dataset = SelfPlayDataset(filename)
+    chunk = dataset.chunks[0]
+    # views of the mapped file, not copies
+    assert np.shares_memory(chunk["state_array"], dataset.data)
+    assert chunk["state_array"].dtype == np.int8
+    assert chunk["target_distribution"].dtype == np.float16
+    assert chunk["target_state_value"].dtype == np.int8
+
+
+def test_append_continues_game_indices(tmp_path):
+    filename = str(tmp_path / "dataset.bin")
+    random_state = np.random.RandomState(0)
+    write_games(filename, [create_training_batch(2, 1, random_state)])
+    write_games(filename, [create_training_batch(3, -1, random_state)])
+
+    dataset = SelfPlayDataset(filename)
+    assert len(dataset) == 5
+    game_index, _ = dataset.get_game_and_move_indices(np.arange(5))
+    assert game_index.tolist() == [0, 0, 1, 1, 1]
+    assert dataset.get_batch([4]).target_state_value.tolist() == [-1]
+
+
+def test_append_with_other_shape_fails(tmp_path):
+    filename = str(tmp_path / "dataset.bin")
+    write_games(filename, [create_training_batch(2, 1, np.random.RandomState(0))])
+    with pytest.raises(ValueError):
+        SelfPlayDatasetWriter(filename, (3, 3), NUM_ACTIONS)
+
+
+def test_truncated_chunk_is_ignored(tmp_path):
+    filename = str(tmp_path / "dataset.bin")
+    random_state = np.random.RandomState(0)
+    write_games(filename, [create_training_batch(4, 1, random_state), create_training_batch(4, 1, random_state)])
+    with open(filename, "rb") as file:
+        data = file.read()
+    with open(filename, "wb") as file:
+        file.write(data[:-5])
+
+    assert len(SelfPlayDataset(filename)) == 4
+
+
+def test_augmented_batches_are_written_once(tmp_path):
+    filename = str(tmp_path / "dataset.bin")
+    random_state = np.random.RandomState(0)
+    training_batch = create_training_batch(3, 1, random_state)
+    symmetries = get_mirror_symmetries(STATE_SHAPE)
+    augmented_batch = Evaluator.augment_training_batch(training_batch, symmetries)
+    with SelfPlayDatasetWriter(filename, STATE_SHAPE, NUM_ACTIONS, num_symmetries=len(symmetries)) as writer:
+        writer.add(augmented_batch)
+        writer.add(augmented_batch)
+
+    dataset = SelfPlayDataset(filename)
+    assert len(dataset) == 6
+    game_index, move_index = dataset.get_game_and_move_indices(np.arange(6))
+    assert game_index.tolist() == [0, 0, 0, 1, 1, 1]
+    assert move_index.tolist() == [0, 1, 2, 0, 1, 2]
+    batch = dataset.get_batch(np.arange(3))
+    assert np.array_equal(batch.state_array, training_batch.state_array)
+
+    # augmenting the read samples again gives the samples which were trained on
+    read_batch = Evaluator.augment_training_batch(batch, symmetries)
+    assert np.array_equal(read_batch.state_array, augmented_batch.state_array)
+    assert np.allclose(read_batch.target_distribution, augmented_batch.target_distribution, atol=1e-3)
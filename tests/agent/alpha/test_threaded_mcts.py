@@ -0,0 +1,47 @@
+import time
+
+import pytest
+import numpy as np
+
+from alpha_viergewinnt.agent.alpha.graph import GameStateGraph
+from alpha_viergewinnt.agent.alpha.array_graph import ArrayGameStateGraph
+from alpha_viergewinnt.agent.alpha.threaded_mcts import ThreadedMcts
+
+from .test_mcts import DummyState, MaxFirstEvaluator
+
+
+class SlowEvaluator(MaxFirstEvaluator):
+    """Sleeps during evaluation (releasing the GIL like the estimator), so the threads overlap."""
+
+    def evaluate(self, state):
+        time.sleep(0.001)
+        return super().evaluate(state)
+
+
+class FailingEvaluator(MaxFirstEvaluator):
+    def evaluate(self, state):
+        raise RuntimeError("evaluation failed")
+
+
+@pytest.mark.parametrize("array_tree", [False, True], ids=["graph", "array_graph"])
+@pytest.mark.parametrize("num_threads", [1, 4])
+def test_simulate(array_tree, num_threads):
+    root = DummyState()
+    graph = ArrayGameStateGraph(root, num_actions=3) if array_tree else GameStateGraph(root)
+    mcts = ThreadedMcts(graph, SlowEvaluator(), num_threads=num_threads)
+    assert mcts.simulate(graph.root, lambda num_steps: num_steps >= 40) == 40
+
+    attributes = graph.get_attributes(graph.root)
+    # the root is expanded by the first step, every other step is backed up through the root
+    assert np.sum(attributes.visit_count) == 39
+    # all virtual losses are reverted, only the leaf values (all 1) are backed up
+    assert np.all(attributes.action_value_sum == attributes.visit_count)
+    assert not mcts.pending_leaves
+    assert np.isclose(np.sum(mcts.get_search_distribution(graph.root, exploration_factor=1.0)), 1)
+
+
+def test_simulate_raises_evaluation_error():
+    root = DummyState()
+    mcts = ThreadedMcts(GameStateGraph(root), FailingEvaluator(), num_threads=4)
+    with pytest.raises(RuntimeError):
+        mcts.simulate(root, lambda num_steps: num_steps >= 10)
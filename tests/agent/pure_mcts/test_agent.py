@@ -0,0 +1,36 @@
+import pytest
+
+from alpha_viergewinnt.game import tictactoe
+from alpha_viergewinnt.game.board import Player
+from alpha_viergewinnt.agent.pure_mcts.factory import create_pure_mcts_agent
+
+
+@pytest.mark.parametrize("array_tree", [False, True], ids=["tree", "array_tree"])
+def test_reuse_subtree(array_tree):
+    game = tictactoe.Tictactoe()
+    agent = create_pure_mcts_agent(Player.X, mcts_steps=50, mcts_rollouts=2, random_seed=0, array_tree=array_tree)
+    move = agent.get_next_move(game)
+    tree = agent._last_tree
+    assert tree.get_state(tree.root) is not game
+
+    successor = tree.get_successor(tree.root, move)
+    reply = sorted(tree.get_transitions(successor))[0]
+    num_reused_simulations = tree.get_visit_count(tree.get_successor(successor, reply))
+    assert num_reused_simulations > 0
+
+    game.play_move(player=Player.X, move=move)
+    game.play_move(player=Player.O, move=reply)
+    agent.get_next_move(game)
+
+    assert agent._last_tree.get_state(agent._last_tree.root) == game
+    assert agent.num_reused_simulations == num_reused_simulations
+    assert agent.get_reused_simulations_fraction() == num_reused_simulations / (num_reused_simulations + 2 * 50)
+
+
+def test_batch_rollouts_select_winning_move():
+    game = tictactoe.Tictactoe()
+    # X wins with field 8
+    for move in [0, 1, 4, 2]:
+        game.play_move(player=game.active_player, move=move)
+    agent = create_pure_mcts_agent(Player.X, mcts_steps=100, mcts_rollouts=30, random_seed=0, batch_rollouts=True)
+    assert agent.get_next_move(game) == 8
@@ -0,0 +1,58 @@
+import pytest
+
+from alpha_viergewinnt.agent.pure_mcts.array_tree import *
+
+
+@pytest.fixture
+def tree():
+    return ArrayTree("r", num_transitions=6, capacity=2)
+
+
+def test_successor_and_path_to_root(tree):
+    node_1 = tree.add_successor(source=tree.root, transition=1, successor="r.1")
+    node_5 = tree.add_successor(source=tree.root, transition=5, successor="r.5")
+    node_1_2 = tree.add_successor(source=node_1, transition=2, successor="r.1.2")
+
+    assert tree.get_transitions(source=tree.root) == {1, 5}
+    assert tree.get_successor(source=tree.root, transition=1) == node_1
+    assert tree.get_successor(source=tree.root, transition=5) == node_5
+    assert tree.get_transitions(source=node_1) == {2}
+    assert tree.get_state(tree.get_successor(source=node_1, transition=2)) == "r.1.2"
+    assert set(tree.get_path_to_root(source=node_1_2)) == {tree.root, node_1, node_1_2}
+
+    with pytest.raises(TransitionAlreadyExistsException):
+        tree.add_successor(source=tree.root, transition=1, successor="r.1")
+
+
+def test_visits_and_max_weight(tree):
+    node_1 = tree.add_successor(source=tree.root, transition=1, successor="r.1")
+    node_1_2 = tree.add_successor(source=node_1, transition=2, successor="r.1.2")
+    tree.add_successor(source=node_1, transition=3, successor="r.1.3")
+
+    tree.add_visit(tree.get_path_to_root(node_1_2), delta_weight=1)
+    tree.add_visit(tree.get_path_to_root(node_1_2), delta_weight=-0.5)
+
+    assert tree.visit_counts[tree.root] == 2
+    assert tree.weights[node_1] == pytest.approx(0.5)
+    assert tree.get_transition_to_max_weight(node_1) == 2
+
+    converted_tree = tree.to_tree()
+    assert converted_tree.attributes["r.1.2"].visit_count == 2
+    assert converted_tree.get_transition_to_max_weight("r.1") == 2
+
+
+def test_reset_root(tree):
+    node_1 = tree.add_successor(source=tree.root, transition=1, successor="r.1")
+    tree.add_successor(source=tree.root, transition=5, successor="r.5")
+    node_1_2 = tree.add_successor(source=node_1, transition=2, successor="r.1.2")
+    tree.add_visit(tree.get_path_to_root(node_1_2), delta_weight=1)
+
+    tree.reset_root(node_1)
+
+    assert tree.num_nodes == 2
+    assert tree.get_state(tree.root) == "r.1"
+    assert tree.get_visit_count(tree.root) == 1
+    assert tree.get_transitions(source=tree.root) == {2}
+    new_node_1_2 = tree.get_successor(source=tree.root, transition=2)
+    assert tree.weights[new_node_1_2] == 1
+    assert set(tree.get_path_to_root(source=new_node_1_2)) == {tree.root, new_node_1_2}
@@ -0,0 +1,74 @@
+import random
+
+import numpy as np
+import pytest
+
+from alpha_viergewinnt.game.board import Player
+from alpha_viergewinnt.game.tictactoe import Tictactoe, BitboardTictactoe
+from alpha_viergewinnt.game.viergewinnt import Viergewinnt, BitboardViergewinnt
+from alpha_viergewinnt.agent.pure_mcts.agent import create_random_choice_strategy
+from alpha_viergewinnt.agent.pure_mcts.batch_simulator import BatchSimulator
+from alpha_viergewinnt.agent.pure_mcts.tree_search import Simulator
+
+GAME_FACTORIES = [Tictactoe, BitboardTictactoe, Viergewinnt, BitboardViergewinnt]
+GAME_FACTORIES_IDS = ["tictactoe", "bitboard_tictactoe", "viergewinnt", "bitboard_viergewinnt"]
+
+
+@pytest.fixture(params=GAME_FACTORIES, ids=GAME_FACTORIES_IDS)
+def create_game(request):
+    return request.param
+
+
+def create_position(create_game, moves):
+    game = create_game()
+    for move in moves:
+        game.play_move(player=game.active_player, move=move)
+    return game
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_check_wins_equivalent(create_game, seed):
+    random_generator = random.Random(seed)
+    game = create_game()
+    simulator = BatchSimulator(Player.X)
+    field_masks = simulator._get_field_masks(game.board_size)
+    direction_shifts = simulator._get_direction_shifts(game.board_size)
+    num_stones_in_row = game.win_conditions[Player.X].num_stones_in_row
+
+    while not (game.is_winner(Player.X) or game.is_winner(Player.O) or game.is_draw()):
+        player = game.active_player
+        game.play_move(player=player, move=random_generator.choice(game.get_possible_moves()))
+        bitboards = np.array([simulator._get_bitboard(game.state, player.value, field_masks)])
+        won = simulator._check_wins(bitboards, direction_shifts, num_stones_in_row)
+        assert won[0] == game.is_winner(player)
+
+
+def test_finished_states():
+    simulator = BatchSimulator(Player.X, random_seed=0)
+    # X wins with the first column
+    won_game = create_position(Tictactoe, [0, 1, 3, 2, 6])
+    assert simulator.get_mean_rollout_value(won_game, num_rollouts=10) == 1
+    assert BatchSimulator(Player.O).get_mean_rollout_value(won_game, num_rollouts=10) == -1
+
+
+def test_last_move_outcomes():
+    simulator = BatchSimulator(Player.X, random_seed=0)
+    # only field 8 is left and completes the diagonal of X
+    winning_game = create_position(Tictactoe, [0, 1, 4, 2, 5, 3, 7, 6])
+    assert simulator.get_mean_rollout_value(winning_game, num_rollouts=10) == 1
+    # only field 8 is left without a row for X
+    draw_game = create_position(Tictactoe, [0, 1, 2, 4, 3, 5, 7, 6])
+    assert simulator.get_mean_rollout_value(draw_game, num_rollouts=10) == 0
+
+
+@pytest.mark.parametrize("create_game,moves", [(BitboardTictactoe, [4]), (BitboardViergewinnt, [3, 3, 2, 4])])
+def test_mean_rollout_value_matches_simulator(create_game, moves):
+    num_rollouts = 3000
+    state = create_position(create_game, moves)
+
+    simulator = Simulator(strategy=create_random_choice_strategy(0), player=Player.O)
+    expected_value = np.mean([simulator.rollout_and_rewind(state) for _ in range(num_rollouts)])
+    batch_simulator = BatchSimulator(Player.O, random_seed=0)
+    value = batch_simulator.get_mean_rollout_value(state, num_rollouts)
+
+    assert value == pytest.approx(expected_value, abs=0.08)
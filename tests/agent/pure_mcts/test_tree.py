@@ -64,3 +64,19 @@ def test_hash_equality_is_identity():
         HashableState(2),
         HashableState(3),
     }
+
+
+def test_reset_root():
+    tree = Tree(0)
+    tree.add_successor(source=0, transition=1, successor=1)
+    tree.add_successor(source=0, transition=5, successor=5)
+    tree.add_successor(source=1, transition=2, successor=3)
+    tree.add_visit(tree.get_path_to_root(3), delta_weight=1)
+
+    tree.reset_root(1)
+
+    assert tree.root == 1
+    assert set(tree.edges()) == {(1, 3)}
+    assert set(tree.attributes) == {1, 3}
+    assert tree.get_visit_count(1) == 1
+    assert tree.get_path_to_root(source=3) == {1, 3}
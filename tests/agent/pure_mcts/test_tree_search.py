@@ -21,6 +21,15 @@ class DummyState(object):
     def play_move(self, *args, **kwargs):
         self.step += 1
 
+    def undo_move(self):
+        self.step -= 1
+
+    def clone(self):
+        clone = DummyState()
+        clone.step = self.step
+        clone.winner = self.winner
+        return clone
+
     def is_winner(self, player):
         return self.winner == player
 
@@ -85,6 +94,14 @@ def test_rollout_until_draw(simulator):
     assert simulator.get_rollout_value(final_state) == 0
 
 
+def test_rollout_and_rewind(simulator):
+    initial_state = DummyState()
+    initial_state.step = 1
+    rollout_value = simulator.rollout_and_rewind(initial_state)
+    assert rollout_value == 0
+    assert initial_state.step == 1
+
+
 def test_calculate_rollout_value(simulator):
     initial_state = DummyState()
     initial_state.winner = Player.X
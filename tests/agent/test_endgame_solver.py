@@ -0,0 +1,180 @@
+import random
+
+import pytest
+
+from alpha_viergewinnt.game.board import Player
+from alpha_viergewinnt.game.tictactoe import Tictactoe, BitboardTictactoe
+from alpha_viergewinnt.game.viergewinnt import Viergewinnt, BitboardViergewinnt
+from alpha_viergewinnt.agent.alpha.evaluator import Evaluator
+from alpha_viergewinnt.agent.alpha.factory import create_alpha_agent, create_generic_estimator
+from alpha_viergewinnt.agent.pure_mcts.factory import create_pure_mcts_agent
+from alpha_viergewinnt.agent.endgame_solver import (
+    EndgameSolver,
+    _Negamax,
+    EXACT,
+    LOWER_BOUND,
+    UPPER_BOUND,
+    SOLVED_DEPTH,
+    get_num_empty_fields,
+    create_endgame_solver,
+    VALUE_WIN,
+    VALUE_DRAW,
+    VALUE_LOSS,
+)
+
+
+def play(game, moves):
+    for move in moves:
+        game.play_move(game.active_player, move)
+    return game
+
+
+def minimax(state):
+    """Value for the player to move without pruning, for reference."""
+    player = state.active_player
+    best_value = VALUE_LOSS
+    for move in state.get_possible_moves():
+        state.play_move(player, move)
+        if state.is_winner(player):
+            value = VALUE_WIN
+        elif state.is_draw():
+            value = VALUE_DRAW
+        else:
+            value = -minimax(state)
+        state.undo_move()
+        best_value = max(best_value, value)
+    return best_value
+
+
+def create_random_endgame(create_game, num_moves, random_state):
+    """Play random moves, without finishing the game."""
+    while True:
+        game = create_game()
+        for _ in range(num_moves):
+            game.play_move(game.active_player, random_state.choice(game.get_possible_moves()))
+            if game.is_winner(game.idle_player) or game.is_draw():
+                break
+        else:
+            return game
+
+
+@pytest.mark.parametrize("create_game", [Tictactoe, BitboardTictactoe])
+def test_tictactoe_is_draw(create_game):
+    game = create_game()
+    value, move = EndgameSolver(max_empty_fields=9, max_nodes=10**5).solve(game)
+    assert value == VALUE_DRAW
+    assert move in game.get_possible_moves()
+    # the solved state is not changed
+    assert len(game.recorded_moves) == 0
+
+
+def test_win_and_loss():
+    # X to move wins with 2
+    game = play(Tictactoe(), [0, 3, 1, 4])
+    assert EndgameSolver(max_empty_fields=9).solve(game) == (VALUE_WIN, 2)
+
+    # O to move loses (X threatens 2 and 3)
+    game = play(Tictactoe(), [4, 1, 0, 8, 6])
+    value, _ = EndgameSolver(max_empty_fields=9).solve(game)
+    assert value == VALUE_LOSS
+
+
+@pytest.mark.parametrize("create_game", [Viergewinnt, BitboardViergewinnt])
+def test_viergewinnt_endgames_match_minimax(create_game):
+    random_state = random.Random(0)
+    solver = EndgameSolver(max_empty_fields=8, max_nodes=10**6)
+    for _ in range(10):
+        game = create_random_endgame(create_game, 34, random_state)
+        assert get_num_empty_fields(game) == 8
+        value, move = solver.solve(game)
+        assert value == minimax(game)
+        # the best move keeps the value
+        player = game.active_player
+        game.play_move(player, move)
+        move_value = VALUE_WIN if game.is_winner(player) else VALUE_DRAW if game.is_draw() else -minimax(game)
+        assert move_value == value
+
+
+def test_node_limit():
+    assert EndgameSolver(max_empty_fields=9, max_nodes=10).solve(Tictactoe()) == (None, None)
+
+
+def test_aborted_positions_are_not_searched_again():
+    game = Viergewinnt()
+    solver = EndgameSolver(max_empty_fields=42, max_nodes=200, max_leaf_nodes=20)
+    estimator = create_generic_estimator(game)
+    evaluator = Evaluator(estimator, Player.X, endgame_solver=solver)
+    evaluator.evaluate(game)
+    num_nodes = solver.num_nodes
+    assert 0 < num_nodes <= 21
+    for _ in range(10):
+        evaluator.evaluate(game)
+        evaluator.evaluate_batch([game, game])
+    assert solver.num_nodes == num_nodes
+
+    # the root solve has a larger budget and searches again, but only once
+    assert solver.solve(game) == (None, None)
+    assert num_nodes + 200 <= solver.num_nodes <= num_nodes + 201
+    num_nodes = solver.num_nodes
+    assert solver.solve(game) == (None, None)
+    assert solver.num_nodes == num_nodes
+
+
+@pytest.mark.parametrize(
+    "depth, bound, value, alpha, beta, solved",
+    [
+        (1, EXACT, VALUE_DRAW, VALUE_LOSS, VALUE_WIN, False),
+        (SOLVED_DEPTH, EXACT, VALUE_DRAW, VALUE_LOSS, VALUE_WIN, True),
+        (SOLVED_DEPTH, LOWER_BOUND, VALUE_WIN, VALUE_LOSS, VALUE_WIN, True),
+        (SOLVED_DEPTH, LOWER_BOUND, VALUE_DRAW, VALUE_LOSS, VALUE_DRAW, True),
+        (1, LOWER_BOUND, VALUE_DRAW, VALUE_LOSS, VALUE_DRAW, False),
+        (SOLVED_DEPTH, LOWER_BOUND, VALUE_LOSS, VALUE_LOSS, VALUE_LOSS, False),
+        (SOLVED_DEPTH, UPPER_BOUND, VALUE_LOSS, VALUE_LOSS, VALUE_WIN, True),
+        (SOLVED_DEPTH, UPPER_BOUND, VALUE_WIN, VALUE_WIN, VALUE_WIN, False),
+    ],
+)
+def test_table_bounds(depth, bound, value, alpha, beta, solved):
+    game = play(Tictactoe(), [0, 3, 1, 4])
+    # entries within the window are returned without searching
+    table = {game.position_hash: (depth, value, bound, None)}
+    search = _Negamax(table, max_nodes=1)
+    assert search.negamax(game, 1, alpha, beta) == (value, solved)
+
+
+def test_get_value():
+    solver = EndgameSolver(max_empty_fields=4)
+    game = play(Tictactoe(), [0, 3, 1, 4])
+    # not an endgame
+    assert solver.get_value(game, Player.X) is None
+    game = play(game, [8])
+    # O to move wins with 5
+    assert solver.get_value(game, Player.O) == VALUE_WIN
+    assert solver.get_value(game, Player.X) == VALUE_LOSS
+
+
+def test_create_endgame_solver():
+    assert create_endgame_solver() is None
+    assert create_endgame_solver(10).max_empty_fields == 10
+
+
+def test_evaluator_uses_exact_values():
+    game = play(Tictactoe(), [0, 3, 1, 4, 8])
+    estimator = create_generic_estimator(game)
+    _, estimated_value, _ = Evaluator(estimator, Player.X).evaluate(game)
+    _, solved_value, _ = Evaluator(estimator, Player.X, endgame_solver=EndgameSolver(5)).evaluate(game)
+    assert solved_value == VALUE_LOSS
+    assert solved_value != estimated_value
+    [(_, solved_value, _)] = Evaluator(estimator, Player.O, endgame_solver=EndgameSolver(5)).evaluate_batch([game])
+    assert solved_value == VALUE_WIN
+
+
+def test_agents_play_solved_moves():
+    game = play(Tictactoe(), [0, 3, 1, 4])
+    alpha_agent = create_alpha_agent(
+        create_generic_estimator(game), Player.X, mcts_steps=1, random_seed=0, endgame_empty_fields=5
+    )
+    assert alpha_agent.get_next_move(game) == 2
+    pure_mcts_agent = create_pure_mcts_agent(
+        Player.X, mcts_steps=1, mcts_rollouts=1, random_seed=0, endgame_empty_fields=5
+    )
+    assert pure_mcts_agent.get_next_move(game) == 2
@@ -0,0 +1,91 @@
+from types import SimpleNamespace
+
+import pytest
+import numpy as np
+
+from alpha_viergewinnt.game import tictactoe
+from alpha_viergewinnt.game.board import Player
+from alpha_viergewinnt.agent.alpha import AlphaAgent
+from alpha_viergewinnt.agent.parallel_search import SearchMode
+from alpha_viergewinnt.agent.pure_mcts.factory import create_pure_mcts_agent
+
+from .alpha.test_mcts import DummyState, MaxFirstEvaluator
+
+
+@pytest.mark.parametrize("search_mode", [SearchMode.ROOT, SearchMode.TREE], ids=["root", "tree"])
+def test_alpha_parallel_search(search_mode):
+    agent = AlphaAgent(
+        evaluator=MaxFirstEvaluator(),
+        mcts_steps=20,
+        random_seed=0,
+        draw_graph=False,
+        search_workers=2,
+        search_mode=search_mode,
+    )
+    try:
+        state = DummyState()
+        assert agent.get_next_move(state) == 0
+        search_distribution = agent._get_search_distribution(state)
+        assert np.isclose(np.sum(search_distribution), 1)
+    finally:
+        agent.close()
+
+
+def test_alpha_parallel_search_restarts_after_parameter_change():
+    evaluator = MaxFirstEvaluator()
+    evaluator.estimator = SimpleNamespace(parameters_version=0)
+    agent = AlphaAgent(evaluator=evaluator, mcts_steps=4, random_seed=0, draw_graph=False, search_workers=2)
+    try:
+        agent.get_next_move(DummyState())
+        root_parallel_search = agent.root_parallel_search
+        agent.get_next_move(DummyState())
+        assert agent.root_parallel_search is root_parallel_search
+
+        # e.g. after training or loading the estimator
+        evaluator.estimator.parameters_version += 1
+        agent.get_next_move(DummyState())
+        assert agent.root_parallel_search is not root_parallel_search
+        assert agent.root_parallel_search.parameters_version == 1
+    finally:
+        agent.close()
+
+
+def test_alpha_search_root():
+    agent = AlphaAgent(evaluator=MaxFirstEvaluator(), mcts_steps=20, random_seed=0, draw_graph=False)
+    visit_count = agent.search_root(DummyState())
+    assert visit_count.shape == (3,)
+    # the first step expands the root
+    assert np.sum(visit_count) == 19
+
+
+def test_pure_mcts_search_root():
+    game = tictactoe.Tictactoe()
+    game.play_move(player=Player.X, move=4)
+    agent = create_pure_mcts_agent(Player.O, mcts_steps=50, mcts_rollouts=2, random_seed=0)
+    weights, visit_counts = agent.search_root(game)
+    assert weights.shape == visit_counts.shape == (9,)
+    assert visit_counts[4] == 0
+    assert np.sum(visit_counts) > 0
+
+
+def test_pure_mcts_root_parallel_search():
+    game = tictactoe.Tictactoe()
+    game.play_move(player=Player.X, move=4)
+    agent = create_pure_mcts_agent(Player.O, mcts_steps=40, mcts_rollouts=2, random_seed=0, search_workers=2)
+    try:
+        np.random.seed(0)
+        move = agent.get_next_move(game)
+    finally:
+        agent.close()
+
+    # same as merging the searches of two agents with the worker seeds
+    np.random.seed(0)
+    random_seeds = np.random.randint(2**31, size=2)
+    root_statistics = 0
+    for random_seed in random_seeds:
+        worker_agent = create_pure_mcts_agent(Player.O, mcts_steps=20, mcts_rollouts=2)
+        np.random.seed(random_seed)
+        worker_agent.seed(int(random_seed))
+        root_statistics = root_statistics + worker_agent.search_root(game)
+    weights, visit_counts = root_statistics
+    assert move == np.argmax(np.where(visit_counts > 0, weights, -np.inf))
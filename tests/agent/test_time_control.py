@@ -0,0 +1,103 @@
+import time
+
+import pytest
+
+from alpha_viergewinnt.game import tictactoe
+from alpha_viergewinnt.game.board import Player
+from alpha_viergewinnt.agent.alpha import AlphaAgent
+from alpha_viergewinnt.agent.parallel_search import SearchMode
+from alpha_viergewinnt.agent.pure_mcts.factory import create_pure_mcts_agent
+from alpha_viergewinnt.agent.time_control import TimeControl, SearchClock, create_time_control
+from alpha_viergewinnt.match import CompetitionMatch
+
+from .alpha.test_mcts import DummyState, MaxFirstEvaluator
+
+
+def test_move_budget():
+    assert TimeControl(move_time=100).get_move_budget() == 100
+    # a fraction of the remaining game time plus the increment
+    assert TimeControl(game_time=1000, increment=10).get_move_budget() == pytest.approx(60)
+    assert TimeControl(move_time=20, game_time=1000, increment=10).get_move_budget() == 20
+    # never more than the remaining game time
+    time_control = TimeControl(game_time=1000, increment=10)
+    time_control.remaining_game_time = 5
+    assert time_control.get_move_budget() == 5
+
+
+def test_end_move_charges_game_time():
+    time_control = TimeControl(game_time=1000, increment=10)
+    clock = time_control.start_move(tictactoe.Tictactoe())
+    clock.start_time -= 0.2
+    time_control.end_move(clock)
+    assert time_control.remaining_game_time == pytest.approx(810, abs=5)
+
+
+def test_game_time_starts_again_with_new_game():
+    time_control = TimeControl(game_time=1000, increment=10)
+    game = tictactoe.Tictactoe()
+    for move in (0, 1):
+        clock = time_control.start_move(game)
+        clock.start_time -= 0.2
+        time_control.end_move(clock)
+        game.play_move(player=game.active_player, move=move)
+    assert time_control.remaining_game_time == pytest.approx(620, abs=10)
+
+    # a later move of the same game keeps the remaining time
+    time_control.start_move(game)
+    assert time_control.remaining_game_time == pytest.approx(620, abs=10)
+    # the first move of the next game
+    time_control.start_move(tictactoe.Tictactoe())
+    assert time_control.remaining_game_time == 1000
+
+
+def test_create_time_control():
+    assert create_time_control() is None
+    assert create_time_control(move_time=10).move_time == 10
+
+
+def test_clock_runs_min_steps():
+    clock = SearchClock(budget=0)
+    assert not clock.is_search_finished(SearchClock.MIN_STEPS - 1)
+    assert clock.is_search_finished(SearchClock.MIN_STEPS)
+    assert not SearchClock(budget=10000).is_search_finished(100)
+
+
+@pytest.mark.parametrize("search_mode", [SearchMode.ROOT, SearchMode.TREE], ids=["single", "tree"])
+def test_alpha_timed_search(search_mode):
+    agent = AlphaAgent(
+        evaluator=MaxFirstEvaluator(),
+        mcts_steps=1,
+        random_seed=0,
+        draw_graph=False,
+        reuse_tree=False,
+        search_workers=1 if search_mode == SearchMode.ROOT else 2,
+        search_mode=search_mode,
+        time_control=TimeControl(move_time=50),
+    )
+    start_time = time.perf_counter()
+    assert agent.get_next_move(DummyState()) == 0
+    assert time.perf_counter() - start_time >= 0.05
+    # the time budget, not mcts_steps, limits the search
+    assert agent.num_simulations > 1
+
+
+def test_pure_mcts_timed_search():
+    game = tictactoe.Tictactoe()
+    agent = create_pure_mcts_agent(Player.X, mcts_steps=1, mcts_rollouts=1, random_seed=0, move_time=50)
+    start_time = time.perf_counter()
+    assert agent.get_next_move(game) in game.get_possible_moves()
+    assert time.perf_counter() - start_time >= 0.05
+    assert agent.num_simulations > 1
+
+
+def test_agent_game_time_over_several_games():
+    agent = create_pure_mcts_agent(Player.X, mcts_steps=1, mcts_rollouts=1, random_seed=0, game_time=1000)
+    agents = {Player.X: agent, Player.O: create_pure_mcts_agent(Player.O, mcts_steps=1, mcts_rollouts=1)}
+    CompetitionMatch(game=tictactoe.Tictactoe(), agents=agents).play()
+    # at least 3 moves of a twentieth of the remaining time
+    assert agent.time_control.remaining_game_time < 0.95**3 * 1000 + 10
+
+    # the first move of the next game is charged to a full game time
+    game = tictactoe.Tictactoe()
+    assert agent.get_next_move(game) in game.get_possible_moves()
+    assert agent.time_control.remaining_game_time > 900
@@ -0,0 +1,24 @@
+from alpha_viergewinnt.agent.tree_reuse import find_reusable_node
+
+# node: (state, successors)
+TREE = {
+    "root": ("a", ["b", "c"]),
+    "b": ("b", ["d"]),
+    "c": ("c", []),
+    "d": ("d", ["e"]),
+    "e": ("e", []),
+}
+
+
+def find(state):
+    return find_reusable_node("root", state, lambda node: TREE[node][0], lambda node: TREE[node][1])
+
+
+def test_find_reusable_node():
+    assert find("a") == "root"
+    assert find("c") == "c"
+    # after our move and the reply
+    assert find("d") == "d"
+    # deeper nodes are not searched
+    assert find("e") is None
+    assert find("x") is None
@@ -0,0 +1,122 @@
+import pytest
+import random
+from copy import deepcopy
+
+from alpha_viergewinnt.game.board import *
+from alpha_viergewinnt.game.bitboard import *
+from alpha_viergewinnt.game import tictactoe
+from alpha_viergewinnt.game import viergewinnt
+
+GAME_FACTORY_PAIRS = [
+    (tictactoe.Tictactoe, tictactoe.BitboardTictactoe),
+    (viergewinnt.Viergewinnt, viergewinnt.BitboardViergewinnt),
+]
+GAME_FACTORY_PAIRS_IDS = ["tictactoe", "viergewinnt"]
+
+
+@pytest.fixture(params=GAME_FACTORY_PAIRS, ids=GAME_FACTORY_PAIRS_IDS)
+def games(request):
+    Game, BitboardGame = request.param
+    return Game(), BitboardGame()
+
+
+def assert_games_equivalent(game, bitboard_game):
+    assert game.state.tolist() == bitboard_game.state.tolist()
+    assert game.get_all_moves() == bitboard_game.get_all_moves()
+    assert game.get_possible_moves() == bitboard_game.get_possible_moves()
+    assert game.active_player == bitboard_game.active_player
+    assert game.is_draw() == bitboard_game.is_draw()
+    for player in Player:
+        assert game.is_winner(player) == bitboard_game.is_winner(player)
+        array_view = game.get_array_view(player=player, player_value=1, opponent=player.opponent(), opponent_value=-1)
+        bitboard_array_view = bitboard_game.get_array_view(
+            player=player, player_value=1, opponent=player.opponent(), opponent_value=-1
+        )
+        assert array_view.tolist() == bitboard_array_view.tolist()
+    assert str(game) == str(bitboard_game)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_random_playout_equivalent(games, seed):
+    game, bitboard_game = games
+    random_generator = random.Random(seed)
+    assert_games_equivalent(game, bitboard_game)
+
+    while game.get_possible_moves():
+        move = random_generator.choice(game.get_possible_moves())
+        game.play_move(player=game.active_player, move=move)
+        bitboard_game.play_move(player=bitboard_game.active_player, move=move)
+        assert_games_equivalent(game, bitboard_game)
+
+
+def test_illegal_moves():
+    game = viergewinnt.BitboardViergewinnt()
+    with pytest.raises(viergewinnt.IllegalMoveException):
+        game.play_move(player=game.active_player, move=7)
+
+    for _ in range(6):
+        game.play_move(player=game.active_player, move=2)
+    assert 2 not in game.get_possible_moves()
+    with pytest.raises(viergewinnt.ColumnFullException):
+        game.play_move(player=game.active_player, move=2)
+
+    game = tictactoe.BitboardTictactoe()
+    with pytest.raises(tictactoe.IllegalMoveException):
+        game.play_move(player=game.active_player, move=9)
+
+    game.play_move(player=game.active_player, move=4)
+    with pytest.raises(tictactoe.FieldOccupiedException):
+        game.play_move(player=game.active_player, move=4)
+
+
+def test_no_wrap_around_columns():
+    game = viergewinnt.BitboardViergewinnt()
+    # stones on top of column 0 and at the bottom of column 1 are not in a vertical row
+    for move in [0, 0, 0, 0, 0, 6, 0, 6, 1, 6, 1]:
+        game.play_move(player=game.active_player, move=move)
+    print(game)
+    assert not game.is_winner(Player.X)
+    assert not game.is_winner(Player.O)
+
+
+def test_numpy_integer_moves():
+    game = viergewinnt.BitboardViergewinnt()
+    for _ in range(6):
+        for move in np.arange(7, dtype=np.int64):
+            game.play_move(player=game.active_player, move=move)
+    assert game.is_draw() is True
+    game.undo_move()
+    assert game.is_draw() is False
+
+
+def test_move_history_inequality():
+    game1 = viergewinnt.BitboardViergewinnt()
+    game2 = deepcopy(game1)
+
+    for move in [0, 1, 2, 3]:
+        game1.play_move(player=game1.active_player, move=move)
+    for move in [2, 3, 0, 1]:
+        game2.play_move(player=game2.active_player, move=move)
+
+    assert game1.state.tolist() == game2.state.tolist()
+    assert game1 != game2
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_clone_and_undo_equivalent(games, seed):
+    game, bitboard_game = games
+    random_generator = random.Random(seed)
+    clones = []
+
+    while not (game.is_winner(Player.X) or game.is_winner(Player.O) or game.is_draw()):
+        clones.append(bitboard_game.clone())
+        move = random_generator.choice(game.get_possible_moves())
+        game.play_move(player=game.active_player, move=move)
+        bitboard_game.play_move(player=bitboard_game.active_player, move=move)
+
+    for clone in reversed(clones):
+        game.undo_move()
+        bitboard_game.undo_move()
+        assert_games_equivalent(game, bitboard_game)
+        assert_games_equivalent(clone, bitboard_game)
+        assert clone == bitboard_game
@@ -0,0 +1,51 @@
+import pytest
+import random
+
+from alpha_viergewinnt.game.board import *
+from alpha_viergewinnt.game.condition import *
+from alpha_viergewinnt.game.tictactoe import Tictactoe, BitboardTictactoe
+from alpha_viergewinnt.game.viergewinnt import Viergewinnt, BitboardViergewinnt
+
+GAME_FACTORIES = [Tictactoe, Viergewinnt, BitboardTictactoe, BitboardViergewinnt]
+GAME_FACTORIES_IDS = ["tictactoe", "viergewinnt", "bitboard_tictactoe", "bitboard_viergewinnt"]
+
+
+@pytest.fixture(params=GAME_FACTORIES, ids=GAME_FACTORIES_IDS)
+def game(request):
+    Game = request.param
+    return Game()
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_cached_conditions_equal_full_check(game, seed):
+    random_generator = random.Random(seed)
+    while game.get_possible_moves():
+        move = random_generator.choice(game.get_possible_moves())
+        game.play_move(player=game.active_player, move=move)
+
+        for player in Player:
+            assert game.is_winner(player) == game.win_conditions[player].check(game)
+        assert game.is_draw() == game.draw_condition.check(game)
+        assert game.is_draw() == NoMovesPossibleCondition().check(game)
+
+
+def test_conditions_of_board_set_up_through_state():
+    game = Tictactoe()
+    assert not game.is_winner(Player.X)
+    game.state[0, :] = Player.X.value
+    assert game.is_winner(Player.X)
+    assert not game.is_winner(Player.O)
+    assert not game.is_draw()
+    game.state[1:, :] = Player.O.value
+    assert game.is_draw()
+
+
+def test_check_stone_only_considers_rows_through_stone():
+    game = Viergewinnt()
+    game.state[0, 0:4] = Player.X.value
+    condition = NStonessInRowCondition(num_stones_in_row=4, player=Player.X)
+
+    assert condition.check(game)
+    assert condition.check_stone(game, (0, 2))
+    assert not condition.check_stone(game, (0, 5))
+    assert not condition.check_stone(game, (1, 0))
@@ -0,0 +1,59 @@
+import random
+
+import numpy as np
+import pytest
+
+from alpha_viergewinnt.game.board import Player
+from alpha_viergewinnt.game.tictactoe import Tictactoe, BitboardTictactoe
+from alpha_viergewinnt.game.viergewinnt import Viergewinnt, BitboardViergewinnt
+
+GAME_FACTORIES = [Tictactoe, BitboardTictactoe, Viergewinnt, BitboardViergewinnt]
+GAME_FACTORIES_IDS = ["tictactoe", "bitboard_tictactoe", "viergewinnt", "bitboard_viergewinnt"]
+
+
+@pytest.fixture(params=GAME_FACTORIES, ids=GAME_FACTORIES_IDS)
+def create_game(request):
+    return request.param
+
+
+def test_number_of_symmetries():
+    assert len(Tictactoe().get_symmetries()) == 8
+    assert len(Viergewinnt().get_symmetries()) == 2
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_transformed_moves_give_transformed_board(create_game, seed):
+    random_generator = random.Random(seed)
+    game = create_game()
+    moves = []
+    for _ in range(5):
+        move = random_generator.choice(game.get_possible_moves())
+        game.play_move(player=game.active_player, move=move)
+        moves.append(move)
+
+    for symmetry in game.get_symmetries():
+        symmetric_game = create_game()
+        for move in moves:
+            symmetric_game.play_move(player=symmetric_game.active_player, move=symmetry.transform_move(move))
+        assert symmetric_game.state.tolist() == symmetry.transform_array(game.state).tolist()
+        for player in Player:
+            assert symmetric_game.is_winner(player) == game.is_winner(player)
+
+
+def test_transform_distribution(create_game):
+    game = create_game()
+    num_moves = len(game.get_all_moves())
+    distribution = np.arange(num_moves) / num_moves
+    for symmetry in game.get_symmetries():
+        transformed_distribution = symmetry.transform_distribution(distribution)
+        for move in game.get_all_moves():
+            assert transformed_distribution[symmetry.transform_move(move)] == distribution[move]
+        assert symmetry.inverse_transform_distribution(transformed_distribution).tolist() == distribution.tolist()
+
+
+def test_transform_batch():
+    symmetry = Tictactoe().get_symmetries()[5]
+    array_batch = np.arange(18).reshape(2, 3, 3)
+    transformed_array_batch = symmetry.transform_array(array_batch)
+    for array, transformed_array in zip(array_batch, transformed_array_batch):
+        assert transformed_array.tolist() == symmetry.transform_array(array).tolist()
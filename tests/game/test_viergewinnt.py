@@ -6,6 +6,7 @@ from alpha_viergewinnt.game.board import *
 from alpha_viergewinnt.game.viergewinnt import *
 from alpha_viergewinnt.game.condition import *
 from alpha_viergewinnt.game.alternating_player import *
+from alpha_viergewinnt.game.move_recorder import NoRecordedMovesException
 
 
 @pytest.fixture
@@ -120,3 +121,38 @@ def test_move_history_inequality(game):
     print(MoveRecorder.__hash__(game1))
     print(MoveRecorder.__hash__(game2))
     assert game1 != game2
+
+
+def test_clone(game):
+    game.play_move(player=Player.X, move=0)
+    clone = game.clone()
+    assert clone == game
+    assert clone.win_conditions is game.win_conditions
+
+    clone.play_move(player=Player.O, move=1)
+    assert clone != game
+    assert game.state[0, 1] == 0
+    assert game.recorded_moves == (0,)
+    assert game.active_player == Player.O
+
+
+def test_undo_move(game):
+    game.play_move(player=Player.X, move=0)
+    initial_game = game.clone()
+    for _ in range(20):
+        random_move = random.choice(game.get_possible_moves())
+        game.play_move(player=game.active_player, move=random_move)
+        if game.is_winner(Player.X) or game.is_winner(Player.O) or game.is_draw():
+            break
+
+    while len(game.recorded_moves) > 1:
+        game.undo_move()
+
+    assert game == initial_game
+    assert game.state.tolist() == initial_game.state.tolist()
+    assert game.active_player == Player.O
+    assert not game.is_winner(Player.X)
+    assert not game.is_draw()
+    game.undo_move()
+    with pytest.raises(NoRecordedMovesException):
+        game.undo_move()
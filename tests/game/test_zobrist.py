@@ -0,0 +1,84 @@
+import random
+
+import pytest
+
+from alpha_viergewinnt.game.board import Player
+from alpha_viergewinnt.game import tictactoe
+from alpha_viergewinnt.game import viergewinnt
+from alpha_viergewinnt.game.zobrist import *
+
+GAME_FACTORIES = [
+    tictactoe.Tictactoe,
+    tictactoe.BitboardTictactoe,
+    viergewinnt.Viergewinnt,
+    viergewinnt.BitboardViergewinnt,
+]
+GAME_FACTORIES_IDS = ["tictactoe", "bitboard_tictactoe", "viergewinnt", "bitboard_viergewinnt"]
+
+
+@pytest.fixture(params=GAME_FACTORIES, ids=GAME_FACTORIES_IDS)
+def create_game(request):
+    return request.param
+
+
+def play_moves(game, moves):
+    for move in moves:
+        game.play_move(player=game.active_player, move=move)
+    return game
+
+
+def test_keys_are_shared_and_deterministic():
+    assert get_zobrist_keys((6, 7)) is get_zobrist_keys((6, 7))
+    keys = ZobristKeys((6, 7), random_seed=ZOBRIST_RANDOM_SEED)
+    assert keys.field_keys[Player.O][5][6] == get_zobrist_keys((6, 7)).field_keys[Player.O][5][6]
+    assert keys.field_keys[Player.X][0][0] != keys.field_keys[Player.O][0][0]
+
+
+def test_transposed_move_orders(create_game):
+    game1 = play_moves(create_game(), [0, 1, 2, 4])
+    game2 = play_moves(create_game(), [2, 4, 0, 1])
+    game3 = play_moves(create_game(), [1, 0, 4, 2])
+
+    assert game1.position_hash == game2.position_hash
+    # same fields, but stones of different players
+    assert game1.position_hash != game3.position_hash
+    # move history is part of the hash by default
+    assert game1 != game2
+
+
+def test_transposition_mode(create_game):
+    game1 = play_moves(create_game(transpositions=True), [0, 1, 2, 4])
+    game2 = play_moves(create_game(transpositions=True), [2, 4, 0, 1])
+    game3 = play_moves(create_game(transpositions=True), [0, 1, 2])
+
+    assert game1 == game2
+    assert hash(game1) == hash(game2)
+    assert game1 != game3
+
+
+def test_player_to_move_is_part_of_hash():
+    keys = get_zobrist_keys((3, 3))
+    game = play_moves(tictactoe.Tictactoe(), [4])
+    assert game.position_hash == keys.field_keys[Player.X][1][1] ^ keys.player_to_move_key
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_undo_and_engines_equivalent(seed):
+    random_generator = random.Random(seed)
+    game = viergewinnt.Viergewinnt()
+    bitboard_game = viergewinnt.BitboardViergewinnt()
+    hashes = [game.position_hash]
+
+    while game.get_possible_moves() and not (game.is_winner(Player.X) or game.is_winner(Player.O)):
+        move = random_generator.choice(game.get_possible_moves())
+        play_moves(game, [move])
+        play_moves(bitboard_game, [move])
+        assert game.position_hash == bitboard_game.position_hash
+        hashes.append(game.position_hash)
+
+    for expected_hash in reversed(hashes[:-1]):
+        game.undo_move()
+        bitboard_game.undo_move()
+        assert game.position_hash == expected_hash
+        assert bitboard_game.position_hash == expected_hash
+    assert game.position_hash == 0
@@ -0,0 +1,93 @@
+import pstats
+
+from alpha_viergewinnt.game.board import Board, Player
+from alpha_viergewinnt.game.tictactoe import Tictactoe
+from alpha_viergewinnt.agent.alpha.alpha import AlphaAgent
+from alpha_viergewinnt.agent.alpha.evaluation_cache import EvaluationCache
+from alpha_viergewinnt.agent.alpha.factory import create_alpha_agent, create_generic_estimator
+from alpha_viergewinnt.agent.alpha.mcts import Mcts
+from alpha_viergewinnt.agent.pure_mcts.factory import create_pure_mcts_agent
+from alpha_viergewinnt.match import CompetitionMatch
+from alpha_viergewinnt.inspector import Profiler, profile_run
+
+
+def play_game():
+    game = Tictactoe()
+    agents = {
+        Player.X: create_alpha_agent(
+            create_generic_estimator(game),
+            Player.X,
+            mcts_steps=10,
+            random_seed=0,
+            evaluation_cache=EvaluationCache(100),
+        ),
+        Player.O: create_pure_mcts_agent(Player.O, mcts_steps=10, mcts_rollouts=2, random_seed=0, array_tree=True),
+    }
+    CompetitionMatch(game=game, agents=agents).play()
+
+
+def test_profiler_counts_sections_and_moves():
+    with Profiler() as profiler:
+        play_game()
+
+    num_moves = profiler.sections["move"][0]
+    # at least 5 moves in tictactoe
+    assert num_moves >= 5
+    for section in ("selection", "expansion", "evaluation", "rollout", "backup", "clone", "terminal check"):
+        num_calls, total_time = profiler.sections[section]
+        assert num_calls > 0
+        assert total_time > 0
+    assert profiler.num_moves == num_moves
+    assert 0 < profiler.num_simulations <= 10 * num_moves
+    assert profiler.get_simulations_per_second() > 0
+    assert profiler.cache_hits + profiler.cache_misses > 0
+    assert len(profiler.tree_sizes) == num_moves
+    assert "searched moves" in str(profiler)
+
+
+def test_uninstall_restores_methods():
+    select_path = Mcts.__dict__["_select_path"]
+    get_next_move = AlphaAgent.__dict__["get_next_move"]
+
+    profiler = Profiler()
+    profiler.install()
+    assert Mcts.__dict__["_select_path"] is not select_path
+    assert "clone" in Tictactoe.__dict__
+    profiler.uninstall()
+
+    assert Mcts.__dict__["_select_path"] is select_path
+    assert AlphaAgent.__dict__["get_next_move"] is get_next_move
+    # inherited methods are inherited again
+    assert "clone" not in Tictactoe.__dict__
+    assert Tictactoe.clone is Board.clone
+
+    # nothing is counted when uninstalled
+    play_game()
+    assert profiler.sections["move"][0] == 0
+
+
+def test_profile_run(tmp_path):
+    profile_filename = str(tmp_path / "play.prof")
+    with profile_run(instrument=True, profile_filename=profile_filename) as profiler:
+        play_game()
+
+    assert profiler.num_moves > 0
+    function_names = [function_name for _, _, function_name in pstats.Stats(profile_filename).stats]
+    assert "_play_move" in function_names
+
+
+def test_profile_run_disabled():
+    select_path = Mcts.__dict__["_select_path"]
+    with profile_run() as profiler:
+        assert profiler is None
+        assert Mcts.__dict__["_select_path"] is select_path
+
+
+def test_get_num_tree_nodes():
+    game = Tictactoe()
+    alpha_agent = create_alpha_agent(create_generic_estimator(game), Player.X, mcts_steps=10, random_seed=0)
+    pure_mcts_agent = create_pure_mcts_agent(Player.X, mcts_steps=10, mcts_rollouts=2, random_seed=0)
+    for agent in (alpha_agent, pure_mcts_agent):
+        assert agent.get_num_tree_nodes() is None
+        agent.get_next_move(game)
+        assert agent.get_num_tree_nodes() > 1
@@ -1,3 +1,4 @@
+import numpy as np
 import pytest
 
 from alpha_viergewinnt.game.board import Player
@@ -5,15 +6,25 @@ from alpha_viergewinnt.game.tictactoe import Tictactoe
 from alpha_viergewinnt.agent.alpha.factory import create_generic_estimator, create_alpha_agent, create_alpha_trainer
 
 
+@pytest.fixture(autouse=True)
+def seed_global_random_state():
+    # the MCTS exploration noise is drawn from the global numpy random state
+    np.random.seed(0)
+
+
 @pytest.fixture
 def game():
     return Tictactoe()
 
 
-@pytest.fixture
-def alpha_agent(game):
+# batched search spreads its simulations wider (virtual loss), so it gets more of them
+@pytest.fixture(params=[(1, 30), (8, 60)], ids=["single", "batched"])
+def alpha_agent(game, request):
+    batch_size, mcts_steps = request.param
     estimator = create_generic_estimator(game)
-    return create_alpha_agent(estimator=estimator, player=Player.X, mcts_steps=30, random_seed=0)
+    return create_alpha_agent(
+        estimator=estimator, player=Player.X, mcts_steps=mcts_steps, random_seed=0, batch_size=batch_size
+    )
 
 
 @pytest.fixture
@@ -0,0 +1,43 @@
+import math
+
+import pytest
+
+from benchmarks.suite import get_relative_change, find_regressions
+
+
+def create_results(values, higher_is_better=True):
+    return {
+        "benchmarks": {
+            name: dict(value=value, unit="calls/sec", higher_is_better=higher_is_better)
+            for name, value in values.items()
+        }
+    }
+
+
+def test_relative_change_higher_is_better():
+    baseline = dict(value=100.0, higher_is_better=True)
+    assert get_relative_change(dict(value=120.0), baseline) == pytest.approx(0.2)
+    assert get_relative_change(dict(value=80.0), baseline) == pytest.approx(-0.2)
+
+
+def test_relative_change_lower_is_better():
+    baseline = dict(value=100.0, higher_is_better=False)
+    assert get_relative_change(dict(value=120.0), baseline) == pytest.approx(-0.2)
+    assert get_relative_change(dict(value=80.0), baseline) == pytest.approx(0.2)
+
+
+def test_relative_change_of_zero_baseline():
+    assert get_relative_change(dict(value=0.0), dict(value=0.0, higher_is_better=True)) == 0.0
+    assert get_relative_change(dict(value=1.0), dict(value=0.0, higher_is_better=True)) == math.inf
+    assert get_relative_change(dict(value=1.0), dict(value=0.0, higher_is_better=False)) == -math.inf
+
+
+def test_find_regressions():
+    baseline = create_results({"a": 100.0, "b": 100.0, "c": 100.0})
+    results = create_results({"a": 95.0, "b": 80.0, "c": 130.0, "new": 1.0})
+    assert find_regressions(results, baseline, threshold=0.1) == {"b": pytest.approx(-0.2)}
+
+    # slower is a regression of benchmarks where lower is better
+    baseline = create_results({"a": 10.0, "b": 0.0}, higher_is_better=False)
+    results = create_results({"a": 12.0, "b": 1.0}, higher_is_better=False)
+    assert list(find_regressions(results, baseline, threshold=0.1)) == ["a", "b"]
@@ -4,7 +4,9 @@ import pytest
 
 
 @pytest.mark.skip()
-@pytest.mark.parametrize("game,estimator", [("viergewinnt", "generic"), ("tictactoe", "mlp"), ("viergewinnt", "mlp")])
+@pytest.mark.parametrize(
+    "game,estimator", [("viergewinnt", "generic"), ("tictactoe", "mlp"), ("viergewinnt", "mlp"), ("viergewinnt", "cnn")]
+)
 def test_train_smoketest(game, estimator):
     command = [
         "bin/train",
@@ -1,15 +1,29 @@
+from functools import partial
+
 import pytest
 
 from alpha_viergewinnt.game.board import Player
-from alpha_viergewinnt.game.tictactoe import Tictactoe
-from alpha_viergewinnt.game.viergewinnt import Viergewinnt
+from alpha_viergewinnt.game.tictactoe import Tictactoe, BitboardTictactoe
+from alpha_viergewinnt.game.viergewinnt import Viergewinnt, BitboardViergewinnt
 from alpha_viergewinnt.agent.random_agent import RandomAgent
 from alpha_viergewinnt.agent.pure_mcts.factory import create_pure_mcts_agent
 from alpha_viergewinnt.agent.alpha.factory import create_mlp_estimator, create_alpha_agent
-from alpha_viergewinnt.match import CompetitionMatch
-
-GAME_FACTORIES = [Tictactoe, Viergewinnt]
-GAME_FACTORIES_IDS = ["tictactoe", "viergewinnt"]
+from alpha_viergewinnt.match import CompetitionMatch, ScoreSettledCondition
+
+GAME_FACTORIES = [
+    Tictactoe,
+    Viergewinnt,
+    BitboardTictactoe,
+    BitboardViergewinnt,
+    partial(BitboardViergewinnt, transpositions=True),
+]
+GAME_FACTORIES_IDS = [
+    "tictactoe",
+    "viergewinnt",
+    "bitboard_tictactoe",
+    "bitboard_viergewinnt",
+    "transpositions_viergewinnt",
+]
 
 
 @pytest.fixture(params=GAME_FACTORIES, ids=GAME_FACTORIES_IDS)
@@ -27,7 +41,26 @@ def create_test_alpha_agent(game):
     return create_alpha_agent(estimator=estimator, player=Player.X, mcts_steps=2)
 
 
-TEST_PLAYER_FACTORIES = [create_test_pure_mcts_agent, create_test_alpha_agent]
+def create_test_array_tree_pure_mcts_agent(game):
+    return create_pure_mcts_agent(player=Player.X, random_seed=0, mcts_steps=2, mcts_rollouts=2, array_tree=True)
+
+
+def create_test_batch_rollouts_pure_mcts_agent(game):
+    return create_pure_mcts_agent(player=Player.X, random_seed=0, mcts_steps=2, mcts_rollouts=2, batch_rollouts=True)
+
+
+def create_test_array_tree_alpha_agent(game):
+    estimator = create_mlp_estimator(game)
+    return create_alpha_agent(estimator=estimator, player=Player.X, mcts_steps=2, array_tree=True)
+
+
+TEST_PLAYER_FACTORIES = [
+    create_test_pure_mcts_agent,
+    create_test_alpha_agent,
+    create_test_array_tree_pure_mcts_agent,
+    create_test_array_tree_alpha_agent,
+    create_test_batch_rollouts_pure_mcts_agent,
+]
 
 
 @pytest.fixture(params=TEST_PLAYER_FACTORIES)
@@ -47,3 +80,56 @@ def test_comparison_smoketest(game, agents):
     match = CompetitionMatch(game=game, agents=agents)
     results = match.compare(iterations)
     assert sum(results.values()) == iterations
+
+
+def test_comparison_deterministic(game, agents):
+    iterations = 4
+    match = CompetitionMatch(game=game, agents=agents)
+    first_winners = dict(match.compare_iter(iterations, random_seed=1))
+    second_winners = dict(match.compare_iter(iterations, random_seed=1))
+    assert first_winners == second_winners
+    assert sorted(first_winners) == list(range(iterations))
+
+
+def test_parallel_comparison():
+    game = Tictactoe()
+    agents = {
+        Player.X: create_pure_mcts_agent(player=Player.X, random_seed=0, mcts_steps=5, mcts_rollouts=2),
+        Player.O: RandomAgent(random_seed=0),
+    }
+    iterations = 6
+    match = CompetitionMatch(game=game, agents=agents)
+    serial_winners = dict(match.compare_iter(iterations))
+    parallel_winners = dict(match.compare_iter(iterations, workers=2))
+    assert parallel_winners == serial_winners
+
+    results = match.compare(iterations, workers=2)
+    for winner in [Player.X, Player.O, None]:
+        assert results[winner] == list(serial_winners.values()).count(winner)
+
+
+def test_comparison_stop_condition():
+    game = Tictactoe()
+    agents = {Player.X: RandomAgent(random_seed=0), Player.O: RandomAgent(random_seed=0)}
+    match = CompetitionMatch(game=game, agents=agents)
+    results = match.compare(10, stop_condition=lambda results: sum(results.values()) >= 3)
+    assert sum(results.values()) == 3
+
+
+def test_score_settled_condition():
+    condition = ScoreSettledCondition(Player.X, threshold=0.0, min_games=10)
+    assert not condition({Player.X: 5, Player.O: 0, None: 0})
+    assert condition({Player.X: 10, Player.O: 0, None: 0})
+    assert not condition({Player.X: 6, Player.O: 4, None: 0})
+    assert not condition({Player.X: 0, Player.O: 0, None: 20})
+    assert condition({Player.X: 30, Player.O: 10, None: 10})
+    assert ScoreSettledCondition(Player.O, threshold=0.0)({Player.X: 30, Player.O: 10, None: 10})
+    assert not ScoreSettledCondition(Player.X, threshold=0.5)({Player.X: 30, Player.O: 10, None: 10})
+
+
+def test_score_settled_condition_corrects_for_repeated_checks():
+    results = {Player.X: 28, Player.O: 12, None: 10}
+    assert ScoreSettledCondition(Player.X).z_value == pytest.approx(1.96, abs=0.01)
+    assert ScoreSettledCondition(Player.X, max_checks=1)(results)
+    assert not ScoreSettledCondition(Player.X, max_checks=100)(results)
+    assert ScoreSettledCondition(Player.X, max_checks=100)({Player.X: 40, Player.O: 5, None: 5})
@@ -0,0 +1,82 @@
+import os
+import time
+
+import numpy as np
+import pytest
+
+from alpha_viergewinnt.game.tictactoe import Tictactoe
+from alpha_viergewinnt.agent.alpha.factory import create_generic_estimator, create_mlp_estimator
+from alpha_viergewinnt.self_play import SelfPlayPool, AsyncSelfPlay
+
+
+@pytest.fixture
+def game():
+    return Tictactoe()
+
+
+@pytest.fixture
+def self_play_pool(game):
+    agent_options = dict(mcts_steps=3)
+    with SelfPlayPool(2, game, create_mlp_estimator, create_generic_estimator, agent_options) as self_play_pool:
+        yield self_play_pool
+
+
+def test_play_training_games(game, self_play_pool):
+    trainer_estimator = create_mlp_estimator(game)
+    opponent_estimator = create_generic_estimator(game)
+    self_play_pool.broadcast(trainer_estimator, opponent_estimator)
+    first_filenames = self_play_pool.filenames
+
+    results = list(self_play_pool.play(num_games=4, random_seed=0))
+    assert len(results) == 4
+    for training_batches in results:
+        # only the trainer records training batches
+        (training_batch,) = training_batches
+        num_moves = len(training_batch.state_array)
+        assert 3 <= num_moves <= 5
+        assert training_batch.state_array.shape == (num_moves, 3, 3)
+        assert training_batch.target_distribution.shape == (num_moves, 9)
+        assert np.allclose(training_batch.target_distribution.sum(axis=1), 1)
+        assert len(set(training_batch.target_state_value)) == 1
+        assert training_batch.target_state_value[0] in (-1, 0, 1)
+        trainer_estimator.train(*training_batch)
+
+    # new parameters replace the old files
+    self_play_pool.broadcast(trainer_estimator, opponent_estimator)
+    assert not any(os.path.exists(filename) for filename in first_filenames)
+    assert len(list(self_play_pool.play(num_games=2, random_seed=4))) == 2
+
+
+def test_async_self_play(game):
+    trainer_estimator = create_mlp_estimator(game)
+    opponent_estimator = create_generic_estimator(game)
+    agent_options = dict(mcts_steps=3)
+    with AsyncSelfPlay(2, game, create_mlp_estimator, create_generic_estimator, agent_options) as async_self_play:
+        async_self_play.publish(trainer_estimator, opponent_estimator)
+        for _ in range(3):
+            (training_batch,) = async_self_play.get()
+            assert training_batch.state_array.shape[1:] == (3, 3)
+            trainer_estimator.train(*training_batch)
+            async_self_play.publish(trainer_estimator, opponent_estimator)
+        assert async_self_play.num_games == 3
+        # only the newest snapshot is kept
+        assert os.listdir(async_self_play.directory) == ["trainer_4.params"]
+        directory = async_self_play.directory
+    assert not os.path.exists(directory)
+
+
+def test_async_self_play_drops_stale_games(game):
+    trainer_estimator = create_mlp_estimator(game)
+    opponent_estimator = create_generic_estimator(game)
+    agent_options = dict(mcts_steps=3)
+    with AsyncSelfPlay(
+        1, game, create_mlp_estimator, create_generic_estimator, agent_options, queue_size=1, max_staleness=0
+    ) as async_self_play:
+        async_self_play.publish(trainer_estimator, opponent_estimator)
+        # the actor fills the queue with games of the first snapshot while waiting
+        while async_self_play.results.empty():
+            time.sleep(0.01)
+        async_self_play.publish(trainer_estimator, opponent_estimator)
+        async_self_play.get()
+        assert async_self_play.num_stale_games >= 1
+        assert async_self_play.num_games == 1
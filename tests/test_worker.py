@@ -0,0 +1,12 @@
+import torch
+
+from alpha_viergewinnt.worker import set_single_thread_inference
+
+
+def test_set_single_thread_inference():
+    num_threads = torch.get_num_threads()
+    try:
+        set_single_thread_inference()
+        assert torch.get_num_threads() == 1
+    finally:
+        torch.set_num_threads(num_threads)